@@ -0,0 +1,67 @@
+"""
+Compare a Python loop over Converter.convert with
+Engine.transliterate_many on many short strings (form fields, queries).
+
+Usage:
+    python benchmarks/bench_batch.py [--count 1000000] [--batch-size 1024]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from nepali_unicoder.bench import PREETI_WORDS, ROMAN_WORDS
+from nepali_unicoder.convert import Converter
+
+NUMBERS = ["12", "2081", "98.5", "0", "100", "9841000000"]
+PUNCTUATION = [".", ",", "-", "?", "!", "..."]
+
+
+def make_fields(words, count, seed=0):
+    """Short strings: one to three words, bare numbers, or punctuation."""
+    rng = random.Random(seed)
+    fields = []
+    for _ in range(count):
+        kind = rng.random()
+        if kind < 0.6:
+            fields.append(" ".join(rng.choices(words, k=rng.randint(1, 3))))
+        elif kind < 0.85:
+            fields.append(rng.choice(NUMBERS))
+        elif kind < 0.95:
+            fields.append(rng.choice(words) + rng.choice(PUNCTUATION))
+        else:
+            fields.append(rng.choice(PUNCTUATION))
+    return fields
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=1000000, help="Strings.")
+    parser.add_argument("--batch-size", type=int, default=1024)
+    args = parser.parse_args()
+
+    for mode, words in (("roman", ROMAN_WORDS), ("preeti", PREETI_WORDS)):
+        fields = make_fields(words, args.count)
+        converter = Converter(mode=mode)
+
+        start = time.perf_counter()
+        expected = [converter.convert(field) for field in fields]
+        t_loop = time.perf_counter() - start
+
+        start = time.perf_counter()
+        actual = converter.engine.transliterate_many(fields, args.batch_size)
+        t_many = time.perf_counter() - start
+        assert actual == expected, "transliterate_many differs from convert"
+
+        print(f"{mode}: {args.count} strings")
+        print(f"  loop over convert  : {args.count / t_loop:12,.0f} strings/s")
+        print(f"  transliterate_many : {args.count / t_many:12,.0f} strings/s")
+        print(f"  speedup            : {t_loop / t_many:12.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Measure end-to-end latency of importing the package and of running the
+command line on a short text, each in a fresh interpreter, as shell
+scripts that call `nepali-unicoder` once per string do. For a per-module
+breakdown, run `python -X importtime -m nepali_unicoder mero naam`.
+bench_startup.py times building the Engine itself.
+
+Measured on one CPU (Python 3.11, bytecode cached, median of 2 x 100 runs;
+`python (no import)` is 13-16 ms), before the lazy package API and the
+CLI fast path and after them:
+
+    import nepali_unicoder          12-17 ms  ->  14-15 ms
+    import nepali_unicoder.convert  52-54 ms  ->  15 ms
+    cli: text                       60-74 ms  ->  52-57 ms  (min 51 -> 40)
+    cli: stdin                      57-69 ms  ->  52-59 ms  (min 49 -> 40)
+
+`python -X importtime` shows the same: `nepali_unicoder.convert` took
+41 ms cumulative (it imported the engine and typing), now 1 ms, and the
+package's share of `python -m nepali_unicoder mero naam` went from 27 ms
+to 14 ms (the engine, which the conversion needs).
+
+Usage:
+    python benchmarks/bench_cli_latency.py [--runs 30]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), "../src"))
+
+CASES = [
+    ("python (no import)", ["-c", "pass"], None),
+    ("import nepali_unicoder", ["-c", "import nepali_unicoder"], None),
+    ("import ...convert", ["-c", "import nepali_unicoder.convert"], None),
+    ("cli: text", ["-m", "nepali_unicoder", "mero", "naam"], None),
+    ("cli: --preeti text", ["-m", "nepali_unicoder", "--preeti", "g]kfn"], None),
+    ("cli: stdin", ["-m", "nepali_unicoder"], "mero naam\n"),
+    ("cli: --stream stdin", ["-m", "nepali_unicoder", "--stream"], "mero naam\n"),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=30, help="Runs per case.")
+    args = parser.parse_args()
+
+    env = dict(os.environ, PYTHONPATH=SRC)
+    # Measure with bytecode caches, as an installed package has them
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    subprocess.run([sys.executable, "-m", "compileall", "-q", SRC], env=env)
+
+    for name, argv, stdin in CASES:
+        seconds = []
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            subprocess.run(
+                [sys.executable] + argv,
+                input=stdin,
+                env=env,
+                stdout=subprocess.DEVNULL,
+                check=True,
+                text=True,
+            )
+            seconds.append(time.perf_counter() - start)
+        median = statistics.median(seconds) * 1000
+        print(f"{name:24}: {median:6.1f} ms (min {min(seconds) * 1000:.1f})")
+
+
+if __name__ == "__main__":
+    main()
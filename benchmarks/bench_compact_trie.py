@@ -0,0 +1,125 @@
+"""
+Compare Trie, CompiledTrie and CompactTrie on large key sets: memory held
+after building, build time, and longest_match / scan speed.
+
+Keys are random made-up words; lookups run over text made of keys, half
+of them cut short, so both hits and misses are exercised.
+
+Usage:
+    python benchmarks/bench_compact_trie.py [--sizes 1000,100000,1000000]
+"""
+
+import argparse
+import gc
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from nepali_unicoder.trie import CompactTrie, Trie
+
+SYLLABLES = (
+    "ka kha ga gha na cha chha ja ta tha da dha pa pha ba bha ma ya ra la "
+    "wa sa sha ha ki ku ke ko kaa ti tu te to taa ni nu ne no naa ri ru re"
+).split()
+
+
+def make_entries(count, seed=0):
+    rng = random.Random(seed)
+    entries = {}
+    while len(entries) < count:
+        key = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(1, 6)))
+        entries[key] = f"<{len(entries)}>"
+    return entries
+
+
+def make_text(keys, words, seed=1):
+    rng = random.Random(seed)
+    parts = []
+    for key in rng.choices(keys, k=words):
+        parts.append(key if rng.random() < 0.5 else key[: rng.randint(1, len(key))])
+    return " ".join(parts)
+
+
+def build_trie(entries):
+    trie = Trie()
+    for key, value in entries.items():
+        trie.add(key, value)
+    return trie
+
+
+def measure(build):
+    """(result, seconds to build, bytes held by the result)."""
+    gc.collect()
+    start = time.perf_counter()
+    result = build()
+    seconds = time.perf_counter() - start
+    del result
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    held = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, seconds, held
+
+
+def lookups(matcher, text):
+    start = time.perf_counter()
+    idx = 0
+    n = len(text)
+    while idx < n:
+        idx += matcher.longest_match(text, idx)[1] or 1
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--sizes", default="1000,100000,1000000", help="Comma-separated key counts."
+    )
+    parser.add_argument("--words", type=int, default=100000, help="Words looked up.")
+    args = parser.parse_args()
+
+    print(
+        f"{'keys':>9} {'structure':12} {'build':>8} {'memory':>10} "
+        f"{'longest_match':>14} {'scan':>10}"
+    )
+    for size in map(int, args.sizes.split(",")):
+        entries = make_entries(size)
+        text = make_text(list(entries), args.words)
+        mb = len(text) / (1024 * 1024)
+        expected = None
+
+        trie, trie_seconds, trie_held = measure(lambda: build_trie(entries))
+        builders = [
+            ("Trie", lambda trie=trie: trie, trie_seconds, trie_held),
+            ("CompiledTrie", trie.compile, None, None),
+            ("CompactTrie", lambda: CompactTrie(entries.items()), None, None),
+        ]
+        for name, build, seconds, held in builders:
+            if seconds is None:
+                matcher, seconds, held = measure(build)
+            else:
+                matcher = build()
+            match_seconds = lookups(matcher, text)
+            scan_text = "-"
+            if hasattr(matcher, "scan"):
+                start = time.perf_counter()
+                output = matcher.scan(text)
+                scan_text = f"{mb / (time.perf_counter() - start):7.2f}MB/s"
+                if expected is None:
+                    expected = output
+                assert output == expected, f"{name} scan differs"
+            print(
+                f"{size:9,} {name:12} {seconds:7.2f}s "
+                f"{held / (1024 * 1024):8.1f}MB {mb / match_seconds:10.2f}MB/s "
+                f"{scan_text:>10}"
+            )
+            del matcher
+
+
+if __name__ == "__main__":
+    main()
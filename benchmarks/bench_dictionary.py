@@ -0,0 +1,88 @@
+"""
+Measure custom dictionary layers: memory held by a large layer, the time
+to add and reload it, and conversion throughput with it laid over the
+rules, with and without the word cache.
+
+Usage:
+    python benchmarks/bench_dictionary.py [--entries 500000] [--mb 1]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from nepali_unicoder.bench import ROMAN_WORDS, make_corpus
+from nepali_unicoder.engine import Engine
+
+SYLLABLES = (
+    "ka kha ga gha na cha chha ja ta tha da dha pa pha ba bha ma ya ra la "
+    "wa sa sha ha ki ku ke ko kaa ti tu te to taa ni nu ne no naa ri ru re"
+).split()
+
+
+def make_entries(count, seed=0):
+    """`count` distinct made-up words, mapped to their conversion plus a ZWNJ."""
+    rng = random.Random(seed)
+    engine = Engine.shared()
+    words = set()
+    while len(words) < count:
+        words.add("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 5))))
+    return {word: engine.transliterate(word) + "\u200c" for word in words}
+
+
+def timed(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entries", type=int, default=500000, help="Layer size.")
+    parser.add_argument("--mb", type=float, default=1.0, help="Corpus size in MB.")
+    args = parser.parse_args()
+
+    entries = make_entries(args.entries)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "words.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(entries, f, ensure_ascii=False)
+        size_mb = os.path.getsize(path) / (1024 * 1024)
+        print(f"dictionary: {len(entries):,} entries, {size_mb:.1f} MB of JSON")
+        del entries
+
+        engine = Engine()
+        tracemalloc.start()
+        add_seconds = timed(lambda: engine.dictionaries.add("words", path))
+        held, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        reload_seconds = min(
+            timed(lambda: engine.dictionaries.reload("words")) for _ in range(3)
+        )
+        print(f"  add          : {add_seconds:6.2f} s")
+        print(f"  reload       : {reload_seconds:6.2f} s (best of 3)")
+        print(f"  memory held  : {held / (1024 * 1024):6.1f} MB")
+        print(f"  memory peak  : {peak / (1024 * 1024):6.1f} MB")
+
+        corpus = make_corpus(ROMAN_WORDS, args.mb)
+        mb = len(corpus) / (1024 * 1024)
+        cached = Engine(word_cache_size=20000)
+        cached.dictionaries.add("words", path)
+        for name, candidate in (
+            ("rules only", Engine.shared()),
+            ("with layer", engine),
+            ("with layer, word cache", cached),
+        ):
+            seconds = timed(lambda: candidate.transliterate(corpus))
+            print(f"  {name:23}: {mb / seconds:6.2f} MB/s")
+
+
+if __name__ == "__main__":
+    main()
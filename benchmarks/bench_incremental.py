@@ -0,0 +1,96 @@
+"""
+Per-keystroke latency of IncrementalTransliterator compared with
+converting the whole buffer again, as an editor integration would.
+
+Types `--keys` characters at the end of (and in the middle of) a document
+of `--kb` KB, made of paragraphs separated by blank lines, and reports
+p50/p99 latency per keystroke.
+
+Usage:
+    python benchmarks/bench_incremental.py [--kb 100] [--keys 2000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from nepali_unicoder.bench import PREETI_WORDS, ROMAN_WORDS, make_corpus
+from nepali_unicoder.engine import Engine
+from nepali_unicoder.incremental import IncrementalTransliterator
+
+
+def paragraphs(text, words_per_paragraph=80):
+    """Separate `text` into paragraphs with blank lines."""
+    words = text.split(" ")
+    return "\n\n".join(
+        " ".join(words[i : i + words_per_paragraph])
+        for i in range(0, len(words), words_per_paragraph)
+    )
+
+
+def percentile(sorted_values, fraction):
+    index = min(int(fraction * len(sorted_values)), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+def report(label, latencies):
+    latencies = sorted(latencies)
+    print(
+        f"  {label:24} p50 {percentile(latencies, 0.50) * 1e6:9.1f} us   "
+        f"p99 {percentile(latencies, 0.99) * 1e6:9.1f} us"
+    )
+
+
+def type_keys(session, keys, position=None):
+    """Insert `keys` one at a time, at the end or after `position`."""
+    latencies = []
+    for offset, key in enumerate(keys):
+        start = time.perf_counter()
+        if position is None:
+            session.append(key)
+        else:
+            session.insert(position + offset, key)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def full_reconvert(engine, document, keys):
+    latencies = []
+    for end in range(1, len(keys) + 1):
+        text = document + keys[:end]
+        start = time.perf_counter()
+        engine.transliterate(text)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--kb", type=int, default=100, help="Document size in KB.")
+    parser.add_argument("--keys", type=int, default=2000, help="Keystrokes typed.")
+    args = parser.parse_args()
+
+    for mode, words in (("roman", ROMAN_WORDS), ("preeti", PREETI_WORDS)):
+        engine = Engine.shared(mode=mode)
+        document = paragraphs(make_corpus(words, args.kb / 1024))
+        keys = make_corpus(words, args.keys / (1024 * 1024), seed=1)[: args.keys]
+        print(f"{mode}: {len(document)} chars, {len(keys)} keystrokes")
+
+        session = IncrementalTransliterator(engine, text=document)
+        report("incremental append", type_keys(session, keys))
+        assert session.output == engine.transliterate(session.text)
+
+        session = IncrementalTransliterator(engine, text=document)
+        middle = document.index(" ", len(document) // 2) + 1
+        report("incremental insert", type_keys(session, keys, middle))
+        assert session.output == engine.transliterate(session.text)
+
+        # Reconverting everything is slow, so time fewer keystrokes
+        report("full reconversion", full_reconvert(engine, document, keys[:100]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Measure records/sec converting fields of a large synthetic JSON Lines
+file: a per-record loop (json.loads, `Converter.convert` on each field,
+json.dumps; the baseline), and `convert_jsonl`, which reads and writes
+chunks and converts each distinct value once, on one and on several
+processes. Also reports the peak memory of one `convert_jsonl` run.
+
+Usage:
+    python benchmarks/bench_jsonl.py [--records 500000] [--distinct 20000]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from nepali_unicoder.bench import PREETI_WORDS, ROMAN_WORDS
+from nepali_unicoder.convert import Converter
+from nepali_unicoder.tabular import convert_jsonl
+
+FIELDS = {"name": "roman", "address": "roman", "legacy": "preeti"}
+
+
+def write_jsonl(path, records, distinct, seed=0):
+    """Records with two roman fields and one Preeti field, plus other data."""
+    rng = random.Random(seed)
+    names = [" ".join(rng.choices(ROMAN_WORDS, k=2)) for _ in range(distinct)]
+    places = [" ".join(rng.choices(ROMAN_WORDS, k=4)) for _ in range(distinct)]
+    legacy = [" ".join(rng.choices(PREETI_WORDS, k=6)) for _ in range(distinct)]
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(records):
+            record = {
+                "id": i,
+                # Zipf-like repetition: a few values are very common
+                "name": names[min(int(rng.paretovariate(1.0)) - 1, distinct - 1)],
+                "address": rng.choice(places),
+                "legacy": rng.choice(legacy),
+                "score": round(rng.random(), 3),
+                "tags": ["a", "b"],
+            }
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def per_record(src, dst):
+    converters = {mode: Converter(mode=mode) for mode in set(FIELDS.values())}
+    with open(src, encoding="utf-8") as f:
+        with open(dst, "w", encoding="utf-8") as out:
+            for line in f:
+                record = json.loads(line)
+                for name, mode in FIELDS.items():
+                    record[name] = converters[mode].convert(record[name])
+                out.write(
+                    json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+                )
+
+
+def run(src, dst, workers):
+    with open(src, encoding="utf-8", buffering=1 << 20) as f:
+        with open(dst, "w", encoding="utf-8", buffering=1 << 20) as out:
+            return convert_jsonl(f, out, FIELDS, workers=workers)
+
+
+def read(path):
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--records", type=int, default=500000, help="Records.")
+    parser.add_argument(
+        "--distinct", type=int, default=20000, help="Distinct values per field."
+    )
+    parser.add_argument(
+        "--jobs", type=int, default=os.cpu_count() or 1, help="Processes to compare."
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, "in.jsonl")
+        write_jsonl(src, args.records, args.distinct)
+        mb = os.path.getsize(src) / (1024 * 1024)
+        print(
+            f"{args.records:,} records, {mb:.1f} MB, "
+            f"{args.distinct:,} distinct values per field"
+        )
+
+        baseline = os.path.join(tmp, "loop.jsonl")
+        start = time.perf_counter()
+        per_record(src, baseline)
+        seconds = time.perf_counter() - start
+        print(f"  per-record loop     : {args.records / seconds:10,.0f} records/s")
+
+        for workers in sorted({1, args.jobs}):
+            dst = os.path.join(tmp, f"out{workers}.jsonl")
+            result = run(src, dst, workers)
+            assert read(dst) == read(baseline), "convert_jsonl output differs"
+            print(
+                f"  convert_jsonl -j {workers:<2} : {result.rows_per_sec:10,.0f} "
+                f"records/s ({result.converted:,} of {result.values:,} values "
+                f"converted)"
+            )
+
+        tracemalloc.start()
+        run(src, os.path.join(tmp, "traced.jsonl"), 1)
+        peak = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+        tracemalloc.stop()
+        print(f"  peak memory, -j 1   : {peak:10.1f} MB for a {mb:.1f} MB input")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Compare greedy conversion with k-best conversion over the lattice (k=1
+and k=5) on long input, and report how often the best k-best candidate
+of a word equals the greedy output.
+
+Usage:
+    python benchmarks/bench_lattice.py [--mb 1]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from nepali_unicoder.bench import ROMAN_WORDS, make_corpus
+from nepali_unicoder.engine import Engine
+from nepali_unicoder.lattice import KBestTransliterator
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    out = func(*args)
+    return out, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--mb", type=float, default=1.0, help="Corpus size in MB.")
+    args = parser.parse_args()
+
+    engine = Engine(mode="roman")
+    text = make_corpus(ROMAN_WORDS, args.mb)
+    mb = len(text) / (1024 * 1024)
+    print(f"roman: {mb:.1f} MB")
+
+    expected, seconds = timed(engine.transliterate, text)
+    print(f"  greedy     : {mb / seconds:7.2f} MB/s")
+    for k in (1, 5):
+        # A fresh transliterator, so the word memo starts empty
+        kbest = KBestTransliterator(engine)
+        candidates, seconds = timed(kbest.transliterate_kbest, text, k)
+        print(f"  k-best k={k}: {mb / seconds:7.2f} MB/s")
+        if k == 1:
+            assert candidates[0].text == expected, "k=1 differs from greedy"
+
+    # Words without the memo, as on text with no repeated words
+    words = sorted(set(text.split()))
+    kbest = KBestTransliterator(engine, cache_size=0)
+    agree = sum(
+        kbest.transliterate_kbest(word, 1)[0].text == engine.transliterate(word)
+        for word in words
+    )
+    print(f"  k=1 equals greedy on {agree}/{len(words)} distinct words")
+
+
+if __name__ == "__main__":
+    main()
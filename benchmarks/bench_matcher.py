@@ -0,0 +1,72 @@
+"""
+Compare the per-position Trie.longest_match loop with CompiledTrie.scan
+and the single-regex RegexMatcher.scan.
+
+Usage:
+    python benchmarks/bench_matcher.py [--mb 4]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+# Corpora are shared with the other scripts and `python -m nepali_unicoder.bench`
+from nepali_unicoder.bench import PREETI_WORDS, ROMAN_WORDS, make_corpus
+from nepali_unicoder.loader import PreetiLoader, RuleLoader
+
+
+def loop_scan(trie, text):
+    result = []
+    idx = 0
+    n = len(text)
+    while idx < n:
+        match_val, match_len = trie.longest_match(text, idx)
+        if match_val:
+            result.append(match_val)
+            idx += match_len
+        else:
+            result.append(text[idx])
+            idx += 1
+    return "".join(result)
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    out = func(*args)
+    return out, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--mb", type=float, default=4.0, help="Corpus size in MB.")
+    args = parser.parse_args()
+
+    for name, loader, words in (
+        ("roman", RuleLoader(), ROMAN_WORDS),
+        ("preeti", PreetiLoader(), PREETI_WORDS),
+    ):
+        trie = loader.load()
+        compiled = trie.compile()
+        regex = trie.compile_regex()
+        corpus = make_corpus(words, args.mb)
+        mb = len(corpus) / (1024 * 1024)
+
+        expected, t_loop = timed(loop_scan, trie, corpus)
+        actual, t_scan = timed(lambda text: "".join(compiled.scan(text)), corpus)
+        assert actual == expected, "compiled output differs from Trie output"
+        actual, t_regex = timed(lambda text: "".join(regex.scan(text)), corpus)
+        assert actual == expected, "regex output differs from Trie output"
+
+        print(f"{name}: {mb:.1f} MB")
+        print(f"  Trie.longest_match loop : {mb / t_loop:6.2f} MB/s")
+        print(f"  CompiledTrie.scan       : {mb / t_scan:6.2f} MB/s")
+        print(f"  RegexMatcher.scan       : {mb / t_regex:6.2f} MB/s")
+        print(f"  speedup (compiled)      : {t_loop / t_scan:6.2f}x")
+        print(f"  speedup (regex)         : {t_loop / t_regex:6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Compare the per-character conversion of NUMBER tokens (one
+longest_match call per digit) with the precomputed str.translate table,
+and, in Preeti mode, CompiledTrie.scan of ROMAN tokens with the
+single-character translate path, on number-dense input such as tables
+and financial reports.
+
+Usage:
+    python benchmarks/bench_numbers.py [--mb 2]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from nepali_unicoder.bench import PREETI_WORDS, ROMAN_WORDS
+from nepali_unicoder.engine import Engine
+
+
+def make_numeric(words, size_mb, seed=0):
+    """Table-like rows: a date, amounts, a percentage and a few words."""
+    rng = random.Random(seed)
+    target = int(size_mb * 1024 * 1024)
+    rows = []
+    total = 0
+    while total < target:
+        cells = [
+            f"{rng.randint(2000, 2090)}/{rng.randint(1, 12):02}/{rng.randint(1, 32):02}",
+            f"{rng.randint(0, 10**7)}.{rng.randint(0, 99):02}",
+            f"{rng.randint(0, 10**5)}",
+            f"{rng.random() * 100:.1f}%",
+            " ".join(rng.choices(words, k=2)),
+        ]
+        rows.append("  ".join(cells))
+        total += len(rows[-1]) + 1
+    return "\n".join(rows)
+
+
+def numbers_per_char(matcher, values):
+    result = []
+    for value in values:
+        for char in value:
+            match_val = matcher.longest_match(char)[0] if char.isdigit() else None
+            result.append(match_val or char)
+    return "".join(result)
+
+
+def numbers_translate(table, values):
+    return "".join(value.translate(table) for value in values)
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    out = func(*args)
+    return out, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--mb", type=float, default=2.0, help="Corpus size in MB.")
+    args = parser.parse_args()
+
+    for mode, words in (("roman", ROMAN_WORDS), ("preeti", PREETI_WORDS)):
+        engine = Engine(mode=mode)
+        text = make_numeric(words, args.mb)
+        mb = len(text) / (1024 * 1024)
+        tokens = list(engine.tokenizer.iter_tokens(text, engine.use_blocks))
+        numbers = [value for value, kind in tokens if kind == "NUMBER"]
+        digits = sum(len(value) for value in numbers)
+
+        print(f"{mode}: {mb:.1f} MB, {digits / len(text):.0%} in numbers")
+        expected, loop_seconds = timed(numbers_per_char, engine._rules_matcher, numbers)
+        actual, table_seconds = timed(numbers_translate, engine._digit_table, numbers)
+        assert actual == expected, "translated numbers differ"
+        print(f"  numbers, per char  : {digits / 1e6 / loop_seconds:7.2f} M chars/s")
+        print(f"  numbers, translate : {digits / 1e6 / table_seconds:7.2f} M chars/s")
+
+        if engine._single_table is not None:
+            scanner = Engine(mode=mode)
+            scanner._single_table = None
+            expected, scan_seconds = timed(scanner.transliterate, text)
+            actual, seconds = timed(engine.transliterate, text)
+            assert actual == expected, "translated text differs"
+            print(f"  transliterate, scan      : {mb / scan_seconds:6.2f} MB/s")
+            print(f"  transliterate, translate : {mb / seconds:6.2f} MB/s")
+        else:
+            _, seconds = timed(engine.transliterate, text)
+            print(f"  transliterate      : {mb / seconds:7.2f} MB/s")
+
+
+if __name__ == "__main__":
+    main()
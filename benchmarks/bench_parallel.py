@@ -0,0 +1,61 @@
+"""
+Measure how Converter.convert_many scales with the number of worker
+processes on a synthetic corpus of independent records.
+
+Usage:
+    python benchmarks/bench_parallel.py [--records 200000] [--max-workers N]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from bench_matcher import PREETI_WORDS, ROMAN_WORDS
+
+from nepali_unicoder.convert import Converter
+
+
+def make_records(words, count, seed=0):
+    rng = random.Random(seed)
+    return [
+        " ".join(rng.choice(words) for _ in range(rng.randint(5, 40)))
+        for _ in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--records", type=int, default=200_000)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunksize", type=int, default=256)
+    args = parser.parse_args()
+
+    print(f"CPUs available: {os.cpu_count()}")
+    for mode, words in (("roman", ROMAN_WORDS), ("preeti", PREETI_WORDS)):
+        records = make_records(words, args.records)
+        converter = Converter(mode=mode)
+        baseline = None
+        print(f"{mode}: {len(records)} records")
+        workers = 1
+        while workers <= args.max_workers:
+            start = time.perf_counter()
+            for _ in converter.convert_many(
+                records, workers=workers, chunksize=args.chunksize
+            ):
+                pass
+            elapsed = time.perf_counter() - start
+            if baseline is None:
+                baseline = elapsed
+            print(
+                f"  workers={workers:<3} {len(records) / elapsed:10.0f} records/s"
+                f"  speedup {baseline / elapsed:5.2f}x"
+            )
+            workers *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Compare the rule-by-rule re.sub cascade with PostRuleRewriter on the
+mapped (pre-post-rule) output of a large Preeti document.
+
+Usage:
+    python benchmarks/bench_postrules.py [--mb 4]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from bench_matcher import PREETI_WORDS, make_corpus
+
+from nepali_unicoder.engine import Engine
+
+# Words exercising reph, m and matra reordering
+EXTRA_WORDS = ["s{sf", "wd{", "k|;Ën]", "5'§}", "qm", "km", "ls", "cf]"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--mb", type=float, default=4.0)
+    args = parser.parse_args()
+
+    engine = Engine(mode="preeti")
+    for name, words in (
+        ("plain words", PREETI_WORDS),
+        ("with reph/m words", PREETI_WORDS + EXTRA_WORDS),
+    ):
+        mapped = engine._map(make_corpus(words, args.mb))
+        mb = len(mapped.encode("utf-8")) / (1024 * 1024)
+
+        start = time.perf_counter()
+        expected = mapped
+        for pattern, replacement in engine.post_rules:
+            expected = pattern.sub(replacement, expected)
+        t_cascade = time.perf_counter() - start
+
+        start = time.perf_counter()
+        actual = engine._apply_post_rules(mapped)
+        t_rewriter = time.perf_counter() - start
+        assert actual == expected, "rewriter output differs from cascade"
+
+        print(f"{name}: {mb:.1f} MB of mapped text")
+        print(f"  re.sub cascade   : {t_cascade * 1000:8.1f} ms")
+        print(f"  PostRuleRewriter : {t_rewriter * 1000:8.1f} ms")
+        print(f"  speedup          : {t_cascade / t_rewriter:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Compare Preeti conversion from bytes with PreetiBytesEngine against
+decoding to str and converting with Engine: the mapping stage, the whole
+conversion, and converting a file (memory-mapped vs read as text).
+
+Usage:
+    python benchmarks/bench_preeti_bytes.py [--mb 8]
+"""
+
+import argparse
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from nepali_unicoder.bench import PREETI_EXTRAS, PREETI_WORDS, make_corpus
+from nepali_unicoder.engine import Engine
+from nepali_unicoder.preeti_bytes import PreetiBytesEngine
+
+
+def best(func, *args, repeat=3):
+    seconds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        seconds.append(time.perf_counter() - start)
+    return result, min(seconds)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--mb", type=float, default=8.0, help="Corpus size in MB.")
+    args = parser.parse_args()
+
+    engine = Engine.shared(mode="preeti")
+    bytes_engine = PreetiBytesEngine(engine)
+    # Paragraphs of 100 words: Preeti text can only be cut at blank lines
+    words = make_corpus(PREETI_WORDS + PREETI_EXTRAS, args.mb).split(" ")
+    paragraphs = [" ".join(words[i : i + 100]) for i in range(0, len(words), 100)]
+    data = "\n\n".join(paragraphs).encode("cp1252")
+    mb = len(data) / (1024 * 1024)
+    print(f"preeti: {mb:.1f} MB")
+
+    text = data.decode("cp1252")
+    expected, seconds = best(engine._map, text)
+    actual, bytes_seconds = best(bytes_engine._map, memoryview(data))
+    assert actual == expected, "mapped output differs"
+    print(f"  map, str              : {mb / seconds:7.2f} MB/s")
+    print(f"  map, bytes            : {mb / bytes_seconds:7.2f} MB/s")
+
+    expected, seconds = best(lambda: engine.transliterate(data.decode("cp1252")))
+    actual, bytes_seconds = best(bytes_engine.transliterate, data)
+    assert actual == expected, "converted output differs"
+    print(f"  decode + transliterate: {mb / seconds:7.2f} MB/s")
+    print(f"  bytes transliterate   : {mb / bytes_seconds:7.2f} MB/s")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "in.txt")
+        with open(path, "wb") as f:
+            f.write(data)
+
+        def text_file():
+            out = io.StringIO()
+            with open(path, encoding="cp1252", newline="") as src:
+                engine.transliterate_file(src, out, chunk_size=1 << 20)
+            return out.getvalue().encode("utf-8")
+
+        def mapped_file():
+            out = io.BytesIO()
+            bytes_engine.transliterate_file(path, out)
+            return out.getvalue()
+
+        expected, seconds = best(text_file, repeat=1)
+        actual, bytes_seconds = best(mapped_file, repeat=1)
+        assert actual == expected, "file output differs"
+        print(f"  file, text stream     : {mb / seconds:7.2f} MB/s")
+        print(f"  file, memory-mapped   : {mb / bytes_seconds:7.2f} MB/s")
+
+
+if __name__ == "__main__":
+    main()
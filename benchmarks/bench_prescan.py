@@ -0,0 +1,92 @@
+"""
+Measure the prescan fast path on mixed-script input: lines that are
+already Unicode Devanagari, lines mixing Devanagari with text to convert,
+and lines of text to convert only. Reports the share of characters the
+prescan copies through and throughput with and without it.
+
+Usage:
+    python benchmarks/bench_prescan.py [--mb 2] [--unicode 0.6]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from nepali_unicoder.bench import PREETI_WORDS, ROMAN_WORDS
+from nepali_unicoder.engine import Engine
+from nepali_unicoder.prescan import classify_spans, detect_mode
+
+
+def make_mixed(words, unicode_share, size_mb, seed=0):
+    """Lines of Devanagari, of `words`, or of both, about `size_mb` MB."""
+    rng = random.Random(seed)
+    devanagari = Engine.shared().transliterate(" ".join(ROMAN_WORDS)).split()
+    target = int(size_mb * 1024 * 1024)
+    lines = []
+    total = 0
+    while total < target:
+        roll = rng.random()
+        if roll < unicode_share:
+            line = rng.choices(devanagari, k=12)
+        elif roll < unicode_share + (1 - unicode_share) / 2:
+            line = rng.choices(devanagari, k=6) + rng.choices(words, k=6)
+            rng.shuffle(line)
+        else:
+            line = rng.choices(words, k=12)
+        lines.append(" ".join(line))
+        total += len(lines[-1]) + 1
+    return "\n".join(lines)
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--mb", type=float, default=2.0, help="Corpus size in MB.")
+    parser.add_argument(
+        "--unicode", type=float, default=0.6, help="Share of all-Devanagari lines."
+    )
+    args = parser.parse_args()
+
+    for mode, words in (("roman", ROMAN_WORDS), ("preeti", PREETI_WORDS)):
+        text = make_mixed(words, args.unicode, args.mb)
+        mb = len(text) / (1024 * 1024)
+        plain = Engine(mode=mode)
+        prescan = Engine(mode=mode, prescan=True)
+
+        kinds = {}
+        for span in classify_spans(text):
+            kinds[span.kind] = kinds.get(span.kind, 0) + span.end - span.start
+        skipped = sum(len(run) for run in prescan._passthrough_re.findall(text))
+        detected, detect_seconds = timed(detect_mode, text)
+
+        print(f"{mode}: {mb:.1f} MB, {args.unicode:.0%} Devanagari lines")
+        shares = ", ".join(f"{kind} {n / len(text):.0%}" for kind, n in kinds.items())
+        print(f"  spans            : {shares}")
+        print(f"  copied through   : {skipped / len(text):.0%} of characters")
+        print(f"  detected mode    : {detected} ({detect_seconds * 1000:.1f} ms)")
+
+        plain_out, plain_seconds = timed(plain.transliterate, text)
+        prescan_out, prescan_seconds = timed(prescan.transliterate, text)
+        if mode == "roman":
+            assert prescan_out == plain_out, "prescan changed the roman output"
+        print(f"  without prescan  : {mb / plain_seconds:6.2f} MB/s")
+        print(f"  with prescan     : {mb / prescan_seconds:6.2f} MB/s")
+
+        lines = text.split("\n")
+        _, plain_seconds = timed(plain.transliterate_many, lines)
+        _, prescan_seconds = timed(prescan.transliterate_many, lines)
+        print(f"  many, without    : {mb / plain_seconds:6.2f} MB/s")
+        print(f"  many, with       : {mb / prescan_seconds:6.2f} MB/s")
+
+
+if __name__ == "__main__":
+    main()
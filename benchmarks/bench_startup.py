@@ -0,0 +1,80 @@
+"""
+Compare Engine startup time on the cold (no cache), cached (rule tables
+loaded from the on-disk cache) and shared (Engine.shared) paths.
+
+Cold and cached startups are measured in fresh interpreter processes so
+that nothing is reused from earlier runs.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 20]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from nepali_unicoder.convert import Converter
+
+# Passed to the child processes as PYTHONPATH
+SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), "../src"))
+
+CHILD = """
+import time
+from nepali_unicoder.engine import Engine
+start = time.perf_counter()
+Engine(mode={mode!r})
+print(time.perf_counter() - start)
+"""
+
+
+def child_time(mode, env):
+    out = subprocess.run(
+        [sys.executable, "-c", CHILD.format(mode=mode)],
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return float(out)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        base_env = dict(os.environ, PYTHONPATH=SRC)
+        cold_env = dict(base_env, NEPALI_UNICODER_NO_CACHE="1")
+        cached_env = dict(base_env, NEPALI_UNICODER_CACHE_DIR=cache_dir)
+        # Engines built in this process use the temporary cache too
+        os.environ["NEPALI_UNICODER_CACHE_DIR"] = cache_dir
+
+        for mode in ("roman", "preeti"):
+            # Populate the cache once
+            child_time(mode, cached_env)
+
+            cold = [child_time(mode, cold_env) for _ in range(args.runs)]
+            cached = [child_time(mode, cached_env) for _ in range(args.runs)]
+
+            # A Converter looks up its shared Engine on first use
+            Converter(mode=mode).engine
+            start = time.perf_counter()
+            for _ in range(args.runs):
+                Converter(mode=mode).engine
+            shared = (time.perf_counter() - start) / args.runs
+
+            print(f"{mode} (first Engine in a fresh process, median of {args.runs}):")
+            print(f"  cold   : {statistics.median(cold) * 1000:8.2f} ms")
+            print(f"  cached : {statistics.median(cached) * 1000:8.2f} ms")
+            print(f"  shared : {shared * 1000:8.4f} ms per Converter()")
+
+
+if __name__ == "__main__":
+    main()
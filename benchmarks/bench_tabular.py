@@ -0,0 +1,97 @@
+"""
+Measure rows/sec converting columns of a large synthetic CSV with high
+value repetition: a per-row `Converter.convert` apply (the baseline),
+and `convert_csv`, which converts each distinct value once, on one and
+on several processes.
+
+Usage:
+    python benchmarks/bench_tabular.py [--rows 1000000] [--distinct 20000]
+"""
+
+import argparse
+import csv
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from nepali_unicoder.bench import ROMAN_WORDS
+from nepali_unicoder.convert import Converter
+from nepali_unicoder.tabular import convert_csv
+
+
+def write_csv(path, rows, distinct, seed=0):
+    """Rows of an id, a name and an address column drawn from `distinct` values."""
+    rng = random.Random(seed)
+    names = [" ".join(rng.choices(ROMAN_WORDS, k=2)) for _ in range(distinct)]
+    places = [" ".join(rng.choices(ROMAN_WORDS, k=4)) for _ in range(distinct)]
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["id", "name", "address"])
+        for i in range(rows):
+            # Zipf-like repetition: a few values are very common
+            name = names[min(int(rng.paretovariate(1.0)) - 1, distinct - 1)]
+            writer.writerow([i, name, rng.choice(places)])
+
+
+def apply_rows(src, dst, columns):
+    converter = Converter()
+    with open(src, encoding="utf-8", newline="") as f:
+        with open(dst, "w", encoding="utf-8", newline="") as out:
+            reader = csv.reader(f)
+            writer = csv.writer(out)
+            header = next(reader)
+            writer.writerow(header)
+            indexes = [header.index(name) for name in columns]
+            for row in reader:
+                for i in indexes:
+                    row[i] = converter.convert(row[i])
+                writer.writerow(row)
+
+
+def read(path):
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1000000, help="CSV rows.")
+    parser.add_argument(
+        "--distinct", type=int, default=20000, help="Distinct values per column."
+    )
+    parser.add_argument(
+        "--jobs", type=int, default=os.cpu_count() or 1, help="Processes to compare."
+    )
+    args = parser.parse_args()
+    columns = ["name", "address"]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, "in.csv")
+        write_csv(src, args.rows, args.distinct)
+        mb = os.path.getsize(src) / (1024 * 1024)
+        print(f"{args.rows:,} rows, {mb:.1f} MB, {args.distinct:,} distinct values")
+
+        baseline = os.path.join(tmp, "apply.csv")
+        start = time.perf_counter()
+        apply_rows(src, baseline, columns)
+        seconds = time.perf_counter() - start
+        print(f"  per-row apply     : {args.rows / seconds:12,.0f} rows/s")
+
+        for workers in sorted({1, args.jobs}):
+            dst = os.path.join(tmp, f"out{workers}.csv")
+            with open(src, encoding="utf-8", newline="") as f:
+                with open(dst, "w", encoding="utf-8", newline="") as out:
+                    result = convert_csv(f, out, columns, workers=workers)
+            assert read(dst) == read(baseline), "convert_csv output differs"
+            print(
+                f"  convert_csv -j {workers:<2} : {result.rows_per_sec:12,.0f} rows/s "
+                f"({result.converted:,} of {result.values:,} values converted)"
+            )
+
+
+if __name__ == "__main__":
+    main()
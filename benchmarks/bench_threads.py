@@ -0,0 +1,64 @@
+"""
+Measure how conversion scales with threads sharing one Engine, using
+Converter.convert_many(threads=N) on short records. With the GIL only one
+thread converts at a time, so the throughput stays flat; on a
+free-threaded build (e.g. python3.13t) it should grow with the number of
+cores.
+
+Usage:
+    python benchmarks/bench_threads.py [--mb 4] [--threads 1,2,4,8]
+"""
+
+import argparse
+import os
+import sys
+import sysconfig
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from nepali_unicoder.bench import PREETI_EXTRAS, PREETI_WORDS, ROMAN_WORDS, make_corpus
+from nepali_unicoder.convert import Converter
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--mb", type=float, default=4.0, help="Corpus size in MB.")
+    parser.add_argument(
+        "--threads", default="1,2,4,8", help="Comma-separated thread counts."
+    )
+    args = parser.parse_args()
+    counts = [int(count) for count in args.threads.split(",")]
+
+    free_threaded = bool(sysconfig.get_config_var("Py_GIL_DISABLED"))
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(
+        f"Python {sys.version.split()[0]}, free-threaded build: {free_threaded}, "
+        f"GIL enabled: {gil}, CPUs: {os.cpu_count()}"
+    )
+
+    for mode, words in (
+        ("roman", ROMAN_WORDS),
+        ("preeti", PREETI_WORDS + PREETI_EXTRAS),
+    ):
+        converter = Converter(mode=mode)
+        # Records of about 10 words
+        corpus = make_corpus(words, args.mb).split(" ")
+        records = [" ".join(corpus[i : i + 10]) for i in range(0, len(corpus), 10)]
+        mb = sum(map(len, records)) / (1024 * 1024)
+        expected = list(converter.convert_many(records, workers=1))
+
+        print(f"{mode}: {mb:.1f} MB in {len(records)} records")
+        base = None
+        for threads in counts:
+            start = time.perf_counter()
+            results = list(converter.convert_many(records, threads=threads))
+            seconds = time.perf_counter() - start
+            assert results == expected, "threaded output differs"
+            rate = mb / seconds
+            base = base or rate
+            print(f"  {threads:2} threads: {rate:6.2f} MB/s ({rate / base:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
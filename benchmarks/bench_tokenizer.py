@@ -0,0 +1,110 @@
+"""
+Compare the character-by-character tokenizer loop with the master-regex
+Tokenizer on texts dominated by plain words, numbers and braces.
+
+Usage:
+    python benchmarks/bench_tokenizer.py [--mb 2]
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from bench_matcher import ROMAN_WORDS, make_corpus
+
+from nepali_unicoder.tokenizer import Tokenizer
+
+NUMBER_WORDS = ["12", "2081", "3.14", "0.5", "100", "7", "ko", "ma", "..."]
+BRACE_WORDS = ["{Python}", "{{", "}", "{a b}", "{}", "mero", "{x}", "ho", "{"]
+
+
+def loop_tokenize(text, use_blocks=True):
+    """The tokenizer loop as it was before the master regex."""
+    tokens = []
+    i = 0
+    n = len(text)
+    roman_buffer = []
+    re_block = re.compile(r"\{([^}]*)\}")
+    re_number = re.compile(r"\d+(\.\d+)?")
+
+    def flush_roman():
+        if roman_buffer:
+            tokens.append(("".join(roman_buffer), "ROMAN"))
+            roman_buffer.clear()
+
+    while i < n:
+        if text.startswith("...", i):
+            flush_roman()
+            tokens.append(("...", "LITERAL"))
+            i += 3
+            continue
+        if use_blocks:
+            if text.startswith("{{", i):
+                flush_roman()
+                tokens.append(("{", "LITERAL"))
+                i += 2
+                continue
+            match_block = re_block.match(text, i)
+            if match_block:
+                flush_roman()
+                tokens.append((match_block.group(1), "BLOCK"))
+                i = match_block.end()
+                continue
+            if text.startswith("}", i) or text.startswith("{", i):
+                flush_roman()
+                tokens.append((text[i], "LITERAL"))
+                i += 1
+                continue
+        match_number = re_number.match(text, i)
+        if match_number:
+            flush_roman()
+            tokens.append((match_number.group(0), "NUMBER"))
+            i = match_number.end()
+            continue
+        roman_buffer.append(text[i])
+        i += 1
+
+    flush_roman()
+    return tokens
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    out = func(*args)
+    return out, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--mb", type=float, default=2.0, help="Corpus size in MB.")
+    args = parser.parse_args()
+
+    tokenizer = Tokenizer()
+    for name, words in (
+        ("words", ROMAN_WORDS),
+        ("numbers", NUMBER_WORDS),
+        ("braces", BRACE_WORDS),
+    ):
+        corpus = make_corpus(words, args.mb)
+        mb = len(corpus) / (1024 * 1024)
+
+        expected, t_loop = timed(loop_tokenize, corpus)
+        actual, t_list = timed(tokenizer.tokenize, corpus)
+        assert actual == expected, "Tokenizer output differs from the loop"
+        _, t_iter = timed(
+            lambda text: sum(1 for _ in tokenizer.iter_tokens(text)), corpus
+        )
+
+        print(f"{name}: {mb:.1f} MB, {len(expected)} tokens")
+        print(f"  character loop       : {mb / t_loop:7.2f} MB/s")
+        print(f"  Tokenizer.tokenize   : {mb / t_list:7.2f} MB/s")
+        print(f"  Tokenizer.iter_tokens: {mb / t_iter:7.2f} MB/s")
+        print(f"  speedup              : {t_loop / t_list:7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Measure the Engine word cache on a Zipf-distributed corpus: a few
+thousand distinct words where the most frequent ones dominate, as in real
+text. Reports throughput and hit rate for several cache sizes.
+
+Usage:
+    python benchmarks/bench_word_cache.py [--mb 2] [--vocab 20000]
+"""
+
+import argparse
+import itertools
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from nepali_unicoder.engine import Engine
+
+SYLLABLES = (
+    "ka kha ga gha na cha chha ja ta tha da dha pa pha ba bha ma ya ra la "
+    "wa sa sha ha ki ku ke ko kaa ti tu te to taa ni nu ne no naa ri ru re"
+).split()
+
+
+def make_vocabulary(size, rng):
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(1, 4))))
+    return sorted(words)
+
+
+def make_zipf_corpus(vocab, size_mb, seed=0):
+    rng = random.Random(seed)
+    # Word at rank r is drawn with probability proportional to 1 / r
+    cumulative = list(
+        itertools.accumulate(1.0 / rank for rank in range(1, len(vocab) + 1))
+    )
+    target = int(size_mb * 1024 * 1024)
+    parts = []
+    total = 0
+    while total < target:
+        line = rng.choices(vocab, cum_weights=cumulative, k=12)
+        line[rng.randrange(12)] += rng.choice((",", ".", " 12", " {OK}"))
+        parts.append(" ".join(line))
+        total += len(parts[-1]) + 1
+    return "\n".join(parts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--mb", type=float, default=2.0, help="Corpus size in MB.")
+    parser.add_argument("--vocab", type=int, default=20000, help="Distinct words.")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    corpus = make_zipf_corpus(make_vocabulary(args.vocab, rng), args.mb)
+    mb = len(corpus) / (1024 * 1024)
+    print(f"corpus: {mb:.1f} MB, {args.vocab} distinct words")
+
+    expected = None
+    for size in (0, 1000, 5000, 20000):
+        engine = Engine(word_cache_size=size)
+        start = time.perf_counter()
+        output = engine.transliterate(corpus)
+        elapsed = time.perf_counter() - start
+        if expected is None:
+            expected = output
+        assert output == expected, "cached output differs from uncached output"
+
+        info = engine.word_cache_info()
+        if info is None:
+            print(f"  no cache          : {mb / elapsed:6.2f} MB/s")
+        else:
+            rate = info.hits / max(info.hits + info.misses, 1)
+            print(
+                f"  cache size {size:6d} : {mb / elapsed:6.2f} MB/s, hit rate {rate:.1%}"
+            )
+
+
+if __name__ == "__main__":
+    main()
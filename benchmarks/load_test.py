@@ -0,0 +1,134 @@
+"""
+Load-test the HTTP server started by `python -m nepali_unicoder serve`.
+
+Starts the server in a subprocess (unless --url is given), then sends
+batched POST /convert requests from several client threads and reports
+requests/sec and p50/p99 latency.
+
+Usage:
+    python benchmarks/load_test.py [--clients 8] [--requests 400] [--batch 16]
+    python benchmarks/load_test.py --url http://127.0.0.1:8000 --mode preeti
+"""
+
+import argparse
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from bench_matcher import PREETI_WORDS, ROMAN_WORDS
+
+SRC = sys.path[0]
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port):
+    env = dict(os.environ, PYTHONPATH=SRC)
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "nepali_unicoder",
+            "serve",
+            "--port",
+            str(port),
+            "--quiet",
+        ],
+        env=env,
+        stdout=subprocess.DEVNULL,
+    )
+    url = f"http://127.0.0.1:{port}"
+    for _ in range(100):
+        try:
+            urllib.request.urlopen(url + "/health").close()
+            return process, url
+        except OSError:
+            time.sleep(0.05)
+    process.kill()
+    raise RuntimeError("server did not start")
+
+
+def make_payloads(mode, batch, count, seed=0):
+    rng = random.Random(seed)
+    words = PREETI_WORDS if mode == "preeti" else ROMAN_WORDS
+    payloads = []
+    for _ in range(count):
+        texts = [
+            " ".join(rng.choices(words, k=rng.randint(5, 40))) for _ in range(batch)
+        ]
+        payloads.append(json.dumps({"mode": mode, "texts": texts}).encode("utf-8"))
+    return payloads
+
+
+def percentile(sorted_values, fraction):
+    index = min(int(fraction * len(sorted_values)), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--url", help="Server to test (default: start one).")
+    parser.add_argument("--mode", default="roman", choices=("roman", "preeti"))
+    parser.add_argument("--clients", type=int, default=8, help="Client threads.")
+    parser.add_argument("--requests", type=int, default=400, help="Total requests.")
+    parser.add_argument("--batch", type=int, default=16, help="Texts per request.")
+    args = parser.parse_args()
+
+    process = None
+    url = args.url
+    if url is None:
+        process, url = start_server(free_port())
+
+    payloads = make_payloads(args.mode, args.batch, args.requests)
+    latencies = []
+    lock = threading.Lock()
+
+    def client(worker):
+        for payload in payloads[worker :: args.clients]:
+            request = urllib.request.Request(url + "/convert", data=payload)
+            start = time.perf_counter()
+            with urllib.request.urlopen(request) as response:
+                response.read()
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies.append(elapsed)
+
+    try:
+        threads = [
+            threading.Thread(target=client, args=(i,)) for i in range(args.clients)
+        ]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        total = time.perf_counter() - start
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    latencies.sort()
+    print(
+        f"{len(latencies)} requests x {args.batch} texts, {args.clients} clients, "
+        f"mode={args.mode}"
+    )
+    print(f"  requests/sec : {len(latencies) / total:8.1f}")
+    print(f"  p50 latency  : {percentile(latencies, 0.50) * 1000:8.2f} ms")
+    print(f"  p99 latency  : {percentile(latencies, 0.99) * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Convert Romanized Nepali and Preeti font text to Unicode Devanagari.
+
+    import nepali_unicoder
+
+    nepali_unicoder.convert("mero naam")                # मेरो नाम
+    nepali_unicoder.Converter(mode="preeti").convert("g]kfn")
+
+`convert` and `Converter` come from the `convert` submodule, which only
+imports the engine when it is first used. The other names below are
+imported from their submodules on first access, so `import
+nepali_unicoder` loads no rules.
+"""
+
+import importlib
+
+# Imported here so that the package attribute `convert` is the function,
+# not the submodule of the same name
+from nepali_unicoder.convert import Converter, convert
+
+__version__ = "0.1.2"
+
+# Public name -> submodule that defines it, imported on first access
+_EXPORTS = {
+    "Engine": "engine",
+    "MODES": "engine",
+    "REVERSE_MODES": "engine",
+    "AsyncConverter": "service",
+    "KBestTransliterator": "lattice",
+    "PreetiBytesEngine": "preeti_bytes",
+    "ColumnConverter": "tabular",
+    "convert_csv": "tabular",
+    "convert_jsonl": "tabular",
+    "convert_dir": "bulk",
+}
+
+__all__ = ["Converter", "convert"] + sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(f"{__name__}.{module_name}")
+    value = globals()[name] = getattr(module, name)
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
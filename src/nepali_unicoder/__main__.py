@@ -1,40 +1,462 @@
-import argparse
+import itertools
 import sys
+from typing import Dict, List, Optional
 
-from nepali_unicoder.convert import Converter
+# argparse and the converter modules are imported in the functions that
+# use them, so that the common invocations handled by _fast_main start
+# quickly.
 
 
-def main():
+def _conversion_options(jobs_help: str):
+    """
+    Return a parent parser with the options that choose the conversion,
+    shared by the converting commands.
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument(
+        "--preeti",
+        action="store_true",
+        help="Enable Preeti to Unicode conversion mode.",
+    )
+    parser.add_argument(
+        "--reverse",
+        action="store_true",
+        help="Convert Unicode back to Roman (or, with --preeti, to Preeti).",
+    )
+    parser.add_argument(
+        "--prescan",
+        action="store_true",
+        help="Copy Devanagari and other text that no rule converts through "
+        "untouched, without converting it.",
+    )
+    parser.add_argument("-j", "--jobs", type=int, help=jobs_help)
+    return parser
+
+
+def _mode(args) -> str:
+    mode = "preeti" if args.preeti else "roman"
+    if args.reverse:
+        mode = "unicode-" + mode
+    return mode
+
+
+def _fast_main(argv: List[str]) -> bool:
+    """
+    Convert `TEXT...` or stdin, with an optional leading `--preeti`, without
+    building the argument parser. Returns False for any other arguments,
+    which main() then parses in full.
+    """
+    mode = "roman"
+    if argv[:1] == ["--preeti"]:
+        mode = "preeti"
+        argv = argv[1:]
+    if any(arg.startswith("-") for arg in argv):
+        return False
+    if argv:
+        text = " ".join(argv)
+    elif not sys.stdin.isatty():
+        text = sys.stdin.read().strip()
+    else:
+        # Let the parser print the help
+        return False
+
+    from nepali_unicoder.engine import Engine
+
+    print(Engine.shared(mode=mode).transliterate(text))
+    return True
+
+
+def serve_main(argv: List[str]) -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="python -m nepali_unicoder serve",
+        description="Serve conversions over HTTP as JSON (POST /convert).",
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="Address to bind.")
+    parser.add_argument("--port", type=int, default=8000, help="Port to bind.")
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=8,
+        help="Maximum number of requests converted at the same time.",
+    )
+    parser.add_argument(
+        "--dictionary",
+        action="append",
+        default=[],
+        metavar="PATH",
+        help="JSON file of custom roman words, reread on POST /reload "
+        "(repeatable; later files take precedence).",
+    )
+    parser.add_argument(
+        "--quiet", action="store_true", help="Do not log every request."
+    )
+    args = parser.parse_args(argv)
+
+    from nepali_unicoder.service import serve
+
+    serve(
+        args.host,
+        args.port,
+        max_concurrency=args.max_concurrency,
+        quiet=args.quiet,
+        dictionaries=args.dictionary,
+    )
+
+
+def convert_dir_main(argv: List[str]) -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="python -m nepali_unicoder convert-dir",
+        description="Convert every matching file under SRC into the same path "
+        "under DST.",
+        parents=[
+            _conversion_options("Number of worker processes (default: number of CPUs).")
+        ],
+    )
+    parser.add_argument("src", help="Directory of input files.")
+    parser.add_argument("dst", help="Directory for the converted files.")
+    parser.add_argument(
+        "--pattern", default="*.txt", help="File name pattern to convert."
+    )
+    parser.add_argument(
+        "--no-resume",
+        action="store_true",
+        help="Convert all files again instead of skipping finished ones.",
+    )
+    args = parser.parse_args(argv)
+
+    from nepali_unicoder.bulk import convert_dir
+
+    def progress(relpath, skipped):
+        print(("skipped " if skipped else "converted ") + relpath, file=sys.stderr)
+
+    try:
+        result = convert_dir(
+            args.src,
+            args.dst,
+            mode=_mode(args),
+            workers=args.jobs,
+            pattern=args.pattern,
+            resume=not args.no_resume,
+            progress=progress,
+            prescan=args.prescan,
+        )
+    except ValueError as exc:
+        parser.error(str(exc))
+    print(
+        f"{result.files} converted, {result.skipped} skipped, "
+        f"{result.bytes_read / (1024 * 1024):.1f} MB in {result.seconds:.2f}s "
+        f"({result.mb_per_sec:.2f} MB/s)",
+        file=sys.stderr,
+    )
+    for relpath in result.unsplit:
+        print(
+            f"note: {relpath} had no safe split point and was converted in one piece",
+            file=sys.stderr,
+        )
+
+
+def convert_csv_main(argv: List[str]) -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="python -m nepali_unicoder convert-csv",
+        description="Convert the given columns of a CSV file, converting each "
+        "distinct value once.",
+        parents=[
+            _conversion_options(
+                "Number of worker processes converting distinct values (default: 1)."
+            )
+        ],
+    )
+    parser.add_argument("src", help="CSV file with a header row, or - for stdin.")
+    parser.add_argument(
+        "dst", nargs="?", help="File for the converted CSV (default: stdout)."
+    )
+    parser.add_argument(
+        "-c",
+        "--columns",
+        required=True,
+        help="Comma-separated names of the columns to convert.",
+    )
+    parser.add_argument(
+        "--chunk-rows",
+        type=int,
+        default=65536,
+        help="Rows read and written at a time.",
+    )
+    parser.add_argument("--delimiter", default=",", help="Field delimiter.")
+    parser.set_defaults(jobs=1)
+    args = parser.parse_args(argv)
+
+    from nepali_unicoder.tabular import convert_csv
+
+    if args.src == "-":
+        src = sys.stdin
+    else:
+        src = open(args.src, "r", encoding="utf-8", newline="")
+    if args.dst is None:
+        dst = sys.stdout
+    else:
+        dst = open(args.dst, "w", encoding="utf-8", newline="")
+    try:
+        result = convert_csv(
+            src,
+            dst,
+            [name.strip() for name in args.columns.split(",")],
+            mode=_mode(args),
+            workers=args.jobs,
+            chunk_rows=args.chunk_rows,
+            prescan=args.prescan,
+            delimiter=args.delimiter,
+        )
+    except ValueError as exc:
+        parser.error(str(exc))
+    finally:
+        if src is not sys.stdin:
+            src.close()
+        if dst is not sys.stdout:
+            dst.close()
+    print(
+        f"{result.rows} rows, {result.converted} of {result.values} values "
+        f"converted in {result.seconds:.2f}s ({result.rows_per_sec:,.0f} rows/s)",
+        file=sys.stderr,
+    )
+
+
+def _parse_fields(spec: str, default_mode: str) -> Dict[str, str]:
+    """Parse `name[:mode],...` into a mapping from field name to mode."""
+    from nepali_unicoder.engine import MODES
+
+    fields = {}
+    for item in spec.split(","):
+        name, _, mode = item.strip().partition(":")
+        mode = mode.strip() or default_mode
+        if not name:
+            raise ValueError(f"empty field name in {spec!r}")
+        if mode not in MODES:
+            raise ValueError(f"unknown mode {mode!r} for field {name!r}")
+        fields[name] = mode
+    return fields
+
+
+def convert_jsonl_main(argv: List[str]) -> None:
+    import argparse
+
+    from nepali_unicoder.engine import MODES
+
+    parser = argparse.ArgumentParser(
+        prog="python -m nepali_unicoder convert-jsonl",
+        description="Convert fields of JSON Lines (NDJSON) records, keeping "
+        "their order and converting each distinct value once.",
+        parents=[
+            _conversion_options(
+                "Number of worker processes converting distinct values (default: 1)."
+            )
+        ],
+    )
+    parser.add_argument(
+        "src", nargs="?", default="-", help="JSON Lines file, or - for stdin."
+    )
+    parser.add_argument(
+        "dst", nargs="?", help="File for the converted records (default: stdout)."
+    )
+    parser.add_argument(
+        "-f",
+        "--fields",
+        required=True,
+        help="Comma-separated top-level fields to convert, each optionally "
+        "followed by :MODE (" + ", ".join(MODES) + "), e.g. name,legacy:preeti. "
+        "Fields without a :MODE use the mode chosen by --preeti and --reverse.",
+    )
+    parser.add_argument(
+        "--chunk-rows",
+        type=int,
+        default=8192,
+        help="Lines read and written at a time.",
+    )
+    parser.add_argument(
+        "--quiet", action="store_true", help="Do not report throughput on stderr."
+    )
+    parser.set_defaults(jobs=1)
+    args = parser.parse_args(argv)
+    try:
+        fields = _parse_fields(args.fields, _mode(args))
+    except ValueError as exc:
+        parser.error(str(exc))
+
+    from nepali_unicoder.tabular import convert_jsonl
+
+    # Large buffers: records are read and written a chunk at a time
+    buffering = 1 << 20
+    if args.src == "-":
+        src = sys.stdin
+    else:
+        src = open(args.src, "r", encoding="utf-8", buffering=buffering)
+    if args.dst is None:
+        dst = sys.stdout
+    else:
+        dst = open(args.dst, "w", encoding="utf-8", buffering=buffering)
+    try:
+        result = convert_jsonl(
+            src,
+            dst,
+            fields,
+            workers=args.jobs,
+            chunk_rows=args.chunk_rows,
+            prescan=args.prescan,
+        )
+    except ValueError as exc:
+        parser.error(str(exc))
+    finally:
+        if src is not sys.stdin:
+            src.close()
+        if dst is not sys.stdout:
+            dst.close()
+    if not args.quiet:
+        print(
+            f"{result.rows} records, {result.converted} of {result.values} values "
+            f"converted in {result.seconds:.2f}s ({result.rows_per_sec:,.0f} "
+            f"records/s)",
+            file=sys.stderr,
+        )
+
+
+def main(argv: Optional[List[str]] = None):
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv[:1] == ["serve"]:
+        serve_main(argv[1:])
+        return
+    if argv[:1] == ["convert-dir"]:
+        convert_dir_main(argv[1:])
+        return
+    if argv[:1] == ["convert-csv"]:
+        convert_csv_main(argv[1:])
+        return
+    if argv[:1] == ["convert-jsonl"]:
+        convert_jsonl_main(argv[1:])
+        return
+    if _fast_main(argv):
+        return
+
+    import argparse
+
+    from nepali_unicoder.convert import Converter
+
     parser = argparse.ArgumentParser(
         prog="python -m nepali_unicoder",
-        description="Convert Romanized Nepali or Preeti font text to Unicode Devanagari.",
+        description="Convert Romanized Nepali or Preeti font text to Unicode "
+        "Devanagari, or back with --reverse.",
+        parents=[
+            _conversion_options(
+                "Convert the input line by line on this many worker processes."
+            )
+        ],
     )
     parser.add_argument(
         "text",
         nargs="*",
-        help="The text to convert. If omitted, reads from stdin.",
+        help="The text to convert. If omitted, reads from --input or stdin.",
     )
     parser.add_argument(
-        "--preeti",
+        "-i",
+        "--input",
+        help="Read the text from this file instead of stdin.",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        help="Write the result to this file instead of stdout.",
+    )
+    parser.add_argument(
+        "--stream",
         action="store_true",
-        help="Enable Preeti to Unicode conversion mode.",
+        help="Convert the input incrementally with bounded memory. "
+        "The input is written through as-is (not stripped).",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print a breakdown of where conversion time went to stderr. "
+        "Runs in a single process.",
+    )
+    parser.add_argument(
+        "--detect",
+        action="store_true",
+        help="Detect whether the input is Preeti or romanized (from its "
+        "first 64 KB) instead of using --preeti.",
     )
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+    if args.profile and (args.reverse or args.prescan):
+        parser.error("--profile is not supported with --reverse or --prescan")
+    if args.detect and (args.reverse or args.preeti):
+        parser.error("--detect cannot be combined with --reverse or --preeti")
 
-    # Determine input text
+    # Determine input source
     if args.text:
-        input_text = " ".join(args.text)
+        source = None
+    elif args.input:
+        source = open(args.input, "r", encoding="utf-8")
     elif not sys.stdin.isatty():
-        input_text = sys.stdin.read().strip()
+        source = sys.stdin
     else:
         parser.print_help()
         return
 
-    mode = "preeti" if args.preeti else "roman"
-    converter = Converter(mode=mode)
-    result = converter.convert(input_text)
-    print(result)
+    mode = _mode(args)
+    # Lines already read to detect the mode, converted before the rest
+    head: List[str] = []
+    if args.detect:
+        from nepali_unicoder.prescan import detect_mode
+
+        if source is None:
+            mode = detect_mode(" ".join(args.text))
+        else:
+            head = source.readlines(1 << 16)
+            mode = detect_mode("".join(head))
+
+    # Profile an engine of its own: instrumenting the shared one would slow
+    # down and record every other user of it in this process
+    converter = Converter(mode=mode, prescan=args.prescan, shared=not args.profile)
+    if args.profile:
+        converter.engine.enable_profiling()
+
+    if args.output:
+        output = open(args.output, "w", encoding="utf-8")
+    else:
+        output = sys.stdout
+
+    try:
+        if args.jobs is not None and source is not None:
+            lines = (line.rstrip("\n") for line in itertools.chain(head, source))
+            workers = 1 if args.profile else args.jobs
+            for result in converter.convert_many(lines, workers=workers):
+                output.write(result + "\n")
+        elif args.stream and source is not None:
+            chunks = itertools.chain(head, iter(lambda: source.read(1 << 16), ""))
+            for piece in converter.convert_stream(chunks):
+                output.write(piece)
+        else:
+            if source is None:
+                input_text = " ".join(args.text)
+            else:
+                input_text = ("".join(head) + source.read()).strip()
+            print(converter.convert(input_text), file=output)
+    finally:
+        if args.profile:
+            stats = converter.engine.disable_profiling()
+            print(stats.report(), file=sys.stderr)
+        if source is not None and source is not sys.stdin:
+            source.close()
+        if output is not sys.stdout:
+            output.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,301 @@
+"""
+Per-stage benchmarks of the conversion pipeline.
+
+    python -m nepali_unicoder.bench [--kb 256] [--repeat 5] [--json out.json]
+    python -m nepali_unicoder.bench --compare base.json new.json
+
+Every stage (loading rules, tokenizing, trie lookups, mapping, post-rules
+and the full `transliterate`) is timed on synthetic and realistic corpora
+for both modes. The reverse modes are timed on the same corpora converted
+to Unicode. Each timing is the best of `--repeat` runs; peak memory is
+measured with `tracemalloc` in a separate run so it does not distort the
+timings. Corpora are generated from a fixed seed, so results written with
+`--json` can be compared between commits with `--compare`.
+"""
+
+import argparse
+import functools
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+
+from nepali_unicoder.engine import REVERSE_MODES, Engine
+from nepali_unicoder.loader import PreetiLoader, RuleLoader
+from nepali_unicoder.reverse import ReverseEngine, _build_reverse_artifact
+from nepali_unicoder.tokenizer import Tokenizer
+
+ROMAN_WORDS = (
+    "mero naam sanjeev ho nepaal ko raajdhaani kaathamaadau ho hami "
+    "sabai nepaali hau aaja ko samaachaar bhaanchhaa ki sarakaar le "
+    "naya niti lyaaeko chha gyaana vigyaan shikshaa swaasthya"
+).split()
+PREETI_WORDS = (
+    "d]/f gfd ;~hLj xf] g]kfn sf] /fhwfgL sfF7df8f}+ xf] xfdL ;a} "
+    "g]kfnL xf}F cfh sf] ;dfrf/ eG5 ls ;/sf/ n] gof gLlt NofPsf] 5"
+).split()
+# Realistic text also has numbers, punctuation and (in roman mode) blocks
+ROMAN_EXTRAS = ["12", "2081", "3.5", "{Python}", "{API}", "|", "...", ","]
+PREETI_EXTRAS = ["!@", "#$", "M", "...", "s{", "qm", "l;", "–"]
+
+MODES = ("roman", "preeti")
+
+
+def make_corpus(words: List[str], size_mb: float, seed: int = 0) -> str:
+    """Join randomly chosen `words` with spaces up to about `size_mb` MB."""
+    rng = random.Random(seed)
+    target = int(size_mb * 1024 * 1024)
+    parts = []
+    total = 0
+    while total < target:
+        word = rng.choice(words)
+        parts.append(word)
+        total += len(word) + 1
+    return " ".join(parts)
+
+
+def make_synthetic(alphabet: str, size_mb: float, seed: int = 0) -> str:
+    """Random "words" over the characters that occur in rule keys."""
+    rng = random.Random(seed)
+    target = int(size_mb * 1024 * 1024)
+    parts = []
+    total = 0
+    while total < target:
+        word = "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 8)))
+        parts.append(word)
+        total += len(word) + 1
+    return " ".join(parts)
+
+
+def corpora(mode: str, size_mb: float) -> Dict[str, str]:
+    if mode in REVERSE_MODES:
+        # The forward corpora, converted to Unicode
+        forward_mode = mode[len("unicode-") :]
+        forward = Engine.shared(mode=forward_mode)
+        return {
+            name: forward.transliterate(text)
+            for name, text in corpora(forward_mode, size_mb).items()
+        }
+    engine = Engine.shared(mode=mode)
+    keys = set().union(*engine._rules_matcher.transitions) - set(" \t\n{}")
+    if mode == "preeti":
+        words = PREETI_WORDS * 4 + PREETI_EXTRAS
+    else:
+        words = ROMAN_WORDS * 4 + ROMAN_EXTRAS
+    return {
+        "realistic": make_corpus(words, size_mb),
+        "synthetic": make_synthetic("".join(sorted(keys)), size_mb),
+    }
+
+
+def longest_match_loop(trie, text: str) -> None:
+    idx = 0
+    n = len(text)
+    while idx < n:
+        _, match_len = trie.longest_match(text, idx)
+        idx += match_len or 1
+
+
+def _best_of(func: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _peak_memory(func: Callable[[], object]) -> int:
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _new_engine(mode: str) -> Engine:
+    if mode in REVERSE_MODES:
+        return ReverseEngine(mode=mode)
+    return Engine(mode=mode)
+
+
+def _cold_engine(mode: str) -> Engine:
+    """A new engine built without the rule cache."""
+    saved = os.environ.get("NEPALI_UNICODER_NO_CACHE")
+    os.environ["NEPALI_UNICODER_NO_CACHE"] = "1"
+    try:
+        return _new_engine(mode)
+    finally:
+        if saved is None:
+            del os.environ["NEPALI_UNICODER_NO_CACHE"]
+        else:
+            os.environ["NEPALI_UNICODER_NO_CACHE"] = saved
+
+
+def stages(mode: str, text: str) -> Dict[str, Callable[[], object]]:
+    """The pipeline stages for `mode` as zero-argument callables over `text`."""
+    engine = Engine.shared(mode=mode)
+    if mode in REVERSE_MODES:
+        return {
+            "matcher_scan": lambda: engine.matcher.scan(text),
+            "transliterate": lambda: engine.transliterate(text),
+        }
+    trie = engine.trie
+    tokenizer = Tokenizer()
+    use_blocks = mode != "preeti"
+    mapped = engine._map(text)
+    result = {
+        "tokenize": lambda: tokenizer.tokenize(text, use_blocks),
+        "trie_longest_match": lambda: longest_match_loop(trie, text),
+        "matcher_scan": lambda: engine.matcher.scan(text),
+        "map": lambda: engine._map(text),
+        "transliterate": lambda: engine.transliterate(text),
+    }
+    if mode == "preeti":
+        result["post_rules"] = lambda: engine._apply_post_rules(mapped)
+    return result
+
+
+def run(
+    size_mb: float = 0.25,
+    repeat: int = 5,
+    modes=MODES + REVERSE_MODES,
+    only: Optional[List[str]] = None,
+) -> dict:
+    """Run the benchmarks and return the results as a JSON-ready dict."""
+    results = {}
+
+    def record(name, func, chars):
+        if only and not any(part in name for part in only):
+            return
+        seconds = _best_of(func, repeat)
+        results[name] = {
+            "seconds": seconds,
+            "chars_per_sec": chars / seconds if chars and seconds else None,
+            "peak_bytes": _peak_memory(func),
+        }
+
+    for mode in modes:
+        if mode in REVERSE_MODES:
+            load = functools.partial(_build_reverse_artifact, mode)
+        else:
+            load = (PreetiLoader() if mode == "preeti" else RuleLoader()).load
+        record(f"{mode}/startup/load_rules", load, 0)
+        record(f"{mode}/startup/engine_cold", lambda: _cold_engine(mode), 0)
+        record(f"{mode}/startup/engine_cached", lambda: _new_engine(mode), 0)
+
+        for corpus_name, text in corpora(mode, size_mb).items():
+            for stage, func in stages(mode, text).items():
+                record(f"{mode}/{corpus_name}/{stage}", func, len(text))
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "size_mb": size_mb,
+            "repeat": repeat,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+
+def compare(base: dict, new: dict, threshold: float = 0.10) -> List[str]:
+    """
+    Print the per-stage change in time from `base` to `new` and return the
+    names of stages that got slower by more than `threshold`.
+    """
+    regressions = []
+    print(f"{'stage':48} {'base':>10} {'new':>10} {'change':>8}")
+    for name, new_result in new["results"].items():
+        base_result = base["results"].get(name)
+        if base_result is None:
+            continue
+        old_s, new_s = base_result["seconds"], new_result["seconds"]
+        change = new_s / old_s - 1 if old_s else 0.0
+        flag = ""
+        if change > threshold:
+            regressions.append(name)
+            flag = "  SLOWER"
+        print(
+            f"{name:48} {old_s * 1000:8.2f}ms {new_s * 1000:8.2f}ms "
+            f"{change:+7.1%}{flag}"
+        )
+    return regressions
+
+
+def print_results(report: dict) -> None:
+    print(f"{'stage':48} {'time':>10} {'chars/sec':>12} {'peak':>10}")
+    for name, result in report["results"].items():
+        rate = result["chars_per_sec"]
+        rate_text = f"{rate:12,.0f}" if rate else f"{'-':>12}"
+        print(
+            f"{name:48} {result['seconds'] * 1000:8.2f}ms {rate_text} "
+            f"{result['peak_bytes'] / 1024:8.0f}KB"
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m nepali_unicoder.bench",
+        description="Benchmark each stage of the conversion pipeline.",
+    )
+    parser.add_argument(
+        "--kb", type=int, default=256, help="Size of each corpus in KB."
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per timing.")
+    parser.add_argument(
+        "--mode", choices=MODES + REVERSE_MODES, help="Only benchmark this mode."
+    )
+    parser.add_argument(
+        "--only",
+        action="append",
+        help="Only run stages whose name contains this text (repeatable).",
+    )
+    parser.add_argument("--json", help="Write the results to this JSON file.")
+    parser.add_argument(
+        "--compare",
+        nargs=2,
+        metavar=("BASE", "NEW"),
+        help="Compare two JSON result files instead of running.",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="Slowdown ratio reported as a regression by --compare.",
+    )
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        with open(args.compare[0], encoding="utf-8") as f:
+            base = json.load(f)
+        with open(args.compare[1], encoding="utf-8") as f:
+            new = json.load(f)
+        regressions = compare(base, new, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} stage(s) slower than {args.threshold:.0%}")
+            return 1
+        return 0
+
+    report = run(
+        size_mb=args.kb / 1024,
+        repeat=args.repeat,
+        modes=(args.mode,) if args.mode else MODES + REVERSE_MODES,
+        only=args.only,
+    )
+    print_results(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
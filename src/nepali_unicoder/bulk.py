@@ -0,0 +1,258 @@
+"""
+Bulk conversion of directory trees of text files.
+
+Each input file is memory-mapped and decoded incrementally in windows of
+`piece_size` bytes. `Engine.split_stream` cuts the decoded text at safe
+split points into pieces that convert independently. The pieces are
+converted on a process pool, with a bounded number in flight, and written
+in order to the output through a large write buffer. Memory use is
+therefore bounded by a few pieces per worker, not by the size of a file,
+as long as the text has split points (whitespace in roman mode; a line
+break or two whitespace characters in a row in Preeti mode). A file with
+none is converted as one piece and listed in `BulkResult.unsplit`.
+
+Outputs are written to a `.partial` name and renamed when complete. A
+journal in the destination directory records every finished file, so an
+interrupted run picks up where it stopped when rerun with `resume=True`.
+"""
+
+import codecs
+import fnmatch
+import json
+import mmap
+import multiprocessing
+import os
+import time
+from collections import deque
+from typing import Iterator, List, Optional, Tuple
+
+from nepali_unicoder.engine import Engine
+from nepali_unicoder.parallel import _convert_in_worker, _init_worker
+
+# One JSON object per finished file, appended as files complete
+JOURNAL_NAME = ".nepali_unicoder-done.jsonl"
+
+
+class BulkResult:
+    """Totals of a `convert_dir` run."""
+
+    def __init__(
+        self,
+        files: int,
+        skipped: int,
+        bytes_read: int,
+        seconds: float,
+        unsplit: Optional[List[str]] = None,
+    ):
+        self.files = files
+        self.skipped = skipped
+        self.bytes_read = bytes_read
+        self.seconds = seconds
+        # Files larger than one piece that had no safe split point
+        self.unsplit = unsplit if unsplit is not None else []
+
+    @property
+    def mb_per_sec(self) -> float:
+        if not self.seconds:
+            return 0.0
+        return self.bytes_read / (1024 * 1024) / self.seconds
+
+    def __repr__(self) -> str:
+        return (
+            f"BulkResult(files={self.files}, skipped={self.skipped}, "
+            f"bytes_read={self.bytes_read}, seconds={self.seconds:.3f})"
+        )
+
+
+def find_files(src: str, pattern: str = "*.txt") -> List[str]:
+    """Paths of files under `src` matching `pattern`, relative to `src`."""
+    found = []
+    for root, dirs, files in os.walk(src):
+        dirs.sort()
+        for name in sorted(files):
+            if fnmatch.fnmatch(name, pattern) and name != JOURNAL_NAME:
+                found.append(os.path.relpath(os.path.join(root, name), src))
+    return found
+
+
+def iter_mapped_text(path: str, piece_size: int = 1 << 20) -> Iterator[str]:
+    """Decode a UTF-8 file through a memory map, `piece_size` bytes at a time."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            # An incremental decoder keeps multi-byte characters split across
+            # windows intact
+            decoder = codecs.getincrementaldecoder("utf-8")()
+            for start in range(0, len(mapped), piece_size):
+                text = decoder.decode(mapped[start : start + piece_size])
+                if text:
+                    yield text
+            text = decoder.decode(b"", final=True)
+            if text:
+                yield text
+
+
+def _load_journal(path: str) -> dict:
+    """Map each finished relative path to the source signature it had."""
+    done = {}
+    try:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # A line cut short by an interruption
+                    continue
+                done[entry.pop("path")] = entry
+    except OSError:
+        pass
+    return done
+
+
+def _signature(path: str, mode: str, prescan: bool = False) -> dict:
+    stat = os.stat(path)
+    signature = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "mode": mode}
+    if prescan:
+        # Only recorded when set, so journals of earlier runs still match
+        signature["prescan"] = True
+    return signature
+
+
+def convert_dir(
+    src: str,
+    dst: str,
+    mode: str = "roman",
+    backend: str = "trie",
+    workers: Optional[int] = None,
+    pattern: str = "*.txt",
+    piece_size: int = 1 << 20,
+    resume: bool = True,
+    progress=None,
+    prescan: bool = False,
+) -> BulkResult:
+    """
+    Convert every file under `src` matching `pattern` into the same
+    relative path under `dst`.
+
+    - `workers`: processes used for conversion (default: number of CPUs);
+      with 1 the pieces are converted in this process.
+    - `piece_size`: bytes decoded per window, which is also about the size
+      of the pieces sent to workers.
+    - `resume`: skip files that the journal records as converted from an
+      unchanged source. Set to False to convert everything again.
+    - `progress`: optional callable, called as `progress(relpath, skipped)`
+      after each file.
+    - `prescan`: copy Devanagari and other text that no rule converts
+      through untouched (see `Engine`).
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+
+    engine = Engine.shared(mode=mode, backend=backend, prescan=prescan)
+    os.makedirs(dst, exist_ok=True)
+    journal_path = os.path.join(dst, JOURNAL_NAME)
+    done = _load_journal(journal_path) if resume else {}
+    files = find_files(src, pattern)
+
+    pool = None
+    if workers > 1 and files:
+        pool = multiprocessing.Pool(
+            workers, initializer=_init_worker, initargs=(mode, backend, 0, prescan)
+        )
+
+    converted = skipped = bytes_read = 0
+    unsplit = []
+    start = time.perf_counter()
+    journal = open(journal_path, "a" if resume else "w", encoding="utf-8")
+    try:
+        for relpath in files:
+            source = os.path.join(src, relpath)
+            target = os.path.join(dst, relpath)
+            signature = _signature(source, mode, prescan)
+            if resume and done.get(relpath) == signature and os.path.exists(target):
+                skipped += 1
+                if progress is not None:
+                    progress(relpath, True)
+                continue
+
+            size, pieces = _convert_file(
+                engine, pool, source, target, piece_size, 2 * workers
+            )
+            bytes_read += size
+            converted += 1
+            if pieces == 1 and size > piece_size:
+                unsplit.append(relpath)
+            journal.write(json.dumps(dict(signature, path=relpath)) + "\n")
+            journal.flush()
+            if progress is not None:
+                progress(relpath, False)
+    finally:
+        journal.close()
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+
+    return BulkResult(
+        converted, skipped, bytes_read, time.perf_counter() - start, unsplit
+    )
+
+
+def _convert_file(
+    engine: Engine,
+    pool,
+    source: str,
+    target: str,
+    piece_size: int,
+    window: int,
+) -> Tuple[int, int]:
+    """
+    Convert one file, writing it under a temporary name first. Returns its
+    size in bytes and the number of pieces it was split into.
+    """
+    os.makedirs(os.path.dirname(target) or ".", exist_ok=True)
+    tmp = target + ".partial"
+    count = 0
+    try:
+        # newline="" keeps the input's line endings
+        with open(tmp, "w", encoding="utf-8", newline="", buffering=1 << 20) as out:
+            pieces = engine._split_stream(iter_mapped_text(source, piece_size))
+            for converted in _convert_pieces(engine, pool, pieces, window):
+                out.write(converted)
+                count += 1
+        os.replace(tmp, target)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    return os.path.getsize(source), count
+
+
+def _convert_pieces(engine, pool, pieces, window: int) -> Iterator[str]:
+    """
+    Convert (piece, output) pairs from `Engine._split_stream` in order,
+    with at most `window` of them in flight. Pieces whose output came with
+    them are not converted again.
+    """
+    if pool is None:
+        for piece, output in pieces:
+            yield engine.transliterate(piece) if output is None else output
+        return
+
+    pending = deque()
+    for piece, output in pieces:
+        if output is None:
+            output = pool.apply_async(_convert_in_worker, (piece,))
+        pending.append(output)
+        if len(pending) >= window:
+            yield _result(pending.popleft())
+    while pending:
+        yield _result(pending.popleft())
+
+
+def _result(pending) -> str:
+    return pending if isinstance(pending, str) else pending.get()
@@ -0,0 +1,140 @@
+"""
+On-disk cache for built rule tables.
+
+Building an Engine parses the JSON rule files, expands the consonant x matra
+cross product into a Trie and compiles it. The result only depends on the
+contents of those files and on the code that builds it, so it is pickled
+to a cache file keyed by a hash of the sources, the package version and
+the source of the modules in `BUILD_MODULES`, and loaded directly on the
+next start.
+
+The cache lives in `$NEPALI_UNICODER_CACHE_DIR`, or `nepali_unicoder` under
+`$XDG_CACHE_HOME` (default `~/.cache`). Set `NEPALI_UNICODER_NO_CACHE=1`
+to disable it. A missing, stale or unreadable cache file is rebuilt. If
+the cache directory cannot be written, a RuntimeWarning is issued and the
+tables are only kept in memory.
+"""
+
+import functools
+import hashlib
+import os
+import pickle
+import warnings
+from typing import Any, Callable, Iterable, Optional
+
+from nepali_unicoder import __version__
+
+# Bump when the layout of cached artifacts changes
+CACHE_VERSION = 3
+
+# Modules whose code builds the cached artifacts. Their source is part of
+# the cache key, so changing any of them rebuilds the cache.
+BUILD_MODULES = ("cache", "engine", "loader", "postrules", "reverse", "trie")
+
+# Errors from reading a missing, truncated or incompatible cache file
+_READ_ERRORS = (
+    OSError,
+    EOFError,
+    AttributeError,
+    ImportError,
+    IndexError,
+    TypeError,
+    ValueError,
+    pickle.UnpicklingError,
+)
+
+
+def cache_dir() -> Optional[str]:
+    """Return the cache directory, or None if caching is disabled."""
+    if os.environ.get("NEPALI_UNICODER_NO_CACHE"):
+        return None
+    path = os.environ.get("NEPALI_UNICODER_CACHE_DIR")
+    if path:
+        return path
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(base, "nepali_unicoder")
+
+
+@functools.lru_cache(maxsize=None)
+def code_hash() -> str:
+    """Hash the package version and the source of `BUILD_MODULES`."""
+    directory = os.path.dirname(os.path.abspath(__file__))
+    digest = hashlib.sha256(f"{CACHE_VERSION}:{__version__}".encode())
+    _update(digest, (os.path.join(directory, f"{name}.py") for name in BUILD_MODULES))
+    return digest.hexdigest()
+
+
+def source_hash(sources: Iterable[str]) -> str:
+    """Hash the code that builds the artifact and the source files."""
+    digest = hashlib.sha256(code_hash().encode())
+    _update(digest, sources)
+    return digest.hexdigest()[:16]
+
+
+def _update(digest, paths: Iterable[str]) -> None:
+    for path in paths:
+        digest.update(os.path.basename(path).encode())
+        try:
+            with open(path, "rb") as f:
+                digest.update(f.read())
+        except OSError:
+            digest.update(b"<missing>")
+
+
+def load_cached(name: str, sources: Iterable[str], build: Callable[[], Any]) -> Any:
+    """
+    Return the artifact `name` built from `sources`, loading it from the
+    cache when the sources are unchanged and calling `build()` otherwise.
+    """
+    directory = cache_dir()
+    if directory is None:
+        return build()
+
+    key = source_hash(sources)
+    path = os.path.join(directory, f"{name}-v{CACHE_VERSION}-{key}.pickle")
+    try:
+        with open(path, "rb") as f:
+            cached = pickle.load(f)
+        if cached.get("version") == CACHE_VERSION and cached.get("key") == key:
+            return cached["artifact"]
+    except _READ_ERRORS:
+        # Missing, stale or corrupt cache file: rebuild below
+        pass
+
+    artifact = build()
+    _write(
+        directory, path, {"version": CACHE_VERSION, "key": key, "artifact": artifact}
+    )
+    return artifact
+
+
+def _write(directory: str, path: str, payload: dict) -> None:
+    import tempfile
+
+    try:
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    except OSError as exc:
+        _warn_unwritable(exc)
+        return
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+        # Atomic, so concurrent processes never see a partial file
+        os.replace(tmp_path, path)
+    except BaseException as exc:
+        os.unlink(tmp_path)
+        if not isinstance(exc, OSError):
+            raise
+        _warn_unwritable(exc)
+
+
+def _warn_unwritable(exc: OSError) -> None:
+    warnings.warn(
+        f"Cannot write the nepali_unicoder cache ({exc}); set "
+        "NEPALI_UNICODER_CACHE_DIR to a writable directory or "
+        "NEPALI_UNICODER_NO_CACHE=1",
+        RuntimeWarning,
+    )
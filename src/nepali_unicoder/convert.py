@@ -1,13 +1,137 @@
-from nepali_unicoder.engine import Engine
+from __future__ import annotations
+
+import itertools
+
+# The package imports this module, so the engine is only imported on use.
+# So is typing, which would be most of what is left of the import time;
+# annotations are not evaluated (see the __future__ import above).
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Iterable, Iterator, Optional, TextIO
+
+    from nepali_unicoder.engine import Engine
+
+
+def convert(text: str, mode: str = "roman", prescan: bool = False) -> str:
+    """Convert `text` with the shared Engine for `mode`."""
+    from nepali_unicoder.engine import Engine
+
+    return Engine.shared(mode=mode, prescan=prescan).transliterate(text)
 
 
 class Converter:
     """
     Wrapper around Engine for backward compatibility.
+
+    Converters with the same settings share one Engine, so creating them
+    repeatedly does not rebuild any rule tables. With `shared=False` the
+    converter builds an Engine of its own instead, which can be profiled
+    or given dictionary layers without affecting other converters. The
+    Engine is only looked up (and its rules loaded) on first use.
     """
 
-    def __init__(self, mode: str = "roman"):
-        self.engine = Engine(mode=mode)
+    def __init__(
+        self,
+        mode: str = "roman",
+        backend: str = "trie",
+        word_cache_size: int = 0,
+        prescan: bool = False,
+        shared: bool = True,
+    ):
+        from nepali_unicoder.engine import check_options
+
+        self.mode = mode
+        self.backend = backend
+        self.word_cache_size = word_cache_size
+        self.prescan = prescan
+        self.shared = shared
+        check_options(mode, backend, word_cache_size, prescan)
+        self._engine: Optional[Engine] = None
+
+    @property
+    def engine(self) -> Engine:
+        engine = self._engine
+        if engine is None:
+            from nepali_unicoder.engine import Engine
+
+            factory = Engine.shared if self.shared else Engine.private
+            engine = self._engine = factory(
+                mode=self.mode,
+                backend=self.backend,
+                word_cache_size=self.word_cache_size,
+                prescan=self.prescan,
+            )
+        return engine
 
     def convert(self, text: str) -> str:
         return self.engine.transliterate(text)
+
+    def convert_stream(self, chunks: Iterable[str]) -> Iterator[str]:
+        return self.engine.transliterate_stream(chunks)
+
+    def convert_file(self, src: TextIO, dst: TextIO) -> None:
+        self.engine.transliterate_file(src, dst)
+
+    def convert_many(
+        self,
+        texts: Iterable[str],
+        workers: Optional[int] = None,
+        chunksize: int = 256,
+        threads: Optional[int] = None,
+    ) -> Iterator[str]:
+        """
+        Convert many independent texts on `workers` processes, yielding the
+        results in input order. See `parallel.convert_parallel`.
+
+        With `threads`, batches of `chunksize` texts are converted on that
+        many threads sharing this converter's Engine instead. Threads only
+        convert in parallel on a free-threaded (no-GIL) Python build.
+        """
+        if threads is not None:
+            if workers is not None:
+                raise ValueError("Pass either workers or threads, not both")
+            if threads < 1:
+                raise ValueError("threads must be at least 1")
+            return self._convert_threaded(texts, chunksize, threads)
+        if workers == 1:
+            return self._convert_batches(texts, chunksize)
+        # Imported here: multiprocessing is slow to import
+        from nepali_unicoder.parallel import convert_parallel
+
+        return convert_parallel(
+            texts,
+            mode=self.mode,
+            backend=self.backend,
+            workers=workers,
+            chunksize=chunksize,
+            word_cache_size=self.word_cache_size,
+            prescan=self.prescan,
+        )
+
+    def _convert_batches(self, texts: Iterable[str], size: int) -> Iterator[str]:
+        texts = iter(texts)
+        while True:
+            batch = list(itertools.islice(texts, size))
+            if not batch:
+                return
+            yield from self.engine.transliterate_many(batch, batch_size=size)
+
+    def _convert_threaded(
+        self, texts: Iterable[str], size: int, threads: int
+    ) -> Iterator[str]:
+        from collections import deque
+        from concurrent.futures import ThreadPoolExecutor
+
+        convert_batch = self.engine.transliterate_many
+        texts = iter(texts)
+        batches = iter(lambda: list(itertools.islice(texts, size)), [])
+        with ThreadPoolExecutor(threads) as executor:
+            # At most two batches per thread in flight, so `texts` is read
+            # lazily and results are yielded in order
+            pending = deque()
+            for batch in batches:
+                pending.append(executor.submit(convert_batch, batch, size))
+                if len(pending) >= 2 * threads:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
@@ -0,0 +1,286 @@
+"""
+Custom dictionaries layered over an Engine's rules at runtime.
+
+An Engine's `dictionaries` holds named layers of `key -> value` entries,
+each read from a JSON file (an object, like `word_maps.json`) or given as a
+dict. Later layers override earlier ones for the same key. Whenever a layer
+is added, removed or reloaded the entries are merged into a new `WordList`,
+and the Engine swaps a `LayeredMatcher` over its rules in with a single
+assignment. Conversions running at that moment finish with the matcher
+they started with, and the rules themselves are never rebuilt.
+
+A `WordList` keeps the keys in a sorted list with a parallel list of
+values, about two pointers per entry, instead of a node per character
+like `Trie`, so hundreds of thousands of entries take tens of megabytes
+rather than the hundreds a Trie of them would.
+"""
+
+import bisect
+import os
+import threading
+from typing import Dict, List, Optional, Tuple, Union
+
+# A layer is read from this path, or is this mapping
+DictionarySource = Union[str, "os.PathLike[str]", Dict[str, str]]
+
+
+class WordList:
+    """
+    Read-only longest-match lookup over sorted keys.
+
+    `longest_match` bisects for the greatest key not after the text that
+    follows the position. If that key is not a prefix of the text, no key
+    longer than their common prefix can be, so the search is repeated with
+    the text cut to that common prefix.
+    """
+
+    __slots__ = ("keys", "values", "max_key_len", "heads")
+
+    def __init__(self, entries: Dict[str, str]):
+        self.keys: List[str] = sorted(entries)
+        self.values: List[str] = [entries[key] for key in self.keys]
+        self.max_key_len = max(map(len, self.keys), default=0)
+        # The first three characters of every key (all of shorter ones):
+        # text that starts with none of these cannot match
+        self.heads = frozenset(key[:3] for key in self.keys)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def longest_match(
+        self, text: str, start_index: int = 0
+    ) -> Tuple[Optional[str], int]:
+        """Same contract as Trie.longest_match."""
+        keys = self.keys
+        query = text[start_index : start_index + self.max_key_len]
+        while query:
+            idx = bisect.bisect_right(keys, query) - 1
+            if idx < 0:
+                break
+            key = keys[idx]
+            if query.startswith(key):
+                return self.values[idx], len(key)
+            common = 0
+            limit = min(len(key), len(query))
+            while common < limit and key[common] == query[common]:
+                common += 1
+            query = query[:common]
+        return None, 0
+
+
+class LayeredMatcher:
+    """
+    A rule matcher with a `WordList` laid over it.
+
+    At each position the longer of the two matches wins, and the overlay
+    wins when they are equally long, which is what adding the entries to
+    the rule Trie would do.
+    """
+
+    __slots__ = ("base", "overlay", "max_key_len")
+
+    def __init__(self, base, overlay: WordList):
+        self.base = base
+        self.overlay = overlay
+        self.max_key_len = max(base.max_key_len, overlay.max_key_len)
+
+    def longest_match(
+        self, text: str, start_index: int = 0
+    ) -> Tuple[Optional[str], int]:
+        """Same contract as Trie.longest_match."""
+        value, length = self.overlay.longest_match(text, start_index)
+        base_value, base_length = self.base.longest_match(text, start_index)
+        if base_length > length:
+            return base_value, base_length
+        return value, length
+
+    def scan(self, text: str) -> List[str]:
+        """Same contract as CompiledTrie.scan."""
+        transitions = getattr(self.base, "transitions", None)
+        if transitions is None:
+            return self._scan_generic(text)
+
+        # CompiledTrie.scan and WordList.longest_match, inlined. The rules
+        # are matched first: the overlay only has to be searched for keys at
+        # least as long, which ends most searches after one bisection.
+        values = self.base.values
+        root = transitions[0]
+        keys = self.overlay.keys
+        overlay_values = self.overlay.values
+        heads = self.overlay.heads
+        max_key_len = self.overlay.max_key_len
+        bisect_right = bisect.bisect_right
+        result: List[str] = []
+        append = result.append
+        i = 0
+        n = len(text)
+
+        while i < n:
+            value = None
+            length = 0
+            state = root.get(text[i])
+            if state is not None:
+                j = i + 1
+                if values[state] is not None:
+                    value = values[state]
+                    length = 1
+                table = transitions[state]
+                while table and j < n:
+                    state = table.get(text[j])
+                    if state is None:
+                        break
+                    j += 1
+                    if values[state] is not None:
+                        value = values[state]
+                        length = j - i
+                    table = transitions[state]
+
+            query = text[i : i + max_key_len]
+            if (
+                query[:3] not in heads
+                and query[:2] not in heads
+                and query[:1] not in heads
+            ):
+                query = ""
+            shortest = length or 1
+            while len(query) >= shortest:
+                idx = bisect_right(keys, query) - 1
+                if idx < 0:
+                    break
+                key = keys[idx]
+                if query.startswith(key):
+                    if len(key) >= shortest:
+                        value = overlay_values[idx]
+                        length = len(key)
+                    break
+                common = 0
+                while common < len(key) and key[common] == query[common]:
+                    common += 1
+                query = query[:common]
+
+            if value:
+                append(value)
+                i += length
+            else:
+                append(text[i])
+                i += 1
+
+        return result
+
+    def _scan_generic(self, text: str) -> List[str]:
+        overlay = self.overlay.longest_match
+        base = self.base.longest_match
+        result: List[str] = []
+        append = result.append
+        i = 0
+        n = len(text)
+
+        while i < n:
+            value, length = overlay(text, i)
+            base_value, base_length = base(text, i)
+            if base_length > length:
+                value, length = base_value, base_length
+            if value:
+                append(value)
+                i += length
+            else:
+                append(text[i])
+                i += 1
+
+        return result
+
+
+def load_dictionary(path: DictionarySource) -> Dict[str, str]:
+    """Read a dictionary layer from a JSON object of `key: value` pairs."""
+    import json
+
+    with open(path, encoding="utf-8") as f:
+        entries = json.load(f)
+    if not isinstance(entries, dict):
+        raise ValueError(f"{os.fspath(path)}: expected a JSON object")
+    return entries
+
+
+class DictionaryLayers:
+    """
+    The named dictionary layers of one Engine, in order.
+
+    Keys may only use characters that occur in the Engine's rule keys and
+    may not contain whitespace: both keep the word cache and the safe
+    split points of streaming valid. Keys only match within the text the
+    rules convert, so never across numbers, `{...}` blocks or whitespace.
+
+    Layers belong to the Engine, so layers added to a shared one (from
+    `Engine.shared`, which `Converter` and `nepali_unicoder.convert` use)
+    change conversions everywhere in the process. Build a separate
+    `Engine` to keep them local.
+    """
+
+    def __init__(self, engine):
+        self._engine = engine
+        # name -> (source, entries); dicts keep the layer order
+        self._layers: Dict[str, Tuple[DictionarySource, Dict[str, str]]] = {}
+        # Serializes changes; conversions never wait for it
+        self._lock = threading.Lock()
+
+    def names(self) -> List[str]:
+        """The layer names, lowest priority first."""
+        return list(self._layers)
+
+    def __len__(self) -> int:
+        return len(self._layers)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._layers
+
+    def add(self, name: str, source: DictionarySource) -> None:
+        """
+        Add a layer on top of the others, from a JSON file path or a dict.
+        A layer that already has this name is replaced in place.
+        """
+        entries = self._read(source)
+        with self._lock:
+            layers = dict(self._layers)
+            layers[name] = (source, entries)
+            self._swap(layers)
+
+    def remove(self, name: str) -> None:
+        """Remove a layer. Raises KeyError if there is none named `name`."""
+        with self._lock:
+            layers = dict(self._layers)
+            del layers[name]
+            self._swap(layers)
+
+    def reload(self, name: Optional[str] = None) -> None:
+        """
+        Read the file of layer `name` again, or of every layer read from a
+        file. Layers given as dicts are kept as they are.
+        """
+        with self._lock:
+            layers = dict(self._layers)
+            names = list(layers) if name is None else [name]
+            for layer in names:
+                source, _ = layers[layer]
+                if not isinstance(source, dict):
+                    layers[layer] = (source, self._read(source))
+            self._swap(layers)
+
+    def clear(self) -> None:
+        """Remove every layer."""
+        with self._lock:
+            self._swap({})
+
+    def _read(self, source: DictionarySource) -> Dict[str, str]:
+        if isinstance(source, dict):
+            entries = dict(source)
+        else:
+            entries = load_dictionary(source)
+        self._engine._check_dictionary(entries)
+        return entries
+
+    def _swap(self, layers: Dict[str, Tuple[DictionarySource, Dict[str, str]]]):
+        merged: Dict[str, str] = {}
+        for _, entries in layers.values():
+            merged.update(entries)
+        self._engine._set_overlay(WordList(merged) if merged else None)
+        self._layers = layers
@@ -1,101 +1,879 @@
+import functools
 import re
-from typing import Optional
+import threading
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Pattern,
+    TextIO,
+    Tuple,
+)
 
+from nepali_unicoder.cache import load_cached
+from nepali_unicoder.dictionary import DictionaryLayers, LayeredMatcher, WordList
 from nepali_unicoder.loader import PreetiLoader, RuleLoader
+from nepali_unicoder.postrules import (
+    PostRuleRewriter,
+    barrier_plan,
+    plan_post_rules,
+    unbounded_contexts,
+)
+from nepali_unicoder.prescan import DEVANAGARI
 from nepali_unicoder.tokenizer import Tokenizer
-from nepali_unicoder.trie import Trie
+from nepali_unicoder.trie import CompactTrie, Trie
+
+if TYPE_CHECKING:
+    from nepali_unicoder.lattice import Candidate
+    from nepali_unicoder.profiling import EngineStats
+
+# Modes served by reverse.ReverseEngine, which converts Unicode back
+REVERSE_MODES = ("unicode-roman", "unicode-preeti")
+# Every conversion mode, forward ones first
+MODES = ("roman", "preeti") + REVERSE_MODES
+BACKENDS = ("trie", "regex", "compact")
+
+
+def check_options(
+    mode: str, backend: str, word_cache_size: int = 0, prescan: bool = False
+) -> None:
+    """
+    Raise the ValueError that building an Engine with these options would,
+    without loading any rules.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend: {backend!r}")
+    if word_cache_size < 0:
+        raise ValueError("word_cache_size must not be negative")
+    if mode in REVERSE_MODES:
+        if word_cache_size:
+            raise ValueError("The word cache is not supported in reverse modes")
+        if prescan:
+            raise ValueError("Prescan is not supported in reverse modes")
+
+
+def _build_artifact(loader, mode: str) -> dict:
+    """Build the cacheable rule tables for an Engine in `mode`."""
+    if mode == "preeti":
+        post_rules = [tuple(rule) for rule in loader.get_post_rules()]
+        word_keys = []
+    else:
+        post_rules = []
+        word_keys = sorted(loader.word_maps())
+    return {
+        "compiled": loader.load().compile(),
+        # Keys that come from the word maps rather than the rules
+        "word_keys": word_keys,
+        "post_rules": post_rules,
+        "post_plan": plan_post_rules(post_rules),
+        "contexts": unbounded_contexts(post_rules),
+    }
 
 
 class Engine:
+    """
+    Converts text in one mode. After construction, conversions only read
+    the engine's tables, so one Engine can be shared by any number of
+    threads. Dictionary changes swap the matcher and its word cache in
+    with one assignment. Tables built on first use (the batch rewriter,
+    `trie`, the k-best lattice) may be built twice by racing threads, but
+    both copies are equal. Profiling is not thread-safe.
+    """
+
+    # Engines shared by Engine.shared(), keyed by their constructor arguments
+    _shared: Dict[Tuple[str, str, int, bool], "Engine"] = {}
+    # Reentrant: building a ReverseEngine gets the forward engine it uses
+    _shared_lock = threading.RLock()
+
     def __init__(
         self,
         trie: Optional[Trie] = None,
         tokenizer: Optional[Tokenizer] = None,
         mode: str = "roman",
+        backend: str = "trie",
+        word_cache_size: int = 0,
+        prescan: bool = False,
     ):
         self.mode = mode
+        self.backend = backend
+        self.word_cache_size = word_cache_size
+        # Copy non-convertible runs through without converting them
+        self.prescan = prescan
+        # Whether `{...}` blocks pass through unconverted
+        self.use_blocks = mode != "preeti"
+        # Set by enable_profiling()
+        self.stats: Optional["EngineStats"] = None
         self.post_rules = []
+        self._trie = trie
 
         if trie is None:
-            if mode == "preeti":
-                loader = PreetiLoader()
-                # Load post-processing rules for Preeti mode
-                raw_rules = loader.get_post_rules()
-                self.post_rules = [
-                    (re.compile(pattern), replacement)
-                    for pattern, replacement in raw_rules
-                ]
-            else:
-                loader = RuleLoader()
-            self.trie = loader.load()
+            artifact = self._load_artifact()
+            compiled = artifact["compiled"]
+            # Load post-processing rules for Preeti mode
+            self.post_rules = [
+                (re.compile(pattern), replacement)
+                for pattern, replacement in artifact["post_rules"]
+            ]
+            post_plan = artifact["post_plan"]
+            contexts = artifact["contexts"]
+            word_keys = artifact["word_keys"]
+        else:
+            compiled = trie.compile()
+            post_plan = []
+            contexts = []
+            word_keys = []
+        # Keys of the word maps, which transliterate_kbest scores higher
+        self._word_keys = frozenset(word_keys)
+        self._post_plan = post_plan
+        self._post_rewriter = PostRuleRewriter(post_plan)
+        # Built on first use by transliterate_many
+        self._batch_rewriter = None
+        # Built on first use by transliterate_kbest
+        self._kbest = None
+
+        # Read-only matcher used for scanning ROMAN chunks
+        if backend == "trie":
+            matcher = compiled
+        elif backend == "regex":
+            if self._trie is None:
+                self._trie = compiled.to_trie()
+            matcher = self._trie.compile_regex()
+        elif backend == "compact":
+            matcher = CompactTrie(compiled.items())
         else:
-            self.trie = trie
+            raise ValueError(f"Unknown backend: {backend!r}")
+        # The rules alone; `matcher` adds the dictionary layers, if any
+        self._rules_matcher = matcher
+        # The matcher in use and its word cache (None if disabled), swapped
+        # together with one assignment (see _set_overlay)
+        self._matching = (matcher, None)
 
         if tokenizer is None:
             self.tokenizer = Tokenizer()
         else:
             self.tokenizer = tokenizer
 
+        # Whitespace that no key or post-rule refers to separates the input
+        # into pieces that convert independently (see _safe_cuts)
+        self._key_chars = frozenset().union(*compiled.transitions)
+        used = set(self._key_chars)
+        for pattern, _ in self.post_rules:
+            used.update(pattern.pattern)
+        excluded = "".join(sorted(c for c in used if c.isspace()))
+        if excluded:
+            self._boundary_re = re.compile("[^\\S" + re.escape(excluded) + "]+")
+            self._word_re = re.compile("[\\S" + re.escape(excluded) + "]+")
+        else:
+            self._boundary_re = re.compile(r"\s+")
+            self._word_re = re.compile(r"\S+")
+        # Runs of non-ASCII letters and Devanagari signs that no key uses
+        # and the tokenizer does not treat specially, with the boundary
+        # whitespace between them; `prescan` copies them through. Other
+        # characters, such as punctuation or a stray no-break space, are
+        # left in the text, where post-rules can still reach across them.
+        other_keys = re.escape(
+            "".join(sorted(c for c in self._key_chars if not c.isascii()))
+        )
+        run = (
+            f"(?:[^\\W\\d_\\x00-\\x7f{other_keys}]"
+            f"|(?![\\d{other_keys}])[{DEVANAGARI}])+"
+        )
+        self._passthrough_re = re.compile(f"{run}(?:{self._boundary_re.pattern}{run})*")
+        self._unbounded_contexts = [
+            (target, re.compile("[" + re.escape(target + stops) + "]"))
+            for target, stops in contexts
+        ]
+
+        # transliterate_many joins texts with a character that no key
+        # contains or produces, so it passes through the mapping unchanged
+        self._sentinel = None
+        outputs = set().union(*(value for value in compiled.values if value))
+        for candidate in ("\x00", "\x1e", "\uffff"):
+            if candidate not in used and candidate not in outputs:
+                self._sentinel = candidate
+                break
+
+        # Single-character keys, applied with str.translate. Digits in NUMBER
+        # tokens are converted one at a time, so they all use the table.
+        singles = {}
+        multi_chars = set()
+        for key, value in compiled.items():
+            if len(key) > 1:
+                multi_chars.update(key)
+            elif value:
+                singles[key] = value
+        self._digit_table = str.maketrans(
+            {char: value for char, value in singles.items() if char.isdigit()}
+        )
+        # In ROMAN text, characters that occur in no longer key convert on
+        # their own, so runs of them are translated and only the runs of
+        # other characters are scanned. That pays off when nearly all keys
+        # are single characters (Preeti), not in roman mode, where almost
+        # every letter starts a longer key.
+        self._single_table = None
+        self._multi_re = None
+        if len(multi_chars) * 4 < len(singles):
+            self._single_table = str.maketrans(singles)
+            if multi_chars:
+                chars = re.escape("".join(sorted(multi_chars)))
+                self._multi_re = re.compile("([" + chars + "]+)")
+
+        # Optional memo of ROMAN words. A character that starts no key is
+        # passed through and the matcher restarts after it, so runs of key
+        # characters ("words") convert independently of their surroundings.
+        # `_single_table` is faster, so while it is in use (Preeti without
+        # dictionary layers) the memo is not consulted.
+        if word_cache_size < 0:
+            raise ValueError("word_cache_size must not be negative")
+        if word_cache_size:
+            key_chars = "".join(sorted(self._key_chars))
+            self._separator_re = re.compile("([^" + re.escape(key_chars) + "]+)")
+            self._matching = (matcher, self._make_word_cache(matcher))
+
+        # Custom dictionaries laid over the rules at runtime
+        self.dictionaries = DictionaryLayers(self)
+
+    @classmethod
+    def shared(
+        cls,
+        mode: str = "roman",
+        backend: str = "trie",
+        word_cache_size: int = 0,
+        prescan: bool = False,
+    ) -> "Engine":
+        """
+        Return a process-wide Engine for `mode`, building it on first use.
+        Later calls with the same arguments return the same instance.
+        """
+        key = (mode, backend, word_cache_size, prescan)
+        engine = cls._shared.get(key)
+        if engine is None:
+            with cls._shared_lock:
+                engine = cls._shared.get(key)
+                if engine is None:
+                    engine = cls.private(mode, backend, word_cache_size, prescan)
+                    cls._shared[key] = engine
+        return engine
+
+    @classmethod
+    def private(
+        cls,
+        mode: str = "roman",
+        backend: str = "trie",
+        word_cache_size: int = 0,
+        prescan: bool = False,
+    ) -> "Engine":
+        """
+        Return a new Engine for `mode` (a ReverseEngine for the reverse
+        modes) that is not shared with anyone else, e.g. to profile it or
+        to give it dictionary layers of its own.
+        """
+        factory = cls
+        if mode in REVERSE_MODES:
+            # reverse.py imports this module
+            from nepali_unicoder.reverse import ReverseEngine
+
+            factory = ReverseEngine
+        return factory(
+            mode=mode,
+            backend=backend,
+            word_cache_size=word_cache_size,
+            prescan=prescan,
+        )
+
+    def _load_artifact(self) -> dict:
+        """The rule tables for `self.mode`, from the cache if possible."""
+        mode = self.mode
+        if mode in REVERSE_MODES:
+            raise ValueError(f"Use ReverseEngine for mode {mode!r}")
+        loader = PreetiLoader() if mode == "preeti" else RuleLoader()
+        return load_cached(
+            "preeti" if mode == "preeti" else "roman",
+            loader.source_files(),
+            lambda: _build_artifact(loader, mode),
+        )
+
+    @property
+    def matcher(self):
+        """The rules, with the dictionary layers laid over them if any."""
+        return self._matching[0]
+
+    @property
+    def _word_cache(self):
+        return self._matching[1]
+
+    @property
+    def trie(self) -> Trie:
+        # Engines built from the cache only carry the compiled trie
+        if self._trie is None:
+            self._trie = self._rules_matcher.to_trie()
+        return self._trie
+
     def transliterate(self, text: str) -> str:
         """
         Convert Roman text to Devanagari using the Trie.
         """
         if not text:
             return ""
+        if self.prescan and not text.isascii():
+            return self._transliterate_prescanned(text)
 
-        use_blocks = self.mode != "preeti"
-        tokens = self.tokenizer.tokenize(text, use_blocks=use_blocks)
-        result = []
-
-        for token in tokens:
-            if token.type == "BLOCK":
-                result.append(token.value)
-            elif token.type == "LITERAL":
-                result.append(token.value)
-            elif token.type == "NUMBER":
-                # Process Number chunk: transliterate digits, keep others (like .) as is
-                for char in token.value:
-                    if char.isdigit():
-                        # Use Trie to find digit mapping (digits are single chars in rules)
-                        match_val, _ = self.trie.longest_match(char)
-                        if match_val:
-                            result.append(match_val)
-                        else:
-                            result.append(char)
-                    else:
-                        result.append(char)
-            elif token.type == "ROMAN":
-                # Process Roman chunk with Trie
-                chunk = token.value
-                idx = 0
-                chunk_len = len(chunk)
-
-                while idx < chunk_len:
-                    # Try to find longest match starting at idx
-                    # Pass chunk and idx directly to avoid slicing
-                    match_val, match_len = self.trie.longest_match(chunk, idx)
-
-                    if match_val:
-                        result.append(match_val)
-                        idx += match_len
-                    else:
-                        # No match, keep character as is
-                        result.append(chunk[idx])
-                        idx += 1
-
-        output = "".join(result)
+        output = self._map(text)
 
         # Apply post-processing rules for Preeti mode
-        if self.mode == "preeti" and self.post_rules:
+        if self.post_rules:
             output = self._apply_post_rules(output)
 
         return output
 
+    def _transliterate_prescanned(self, text: str) -> str:
+        """
+        `transliterate`, converting only the text between the runs that
+        `_passthrough_re` finds outside `{...}` blocks. Those runs are
+        copied through, and post-rules do not reach across them.
+        """
+        use_blocks = self.use_blocks
+        block_open = False
+        scanned = 0
+        last = 0
+        parts = []
+        runs = []
+
+        for run in self._passthrough_re.finditer(text):
+            start, end = run.span()
+            if use_blocks:
+                block_open = _scan_braces(text, scanned, start, block_open)
+                scanned = start
+                if block_open:
+                    continue
+            parts.append(text[last:start])
+            runs.append(run.group())
+            last = end
+        if not runs:
+            return self._convert_part(text)
+        parts.append(text[last:])
+
+        # Convert all the parts in one pass, as transliterate_many does
+        sentinel = self._sentinel
+        joined = sentinel.join(parts) if sentinel is not None else None
+        if (
+            joined is None
+            or joined.count(sentinel) != len(parts) - 1
+            or (use_blocks and ("{" in joined or "}" in joined))
+        ):
+            converted = [self._convert_part(part) for part in parts]
+        else:
+            converted = self._convert_joined(joined)
+
+        result = []
+        for part, run in zip(converted, runs):
+            result.append(part)
+            result.append(run)
+        result.append(converted[-1])
+        return "".join(result)
+
+    def _convert_part(self, text: str) -> str:
+        output = self._map(text)
+        if self.post_rules:
+            output = self._apply_post_rules(output)
+        return output
+
+    def enable_profiling(self) -> "EngineStats":
+        """
+        Start recording per-stage timings, token counts, match lengths,
+        unmatched characters and post-rule substitutions into `self.stats`.
+        Until this is called `transliterate` runs uninstrumented.
+
+        Only this instance is instrumented, but on an engine from `shared()`
+        that includes every other user of it in the process until
+        `disable_profiling()` is called; profile a separate Engine instead.
+        """
+        if self.prescan:
+            raise ValueError("Profiling is not supported with prescan")
+        if self.stats is None:
+            from nepali_unicoder.profiling import EngineStats, transliterate_profiled
+
+            self.stats = EngineStats()
+            stats = self.stats
+            # Shadow the method on this instance only
+            self.transliterate = lambda text: transliterate_profiled(self, text, stats)
+        return self.stats
+
+    def disable_profiling(self) -> Optional["EngineStats"]:
+        """Stop profiling and return the collected stats, if any."""
+        stats = self.stats
+        if stats is not None:
+            del self.transliterate
+            self.stats = None
+        return stats
+
+    def transliterate_kbest(self, text: str, k: int = 5) -> List["Candidate"]:
+        """
+        Return up to `k` alternative conversions of `text` as `Candidate`s
+        (text, score), best first. See `lattice.KBestTransliterator`.
+        """
+        kbest = self._kbest
+        if kbest is None:
+            # lattice.py imports this module
+            from nepali_unicoder.lattice import KBestTransliterator
+
+            kbest = self._kbest = KBestTransliterator(self)
+        return kbest.transliterate_kbest(text, k)
+
+    def transliterate_many(
+        self, texts: Iterable[str], batch_size: int = 1024
+    ) -> List[str]:
+        """
+        Convert many (typically short) texts, returning the results in
+        order. Equivalent to `[self.transliterate(t) for t in texts]`.
+
+        Each batch of `batch_size` texts is joined with a sentinel character
+        that no rule key matches, mapped in a single pass and split again.
+        Post-rules are rewritten so they cannot match across the sentinel
+        and also run once per batch.
+        """
+        if self.stats is not None or self._sentinel is None:
+            return [self.transliterate(text) for text in texts]
+
+        results = []
+        batch = []
+        for text in texts:
+            batch.append(text)
+            if len(batch) >= batch_size:
+                results.extend(self._transliterate_batch(batch))
+                batch = []
+        if batch:
+            results.extend(self._transliterate_batch(batch))
+        return results
+
+    def _transliterate_batch(self, texts: List[str]) -> List[str]:
+        sentinel = self._sentinel
+        joined = sentinel.join(texts)
+        # Blocks may span the sentinel, and texts may contain it; convert
+        # those texts on their own
+        if (
+            joined.count(sentinel) != len(texts) - 1
+            or (self.use_blocks and ("{" in joined or "}" in joined))
+            or (self.prescan and not joined.isascii())
+        ):
+            return self._transliterate_mixed(texts)
+        return self._convert_joined(joined)
+
+    def _convert_joined(self, joined: str) -> List[str]:
+        """Convert texts joined with the sentinel and split the results."""
+        sentinel = self._sentinel
+        mapped = self._map(joined)
+        if self.post_rules:
+            rewriter = self._get_batch_rewriter()
+            if rewriter is not None:
+                return rewriter.apply(mapped).split(sentinel)
+            apply = self._post_rewriter.apply
+            return [apply(text) for text in mapped.split(sentinel)]
+        return mapped.split(sentinel)
+
+    def _get_batch_rewriter(self) -> Optional[PostRuleRewriter]:
+        """
+        A rewriter for post-rules adapted (see `postrules.barrier_plan`) to
+        apply to the joined batch at once, or None if they cannot be.
+        """
+        if self._batch_rewriter is None:
+            plan = barrier_plan(self._post_plan, self._sentinel)
+            self._batch_rewriter = PostRuleRewriter(plan) if plan is not None else False
+        return self._batch_rewriter or None
+
+    def _transliterate_mixed(self, texts: List[str]) -> List[str]:
+        sentinel = self._sentinel
+        braces = self.use_blocks
+        prescan = self.prescan
+        results = [None] * len(texts)
+        simple = []
+        for idx, text in enumerate(texts):
+            if (
+                sentinel in text
+                or (braces and ("{" in text or "}" in text))
+                or (prescan and not text.isascii())
+            ):
+                results[idx] = self.transliterate(text)
+            else:
+                simple.append(idx)
+        if simple:
+            converted = self._transliterate_batch([texts[idx] for idx in simple])
+            for idx, text in zip(simple, converted):
+                results[idx] = text
+        return results
+
+    def transliterate_stream(self, chunks: Iterable[str]) -> Iterator[str]:
+        """
+        Convert an iterable of text chunks, yielding output incrementally.
+
+        Input is only held back from the last safe split point onwards
+        (see `_safe_cuts` and `_convert_before_line`), so memory is bounded
+        by the distance between such points rather than by the size of the
+        input. The joined output
+        equals `transliterate("".join(chunks))`.
+        """
+        for piece, output in self._split_stream(chunks):
+            yield self.transliterate(piece) if output is None else output
+
+    def split_stream(self, chunks: Iterable[str]) -> Iterator[str]:
+        """
+        Regroup an iterable of text chunks into pieces that can be converted
+        independently (and in any order): joining the converted pieces gives
+        `transliterate("".join(chunks))`. Each chunk is cut at its last safe
+        split point, so pieces are about as large as the chunks.
+        """
+        for piece, _ in self._split_stream(chunks):
+            yield piece
+
+    def _split_stream(
+        self, chunks: Iterable[str]
+    ) -> Iterator[Tuple[str, Optional[str]]]:
+        """
+        `split_stream`, yielding (piece, output), where `output` is the
+        converted piece if finding the cut converted it already, or None.
+        """
+        # Text held back since the last cut, joined only when it is cut
+        parts = []
+        held = 0
+        # Cuts before `resume` were looked for already; `block_open` is the
+        # `{...}` state there
+        resume = 0
+        block_open = False
+        # Pairs of boundary whitespace may straddle chunks, so with
+        # post-rules the last character is looked at again
+        overlap = 1 if self.post_rules else 0
+
+        for chunk in chunks:
+            if not chunk:
+                continue
+            parts.append(chunk)
+            held += len(chunk)
+
+            # Only the chunks from `resume` on are scanned
+            offset = held
+            first = len(parts)
+            while offset > resume:
+                first -= 1
+                offset -= len(parts[first])
+            tail = parts[first] if first == len(parts) - 1 else "".join(parts[first:])
+            start = resume - offset
+            cut = 0
+            output = None
+            for cut in self._safe_cuts(tail, False, start, block_open):
+                pass
+            if cut:
+                cut += offset
+            elif self.post_rules and tail.find("\n", start) >= 0:
+                text = "".join(parts)
+                parts = [text]
+                cut, output = self._last_line_cut(text, resume)
+
+            if cut:
+                text = "".join(parts)
+                yield text[:cut], output
+                rest = text[cut:]
+                parts = [rest]
+                held = len(rest)
+                resume = max(held - overlap, 0)
+                block_open = self.use_blocks and _scan_braces(rest, 0, resume, False)
+            else:
+                end = max(held - overlap, resume)
+                if self.use_blocks:
+                    block_open = _scan_braces(tail, start, end - offset, block_open)
+                resume = end
+
+        if held:
+            yield "".join(parts), None
+
+    def transliterate_file(
+        self, src: TextIO, dst: TextIO, chunk_size: int = 1 << 16
+    ) -> None:
+        """Stream `src` to `dst`, reading `chunk_size` characters at a time."""
+        chunks = iter(lambda: src.read(chunk_size), "")
+        for piece in self.transliterate_stream(chunks):
+            dst.write(piece)
+
+    def _map(self, text: str) -> str:
+        """
+        Tokenize and map text through the Trie, without post-rules.
+        """
+        use_blocks = self.use_blocks
+        # Read once, so a dictionary swap cannot take effect halfway through
+        matcher, word_cache = self._matching
+        # Only the rules are single characters; dictionary keys are not
+        single_table = self._single_table if matcher is self._rules_matcher else None
+        multi_re = self._multi_re
+        digit_table = self._digit_table
+        result = []
+
+        for value, token_type in self.tokenizer.iter_tokens(text, use_blocks):
+            if token_type == "BLOCK":
+                result.append(value)
+            elif token_type == "LITERAL":
+                result.append(value)
+            elif token_type == "NUMBER":
+                # Transliterate digits, keep others (like .) as is
+                result.append(value.translate(digit_table))
+            elif token_type == "ROMAN":
+                if single_table is not None:
+                    if multi_re is None:
+                        result.append(value.translate(single_table))
+                        continue
+                    # Translated runs and scanned runs alternate
+                    parts = multi_re.split(value)
+                    for idx, part in enumerate(parts):
+                        if idx % 2:
+                            result.extend(matcher.scan(part))
+                        elif part:
+                            result.append(part.translate(single_table))
+                elif word_cache is None:
+                    # Process the whole Roman chunk in one pass of the matcher
+                    result.extend(matcher.scan(value))
+                else:
+                    # Words and the separators between them alternate
+                    parts = self._separator_re.split(value)
+                    parts[::2] = map(word_cache, parts[::2])
+                    result.extend(parts)
+
+        return "".join(result)
+
+    def _make_word_cache(self, matcher):
+        def scan_word(word: str) -> str:
+            return "".join(matcher.scan(word))
+
+        return functools.lru_cache(maxsize=self.word_cache_size)(scan_word)
+
+    def _check_dictionary(self, entries: Dict[str, str]) -> None:
+        """Raise ValueError if `entries` cannot be used as a dictionary layer."""
+        key_chars = self._key_chars
+        for key, value in entries.items():
+            if not isinstance(key, str) or not isinstance(value, str):
+                raise ValueError(f"Dictionary entries must be strings: {key!r}")
+            if not key or not value:
+                raise ValueError(f"Empty dictionary key or value: {key!r}")
+            for char in key:
+                if char.isspace() or char not in key_chars:
+                    raise ValueError(
+                        f"Dictionary key {key!r} contains {char!r}, which no "
+                        f"rule key uses"
+                    )
+            if self._sentinel is not None and self._sentinel in value:
+                raise ValueError(
+                    f"Dictionary value for {key!r} contains {self._sentinel!r}"
+                )
+
+    def _set_overlay(self, overlay: Optional[WordList]) -> None:
+        """Swap the dictionary entries laid over the rules (None for none)."""
+        if overlay is None:
+            matcher = self._rules_matcher
+        else:
+            matcher = LayeredMatcher(self._rules_matcher, overlay)
+        # Words cached with the old entries must not be seen with the new
+        # ones; a new cache goes with the new matcher, in the same assignment
+        # so that no conversion pairs the old matcher with the new cache
+        word_cache = None
+        if self._word_cache is not None:
+            word_cache = self._make_word_cache(matcher)
+        self._matching = (matcher, word_cache)
+
+    def word_cache_info(self):
+        """
+        Hit/miss statistics of the word cache as a `functools` CacheInfo
+        (hits, misses, maxsize, currsize), or None if it is disabled.
+
+        In Preeti mode words are converted with a translation table, which
+        is faster than the cache, so the cache is only used while there
+        are dictionary layers; until then it records no hits or misses.
+        """
+        if self._word_cache is None:
+            return None
+        return self._word_cache.cache_info()
+
+    def clear_word_cache(self) -> None:
+        """Empty the word cache and reset its statistics."""
+        if self._word_cache is not None:
+            self._word_cache.cache_clear()
+
+    def _last_safe_cut(self, text: str, final: bool = False) -> int:
+        """
+        The last position `_safe_cuts` would yield, or 0 if there is none.
+        Only a growing window at the end of `text` is examined, so this
+        usually costs far less than walking all cuts from the start.
+        """
+        window = 4096
+        while True:
+            start = max(len(text) - window, 0)
+            cut = 0
+            for cut in self._safe_cuts(text, final, start):
+                pass
+            if cut or not start:
+                return cut
+            window *= 4
+
+    def _last_line_cut(self, text: str, start: int) -> Tuple[int, Optional[str]]:
+        """
+        With post-rules, the last position at or after `start` where `text`
+        (which begins at a safe cut) can be split before a single newline,
+        and the converted text before it; (0, None) if there is none. Only
+        the last few newlines are tried.
+        """
+        pos = len(text)
+        for _ in range(3):
+            pos = text.rfind("\n", start, pos)
+            if pos <= 0:
+                break
+            output = self._convert_before_line(text, pos)
+            if output is not None:
+                return pos, output
+        return 0, None
+
+    def _convert_before_line(self, text: str, pos: int) -> Optional[str]:
+        """
+        `transliterate(text[:pos])` if `text`, which begins at a safe cut,
+        can be split before the newline at `pos`, else None.
+
+        `.` does not match a newline, so the only bounded-context matches
+        that can reach one end with it (`ि\n` -> `\nि`), and converting
+        the text before the cut with the newline added shows whether one
+        does. Unbounded rules are checked as in `_safe_cuts`, and `^` does
+        not match at a newline.
+        """
+        if not self._boundary_re.match(text, pos):
+            return None
+        for target, finder in self._unbounded_contexts:
+            if self._next_decision(text, pos, target, finder)[1] is not True:
+                return None
+        output = self.transliterate(text[:pos] + "\n")
+        return output[:-1] if output.endswith("\n") else None
+
+    def _safe_cuts(
+        self,
+        text: str,
+        final: bool = False,
+        start: int = 0,
+        block_open: Optional[bool] = None,
+    ) -> Iterator[int]:
+        """
+        Yield, in ascending order, positions at or after `start` where
+        `text` can be split so that converting both halves separately gives
+        the same result as converting it whole.
+
+        - A cut sits next to boundary whitespace, which no key contains, so
+          no trie match, number or ellipsis can straddle it.
+        - In roman mode it must not fall inside a `{...}` block.
+        - With post-rules it must fall between two boundary whitespace
+          characters; the bounded-context rules then cannot reach across it.
+        - Unbounded rules (`[^stops]+?target`) must meet one of `stops`
+          after the cut before any `target`. If neither shows up before the
+          end of `text`, the cut is safe only when `final` is set.
+
+        `block_open` is the `{...}` state at `start`, if already known.
+        """
+        need_pair = bool(self.post_rules)
+        use_blocks = self.use_blocks
+        scanned = start
+        if block_open is None:
+            block_open = use_blocks and _scan_braces(text, 0, start, False)
+        decisions = [None] * len(self._unbounded_contexts)
+
+        # A run found from `start` may begin mid-run; any cut inside a run
+        # of boundary whitespace is as good as one at its start
+        for run in self._boundary_re.finditer(text, start):
+            run_start, run_end = run.span()
+            if need_pair:
+                if run_end - run_start < 2:
+                    continue
+                cut = run_start + 1
+            else:
+                cut = run_start
+            if cut == 0:
+                continue
+
+            if use_blocks:
+                block_open = _scan_braces(text, scanned, cut, block_open)
+                scanned = cut
+                if block_open:
+                    continue
+
+            safe = True
+            for idx, (target, finder) in enumerate(self._unbounded_contexts):
+                decision = decisions[idx]
+                if decision is None or decision[0] < cut:
+                    decision = self._next_decision(text, cut, target, finder)
+                    decisions[idx] = decision
+                verdict = decision[1]
+                if verdict is False or (verdict is None and not final):
+                    safe = False
+                    break
+
+            if safe:
+                yield cut
+
+    def _is_safe_cut(self, text: str, pos: int, final: bool = False) -> bool:
+        """Whether `text` may be split at `pos`, by the rules of `_safe_cuts`."""
+        if pos <= 0 or pos >= len(text):
+            return True
+        if self.post_rules:
+            if not self._boundary_re.fullmatch(text, pos - 1, pos + 1):
+                return False
+        elif not self._boundary_re.match(text, pos):
+            return False
+        if self.use_blocks and _scan_braces(text, 0, pos, False):
+            return False
+        for target, finder in self._unbounded_contexts:
+            verdict = self._next_decision(text, pos, target, finder)[1]
+            if verdict is False or (verdict is None and not final):
+                return False
+        return True
+
+    def _next_decision(
+        self, text: str, start: int, target: str, finder: Pattern
+    ) -> Tuple[int, Optional[bool]]:
+        """
+        Map the words after `start` until one of them contains `target` or
+        a stop character. Returns (word start, True if a stop comes first,
+        False if `target` does) or (len(text), None) if neither occurs.
+        """
+        for word in self._word_re.finditer(text, start):
+            found = finder.search(self._map(word.group()))
+            if found:
+                return word.start(), found.group() != target
+        return len(text), None
+
     def _apply_post_rules(self, text: str) -> str:
         """
         Apply post-processing rules (regex replacements) to the text.
         Used for Preeti mode to handle contextual transformations.
+        Equivalent to running `re.sub` for each of `self.post_rules` in
+        order, with fewer passes (see postrules.py).
         """
-        for pattern, replacement in self.post_rules:
-            text = pattern.sub(replacement, text)
-        return text
+        return self._post_rewriter.apply(text)
+
+
+def _scan_braces(text: str, start: int, end: int, block_open: bool) -> bool:
+    """
+    Follow the Tokenizer's brace handling over text[start:end] and report
+    whether a `{` is still waiting for its closing `}` at `end`.
+    """
+    i = start
+    if block_open:
+        close = text.find("}", i, end)
+        if close < 0:
+            return True
+        i = close + 1
+
+    while True:
+        brace = text.find("{", i, end)
+        if brace < 0:
+            return False
+        if text.startswith("{{", brace):
+            # Escaped brace
+            i = brace + 2
+            continue
+        close = text.find("}", brace + 1, end)
+        if close < 0:
+            return True
+        i = close + 1
@@ -0,0 +1,120 @@
+"""
+Incremental conversion of a text buffer that is edited in place, such as
+an editor document that is converted as the user types.
+
+The buffer is kept as a list of pieces split at safe cuts (see
+`Engine._safe_cuts`), each with its converted output. An edit only
+reconverts the pieces between the nearest boundaries on either side that
+are still safe cuts after the edit, so the cost depends on the size of
+the edit and the pieces around it, not on the length of the document.
+The output is always identical to converting the whole buffer again.
+"""
+
+import bisect
+import itertools
+from typing import List, NamedTuple, Optional
+
+from nepali_unicoder.engine import Engine
+
+
+class OutputEdit(NamedTuple):
+    """Replace `output[start:end]` of the previous output with `text`."""
+
+    start: int
+    end: int
+    text: str
+
+
+class IncrementalTransliterator:
+    """
+    A text buffer whose conversion is updated incrementally on every edit.
+
+    - `engine`: the Engine to convert with (default: the shared engine for
+      `mode`).
+    - `text`: initial contents of the buffer.
+    - `piece_size`: approximate number of characters per piece. Smaller
+      pieces make edits cheaper but add bookkeeping per piece.
+    """
+
+    def __init__(
+        self,
+        engine: Optional[Engine] = None,
+        mode: str = "roman",
+        text: str = "",
+        piece_size: int = 512,
+    ):
+        self.engine = engine if engine is not None else Engine.shared(mode=mode)
+        self.piece_size = piece_size
+        self._text = ""
+        self._pieces: List[str] = []
+        self._outputs: List[str] = []
+        if text:
+            self.replace(0, 0, text)
+
+    @property
+    def text(self) -> str:
+        return self._text
+
+    @property
+    def output(self) -> str:
+        return "".join(self._outputs)
+
+    def append(self, text: str) -> OutputEdit:
+        return self.replace(len(self._text), len(self._text), text)
+
+    def insert(self, pos: int, text: str) -> OutputEdit:
+        return self.replace(pos, pos, text)
+
+    def delete(self, start: int, end: int) -> OutputEdit:
+        return self.replace(start, end, "")
+
+    def replace(self, start: int, end: int, text: str) -> OutputEdit:
+        """
+        Replace `self.text[start:end]` with `text` and return how the
+        output changed.
+        """
+        old = self._text
+        if not 0 <= start <= end <= len(old):
+            raise ValueError(f"Invalid range {start}:{end} for length {len(old)}")
+        new = old[:start] + text + old[end:]
+        delta = len(text) - (end - start)
+        is_safe = self.engine._is_safe_cut
+
+        # Piece boundaries of the old text: bounds[i] is where piece i starts
+        bounds = [0]
+        bounds.extend(itertools.accumulate(len(piece) for piece in self._pieces))
+
+        # Nearest boundaries around the edit that are still safe cuts. The
+        # pieces outside them convert exactly as before.
+        first = bisect.bisect_right(bounds, start) - 1
+        while first > 0 and not is_safe(new, bounds[first], final=True):
+            first -= 1
+        last = bisect.bisect_left(bounds, end)
+        while last < len(bounds) - 1 and not is_safe(
+            new, bounds[last] + delta, final=True
+        ):
+            last += 1
+
+        region_start = bounds[first]
+        region = new[region_start : bounds[last] + delta]
+        pieces = self._split(region)
+        outputs = [self.engine.transliterate(piece) for piece in pieces]
+
+        out_start = sum(len(output) for output in self._outputs[:first])
+        out_end = out_start + sum(len(output) for output in self._outputs[first:last])
+        self._pieces[first:last] = pieces
+        self._outputs[first:last] = outputs
+        self._text = new
+        return OutputEdit(out_start, out_end, "".join(outputs))
+
+    def _split(self, text: str) -> List[str]:
+        """Split text at safe cuts into pieces of about `piece_size`."""
+        pieces = []
+        last = 0
+        for cut in self.engine._safe_cuts(text, final=True):
+            if cut - last >= self.piece_size:
+                pieces.append(text[last:cut])
+                last = cut
+        if last < len(text):
+            pieces.append(text[last:])
+        return pieces
@@ -0,0 +1,244 @@
+"""
+k-best transliteration over a lattice of all segmentations.
+
+`Engine.transliterate` commits to the longest match at every position,
+so each input has exactly one output. `KBestTransliterator` instead
+considers every way of splitting a word into keys: position `i` of a
+word has an edge to `i + len(key)` for every key that matches there.
+Each edge is scored, and the best-scoring paths through the lattice give
+the candidates:
+
+- a key of length L scores L * L, so longer matches are preferred (the
+  greedy segmentation usually scores best);
+- keys from the word maps and from dictionary layers score `word_bonus`
+  more per character;
+- an output that puts an independent vowel or `ॐ` right after a halanta
+  (`क्अ`), which is never written, scores `HALANTA_VOWEL_PENALTY` less;
+- with a `frequencies` table of output words, a word candidate also
+  scores `frequency_weight * log(1 + count)`.
+
+Words (runs of key characters) are segmented independently, like the
+word cache does, and the k best outputs of each word are memoized. Within
+a word, the best suffixes from every position are computed once, right
+to left, so the work is linear in the length of the input for a fixed k.
+The penalty depends on the first character of a suffix, so the k best
+are kept separately for suffixes that start with a vowel and for the
+rest. Pruning is then exact: the candidates are the k best-scoring
+segmentations of all.
+"""
+
+import functools
+import heapq
+import math
+import re
+from typing import Dict, FrozenSet, List, NamedTuple, Optional, Tuple
+
+from nepali_unicoder.dictionary import LayeredMatcher
+from nepali_unicoder.engine import REVERSE_MODES, Engine
+from nepali_unicoder.trie import Trie
+
+HALANTA_VOWEL_PENALTY = 4.0
+_HALANTA = "\u094d"
+# Independent vowels (अ to औ, ॠ, ॡ) and ॐ
+_VOWELS = frozenset(
+    [chr(code) for code in range(0x0904, 0x0915)] + ["\u0960", "\u0961", "\u0950"]
+)
+
+
+class Candidate(NamedTuple):
+    text: str
+    score: float
+
+
+class KBestTransliterator:
+    """
+    Returns the k best-scoring transliterations of a text.
+
+    - `engine`: the Engine whose rules, dictionary layers and post-rules
+      are used (default: the shared engine for `mode`).
+    - `frequencies`: optional counts of output words, e.g. from a corpus.
+    - `cache_size`: number of words whose candidates are memoized.
+
+    The lattice is built from the rules and dictionaries in effect when a
+    text is converted; a change to `engine.dictionaries` rebuilds it. The
+    rebuilt lattice replaces the old one with a single assignment, so one
+    instance can be shared by several threads.
+    """
+
+    def __init__(
+        self,
+        engine: Optional[Engine] = None,
+        mode: str = "roman",
+        frequencies: Optional[Dict[str, float]] = None,
+        word_bonus: float = 1.0,
+        frequency_weight: float = 1.0,
+        cache_size: int = 4096,
+    ):
+        self.engine = engine if engine is not None else Engine.shared(mode=mode)
+        if self.engine.mode in REVERSE_MODES:
+            raise ValueError("k-best transliteration is not supported in reverse modes")
+        self.frequencies = frequencies or {}
+        self.word_bonus = word_bonus
+        self.frequency_weight = frequency_weight
+        self.cache_size = cache_size
+        # (engine matcher the lattice was built for, separator regex,
+        # memoized word candidates)
+        self._state: Optional[tuple] = None
+
+    def _build(self, matcher) -> tuple:
+        engine = self.engine
+        source = engine._trie if engine._trie is not None else engine._rules_matcher
+        entries = dict(source.items())
+        word_keys = set(engine._word_keys)
+        if isinstance(matcher, LayeredMatcher):
+            overlay = matcher.overlay
+            entries.update(zip(overlay.keys, overlay.values))
+            word_keys.update(overlay.keys)
+
+        trie = Trie()
+        for key, value in entries.items():
+            # Keys with an empty value never match, as in the greedy path
+            if value:
+                trie.add(key, value)
+        compiled = trie.compile()
+        key_chars = "".join(sorted(frozenset().union(*compiled.transitions)))
+        separator_re = re.compile("([^" + re.escape(key_chars) + "]+)")
+        lattice = functools.partial(self._lattice, compiled, frozenset(word_keys))
+        word_candidates = functools.lru_cache(maxsize=self.cache_size)(lattice)
+        self._state = (matcher, separator_re, word_candidates)
+        return self._state
+
+    def transliterate_kbest(self, text: str, k: int = 5) -> List[Candidate]:
+        """
+        Return up to `k` distinct candidates for `text`, best first. Text
+        that the tokenizer keeps as is (blocks, numbers, punctuation) is
+        the same in every candidate.
+        """
+        if k < 1:
+            raise ValueError("k must be at least 1")
+        engine = self.engine
+        matcher = engine.matcher
+        state = self._state
+        if state is None or state[0] is not matcher:
+            state = self._build(matcher)
+        _, separator_re, word_candidates = state
+
+        # The k best outputs for the text so far, each kept as a linked
+        # list of pieces (previous node, piece) so that no output is copied
+        best: List[Tuple[float, Optional[tuple]]] = [(0.0, None)]
+        fixed: List[str] = []
+        for value, token_type in engine.tokenizer.iter_tokens(text, engine.use_blocks):
+            if token_type == "ROMAN":
+                parts = separator_re.split(value)
+                for idx, part in enumerate(parts):
+                    if idx % 2:
+                        fixed.append(part)
+                    elif part:
+                        if fixed:
+                            piece = "".join(fixed)
+                            best = [(score, (node, piece)) for score, node in best]
+                            fixed = []
+                        best = _combine(best, word_candidates(part, k), k)
+            elif token_type == "NUMBER":
+                fixed.append(value.translate(engine._digit_table))
+            else:
+                fixed.append(value)
+        tail = "".join(fixed)
+
+        results = []
+        seen = set()
+        for score, node in best:
+            pieces = [tail]
+            while node is not None:
+                node, piece = node
+                pieces.append(piece)
+            output = "".join(reversed(pieces))
+            if engine.post_rules:
+                output = engine._apply_post_rules(output)
+            if output not in seen:
+                seen.add(output)
+                results.append(Candidate(output, score))
+        return results
+
+    def _lattice(
+        self, compiled, word_keys: FrozenSet[str], word: str, k: int
+    ) -> List[Tuple[float, str]]:
+        """The k best (score, output) pairs for one word, best first."""
+        transitions = compiled.transitions
+        values = compiled.values
+        bonus = self.word_bonus
+        n = len(word)
+        # suffixes[i]: the k best outputs for word[i:] that start with a
+        # vowel and the k best of the others, best first
+        suffixes: List[List[Tuple[float, str]]] = [[] for _ in range(n)]
+        suffixes.append([(0.0, "")])
+
+        for i in range(n - 1, -1, -1):
+            edges = []
+            state = 0
+            j = i
+            while j < n:
+                state = transitions[state].get(word[j])
+                if state is None:
+                    break
+                j += 1
+                if values[state] is not None:
+                    length = j - i
+                    score = length * length
+                    if word[i:j] in word_keys:
+                        score += bonus * length
+                    edges.append((score, values[state], j))
+            if not edges:
+                # Like the greedy path, pass a character without a match through
+                edges.append((0.0, word[i], i + 1))
+
+            merged = []
+            # Longer edges first, so ties keep the greedy segmentation first
+            for order, (edge_score, value, end) in enumerate(reversed(edges)):
+                halanta = value.endswith(_HALANTA)
+                for rank, (score, output) in enumerate(suffixes[end]):
+                    score += edge_score
+                    if halanta and output[:1] in _VOWELS:
+                        score -= HALANTA_VOWEL_PENALTY
+                    merged.append((-score, order, rank, value + output))
+            merged.sort()
+            kept = []
+            seen = set()
+            counts = {True: 0, False: 0}
+            for neg_score, _, _, output in merged:
+                vowel = output[:1] in _VOWELS
+                if counts[vowel] < k and output not in seen:
+                    seen.add(output)
+                    counts[vowel] += 1
+                    kept.append((-neg_score, output))
+                    if counts[True] == counts[False] == k:
+                        break
+            suffixes[i] = kept
+
+        candidates = suffixes[0][:k]
+        if self.frequencies:
+            weight = self.frequency_weight
+            frequencies = self.frequencies
+            candidates = [
+                (score + weight * math.log1p(frequencies.get(output, 0)), output)
+                for score, output in candidates
+            ]
+            candidates.sort(key=lambda item: -item[0])
+        return candidates
+
+
+def _combine(
+    left: List[Tuple[float, Optional[tuple]]], right: List[Tuple[float, str]], k: int
+) -> List[Tuple[float, tuple]]:
+    """The k best concatenations of a node of `left` and an output of `right`."""
+    heap = [(-(left[0][0] + right[0][0]), 0, 0)]
+    seen = {(0, 0)}
+    result = []
+    while heap and len(result) < k:
+        neg_score, a, b = heapq.heappop(heap)
+        result.append((-neg_score, (left[a][1], right[b][1])))
+        for a2, b2 in ((a + 1, b), (a, b + 1)):
+            if a2 < len(left) and b2 < len(right) and (a2, b2) not in seen:
+                seen.add((a2, b2))
+                heapq.heappush(heap, (-(left[a2][0] + right[b2][0]), a2, b2))
+    return result
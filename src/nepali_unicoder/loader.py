@@ -1,11 +1,18 @@
-import json
 import os
+from typing import Dict, List, Optional, Union
 
-from nepali_unicoder.trie import Trie
+from nepali_unicoder.trie import CompactTrie, Trie
+
+
+def data_path(filename):
+    return os.path.join(os.path.dirname(__file__), "data", filename)
 
 
 def load_json_data(filename):
-    path = os.path.join(os.path.dirname(__file__), "data", filename)
+    # Imported here: a cached engine never parses JSON
+    import json
+
+    path = data_path(filename)
     try:
         with open(path, "r", encoding="utf-8") as f:
             return json.load(f)
@@ -14,18 +21,35 @@ def load_json_data(filename):
         return {}
 
 
+class _Entries(dict):
+    """Collects keys with `add` like a Trie, to build a CompactTrie from."""
+
+    def add(self, key: str, value: str) -> None:
+        self[key] = value
+
+
 class RuleLoader:
     def __init__(self):
-        self.word_maps_path = os.path.join(
-            os.path.dirname(__file__), "data", "word_maps.json"
-        )
-
-    def load(self) -> Trie:
-        """Load rules and custom mappings into a Trie."""
-        trie = Trie()
+        self.word_maps_path = data_path("word_maps.json")
+        # Read once by word_maps()
+        self._word_maps: Optional[Dict[str, str]] = None
+
+    def source_files(self) -> List[str]:
+        """Files whose contents determine the loaded Trie."""
+        return [data_path("roman_rules.json"), self.word_maps_path]
+
+    def load(
+        self, custom: bool = True, compact: bool = False
+    ) -> Union[Trie, CompactTrie]:
+        """
+        Load rules and (unless `custom` is False) custom mappings into a
+        Trie, or into a read-only CompactTrie if `compact` is set.
+        """
+        trie = _Entries() if compact else Trie()
         self._load_rules(trie)
-        self._load_custom_mappings(trie)
-        return trie
+        if custom:
+            self._load_custom_mappings(trie)
+        return CompactTrie(trie.items()) if compact else trie
 
     def _load_rules(self, trie: Trie):
         data = load_json_data("roman_rules.json")
@@ -66,29 +90,50 @@ class RuleLoader:
         # Ensure 'a' maps to 'अ' (already in vowels, but good to double check)
         trie.add("a", vowels.get("a", "अ"))
 
-    def _load_custom_mappings(self, trie: Trie):
+    def word_maps(self) -> Dict[str, str]:
+        """The custom mappings, with their keys lowercased as they are loaded."""
+        if self._word_maps is None:
+            self._word_maps = self._read_word_maps()
+        return self._word_maps
+
+    def _read_word_maps(self) -> Dict[str, str]:
+        import json
+
         if not os.path.exists(self.word_maps_path):
-            return
+            return {}
 
         try:
             with open(self.word_maps_path, "r", encoding="utf-8") as f:
                 mappings = json.load(f)
-                for roman, devanagari in mappings.items():
-                    trie.add(roman.lower(), devanagari)
+                return {
+                    roman.lower(): devanagari for roman, devanagari in mappings.items()
+                }
         except Exception as e:
             print(f"Error reading word_maps.json: {e}")
+            return {}
+
+    def _load_custom_mappings(self, trie: Trie):
+        for roman, devanagari in self.word_maps().items():
+            trie.add(roman, devanagari)
 
 
 class PreetiLoader:
     def __init__(self):
         pass
 
-    def load(self) -> Trie:
-        """Load Preeti rules into a Trie."""
-        trie = Trie()
+    def source_files(self) -> List[str]:
+        """Files whose contents determine the loaded Trie and post-rules."""
+        return [data_path("preeti_rules.json")]
+
+    def load(self, compact: bool = False) -> Union[Trie, CompactTrie]:
+        """Load Preeti rules into a Trie, or a CompactTrie if `compact` is set."""
         data = load_json_data("preeti_rules.json")
 
         mappings = data.get("mappings", {})
+        if compact:
+            return CompactTrie(mappings.items())
+
+        trie = Trie()
         for key, value in mappings.items():
             trie.add(key, value)
 
@@ -0,0 +1,64 @@
+import multiprocessing
+import os
+from typing import Iterable, Iterator, List, Optional
+
+from nepali_unicoder.engine import Engine
+
+# Engine owned by the current worker process, built once by _init_worker
+_worker_engine: Optional[Engine] = None
+
+
+def _init_worker(
+    mode: str, backend: str, word_cache_size: int = 0, prescan: bool = False
+) -> None:
+    global _worker_engine
+    # shared() also builds ReverseEngines for the reverse modes
+    _worker_engine = Engine.shared(
+        mode=mode, backend=backend, word_cache_size=word_cache_size, prescan=prescan
+    )
+
+
+def _convert_in_worker(text: str) -> str:
+    return _worker_engine.transliterate(text)
+
+
+def _convert_batch_in_worker(texts: List[str]) -> List[str]:
+    return _worker_engine.transliterate_many(texts, batch_size=len(texts) or 1)
+
+
+def convert_parallel(
+    texts: Iterable[str],
+    mode: str = "roman",
+    backend: str = "trie",
+    workers: Optional[int] = None,
+    chunksize: int = 256,
+    word_cache_size: int = 0,
+    prescan: bool = False,
+) -> Iterator[str]:
+    """
+    Convert independent texts on a pool of worker processes.
+
+    Each worker builds its own Engine once. Results are yielded in input
+    order as soon as they are ready, so `texts` can be a lazy iterable.
+    `workers` defaults to the number of CPUs; with a single worker the
+    texts are converted in this process without starting a pool.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+
+    if workers == 1:
+        engine = Engine.shared(
+            mode=mode, backend=backend, word_cache_size=word_cache_size, prescan=prescan
+        )
+        for text in texts:
+            yield engine.transliterate(text)
+        return
+
+    with multiprocessing.Pool(
+        workers,
+        initializer=_init_worker,
+        initargs=(mode, backend, word_cache_size, prescan),
+    ) as pool:
+        yield from pool.imap(_convert_in_worker, texts, chunksize)
@@ -0,0 +1,372 @@
+"""
+Minimal-pass application of the Preeti post-rules.
+
+The post-rules are an ordered cascade of regex substitutions. Applying each
+one with `re.sub` over the whole output means one full pass per rule, even
+for rules that cannot match. `plan_post_rules` analyses the patterns once
+and picks the cheapest exact way to apply each rule:
+
+- `LITERAL`: the pattern and replacement are plain text, so `str.replace`
+  is used instead of the regex engine.
+- `RUNS`: rules of the form `[^stops]+?target` (the `m` reordering rules)
+  can never match across a stop character. Applied to the whole text, the
+  lazy group is retried from every position and backtracks over long
+  stretches without `target`; instead the rule is applied only to the runs
+  between stop characters that actually contain `target`, and not at all
+  when `target` is absent.
+- `REGEX`: everything else, skipped entirely when one of the characters
+  every match needs is absent from the text.
+
+The plan is plain data so it can be stored in the rule cache;
+`PostRuleRewriter` compiles it. The result is identical to running the
+cascade with `re.sub`.
+"""
+
+import re
+from typing import List, Optional, Pattern, Sequence, Tuple
+
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+LITERAL = "literal"
+RUNS = "runs"
+REGEX = "regex"
+
+
+def _flatten(parsed) -> list:
+    """Inline capture groups so adjacent regex items can be inspected."""
+    items = []
+    for op, av in parsed:
+        if op == sre_parse.SUBPATTERN:
+            items.extend(_flatten(av[-1]))
+        else:
+            items.append((op, av))
+    return items
+
+
+def _literal_members(members) -> Optional[str]:
+    """Characters of a `[...]` class made only of single characters."""
+    chars = []
+    for op, av in members:
+        if op != sre_parse.LITERAL:
+            return None
+        chars.append(chr(av))
+    return "".join(chars)
+
+
+def unbounded_context(pattern: str) -> Optional[Tuple[str, str]]:
+    """
+    If `pattern` contains `[^stops]+?target` (or `*`, greedy or lazy),
+    return (target, stops). Such a rule can pull `target` back across any
+    amount of text that contains none of `stops`.
+    """
+    items = _flatten(sre_parse.parse(pattern))
+    for (op, av), (next_op, next_av) in zip(items, items[1:]):
+        if op not in (sre_parse.MIN_REPEAT, sre_parse.MAX_REPEAT):
+            continue
+        _, max_repeat, body = av
+        if max_repeat != sre_parse.MAXREPEAT or next_op != sre_parse.LITERAL:
+            continue
+        body = list(body)
+        if len(body) != 1 or body[0][0] != sre_parse.IN:
+            continue
+        members = body[0][1]
+        if members[0][0] != sre_parse.NEGATE:
+            continue
+        stops = _literal_members(members[1:])
+        if stops is not None:
+            return chr(next_av), stops
+    return None
+
+
+def unbounded_contexts(post_rules) -> List[Tuple[str, str]]:
+    """Distinct (target, stops) pairs over all rules, in rule order."""
+    contexts = []
+    for pattern, _ in post_rules:
+        context = unbounded_context(pattern)
+        if context is not None and context not in contexts:
+            contexts.append(context)
+    return contexts
+
+
+def required_chars(pattern: str) -> List[str]:
+    """
+    Groups of characters such that every match of `pattern` contains at
+    least one character from each group. An empty list means no guard.
+    """
+    return [group for group in _required(sre_parse.parse(pattern)) if group]
+
+
+def _required(parsed) -> List[str]:
+    groups = []
+    for op, av in parsed:
+        if op == sre_parse.LITERAL:
+            groups.append(chr(av))
+        elif op == sre_parse.IN:
+            chars = _literal_members(av)
+            if chars is not None:
+                groups.append(chars)
+        elif op == sre_parse.SUBPATTERN:
+            groups.extend(_required(av[-1]))
+        elif op in (sre_parse.MIN_REPEAT, sre_parse.MAX_REPEAT):
+            if av[0] >= 1:
+                groups.extend(_required(av[2]))
+        elif op == sre_parse.BRANCH:
+            # One of the alternatives matches: merge their first groups
+            merged = ""
+            for alternative in av[1]:
+                alternative_groups = _required(alternative)
+                if not alternative_groups:
+                    merged = ""
+                    break
+                merged += alternative_groups[0]
+            if merged:
+                groups.append(merged)
+    return groups
+
+
+def _is_literal(pattern: str, replacement: str) -> bool:
+    if "\\" in replacement:
+        return False
+    parsed = list(sre_parse.parse(pattern))
+    return all(op == sre_parse.LITERAL for op, _ in parsed)
+
+
+def _fits_runs(pattern: str, stops: str) -> bool:
+    """True if no part of the pattern other than the repeat can match a stop."""
+    for op, av in _flatten(sre_parse.parse(pattern)):
+        if op == sre_parse.LITERAL:
+            if chr(av) in stops:
+                return False
+        elif op == sre_parse.IN:
+            chars = _literal_members(av)
+            if chars is None or any(c in stops for c in chars):
+                return False
+        elif op in (sre_parse.MIN_REPEAT, sre_parse.MAX_REPEAT):
+            # Only the [^stops] repeat itself
+            body = list(av[2])
+            if len(body) != 1 or body[0][0] != sre_parse.IN:
+                return False
+            members = body[0][1]
+            if members[0][0] != sre_parse.NEGATE:
+                return False
+            if _literal_members(members[1:]) != stops:
+                return False
+        else:
+            return False
+    return True
+
+
+def plan_post_rules(post_rules: Sequence[Tuple[str, str]]) -> List[tuple]:
+    """
+    Choose how to apply each rule. Returns (kind, pattern, replacement,
+    extra) steps, where `extra` is the guard groups for REGEX steps and
+    (target, stops) for RUNS steps.
+    """
+    plan = []
+    for pattern, replacement in post_rules:
+        if _is_literal(pattern, replacement):
+            literal = "".join(chr(av) for _, av in sre_parse.parse(pattern))
+            plan.append((LITERAL, literal, replacement, None))
+            continue
+        context = unbounded_context(pattern)
+        if (
+            context is not None
+            and _fits_runs(pattern, context[1])
+            and not any(c in replacement for c in context[1])
+        ):
+            plan.append((RUNS, pattern, replacement, context))
+            continue
+        plan.append((REGEX, pattern, replacement, required_chars(pattern)))
+    return plan
+
+
+def exclude_char(pattern: str, char: str) -> Optional[str]:
+    """
+    Rewrite `pattern` so that no match contains `char`, and so that `^`
+    and `$` also match right after and right before it. Then substituting
+    the result in texts joined with `char` changes each text exactly as
+    substituting `pattern` in it alone would. Returns None for patterns
+    using constructs that could see past `char` (lookarounds, `\\b`, inline
+    flags, classes that contain it).
+    """
+    code = "\\U%08x" % ord(char)
+    out = []
+    i = 0
+    n = len(pattern)
+    while i < n:
+        c = pattern[i]
+        if c == "\\":
+            escape = pattern[i : i + 2]
+            letter = escape[1:]
+            if letter in ("A", "Z", "b", "B"):
+                return None
+            if letter in ("s", "S", "w", "W", "d", "D") and re.match(escape, char):
+                return None
+            out.append(escape)
+            i += 2
+        elif c == "(" and pattern.startswith("(?", i):
+            if pattern[i + 2 : i + 3] not in (":", "P"):
+                return None
+            out.append("(?")
+            i += 2
+        elif c == ".":
+            out.append("[^\\n" + code + "]")
+            i += 1
+        elif c == "^":
+            out.append("(?:^|(?<=" + code + "))")
+            i += 1
+        elif c == "$":
+            out.append("(?:$|(?=\\n?" + code + "))")
+            i += 1
+        elif c == "[":
+            j = i + 1
+            negated = pattern.startswith("^", j)
+            if negated:
+                j += 1
+            if pattern.startswith("]", j):
+                return None
+            k = j
+            while k < n and pattern[k] != "]":
+                k += 2 if pattern[k] == "\\" else 1
+            if negated:
+                out.append("[^" + code + pattern[j:k] + "]")
+            elif re.fullmatch(pattern[i : k + 1], char):
+                return None
+            else:
+                out.append(pattern[i : k + 1])
+            i = k + 1
+        else:
+            out.append(c)
+            i += 1
+    return "".join(out)
+
+
+def barrier_plan(plan: Sequence[tuple], char: str) -> Optional[List[tuple]]:
+    """
+    Adapt a plan from `plan_post_rules` so that applying it to texts
+    joined with `char` (which must not occur in any pattern or replacement)
+    gives the same texts as applying the original plan to each one.
+    Returns None if some pattern cannot be adapted.
+    """
+    adapted = []
+    for kind, pattern, replacement, extra in plan:
+        if kind == LITERAL:
+            adapted.append((kind, pattern, replacement, extra))
+            continue
+        new_pattern = exclude_char(pattern, char)
+        if new_pattern is None:
+            return None
+        if kind == RUNS:
+            target, stops = extra
+            extra = (target, stops + char)
+        adapted.append((kind, new_pattern, replacement, extra))
+    return adapted
+
+
+class PostRuleRewriter:
+    """Applies a plan from `plan_post_rules` to converted text."""
+
+    def __init__(self, plan: Sequence[tuple]):
+        self.steps = []
+        # For each step, one character that every match needs. Text with
+        # none of them is left unchanged by the whole plan.
+        triggers = set()
+        guarded = True
+        for kind, pattern, replacement, extra in plan:
+            if kind == LITERAL:
+                self.steps.append((kind, pattern, replacement, extra))
+                triggers.add(pattern[:1])
+                guarded = guarded and bool(pattern)
+            elif kind == RUNS:
+                target, stops = extra
+                stop_re = re.compile("[" + re.escape(stops) + "]")
+                self.steps.append(
+                    (kind, re.compile(pattern), replacement, (target, stops, stop_re))
+                )
+                triggers.add(target)
+            else:
+                self.steps.append((kind, re.compile(pattern), replacement, extra))
+                triggers.update(extra[0] if extra else "")
+                guarded = guarded and bool(extra)
+        triggers.discard("")
+        # Read-only from here on, so one rewriter can serve many threads
+        self.steps = tuple(self.steps)
+        self._trigger_re = None
+        if guarded:
+            self._trigger_re = re.compile(
+                "[" + re.escape("".join(sorted(triggers))) + "]" if triggers else "(?!)"
+            )
+
+    def triggered(self, text: str) -> bool:
+        """False if no step can change `text`."""
+        return self._trigger_re is None or bool(self._trigger_re.search(text))
+
+    def apply(self, text: str) -> str:
+        if not self.triggered(text):
+            return text
+        for kind, pattern, replacement, extra in self.steps:
+            if kind == LITERAL:
+                text = text.replace(pattern, replacement)
+            elif kind == RUNS:
+                if extra[0] in text:
+                    text = _subn_in_runs(pattern, replacement, text, *extra)[0]
+            elif all(any(c in text for c in group) for group in extra):
+                text = pattern.sub(replacement, text)
+        return text
+
+
+def apply_step(step: tuple, text: str) -> Tuple[str, int]:
+    """
+    Apply one of `PostRuleRewriter.steps` to `text`, as `apply` does, and
+    also return the number of substitutions. Used by profiling.
+    """
+    kind, pattern, replacement, extra = step
+    if kind == LITERAL:
+        count = text.count(pattern) if pattern else 0
+        return (text.replace(pattern, replacement) if count else text), count
+    if kind == RUNS:
+        if extra[0] not in text:
+            return text, 0
+        return _subn_in_runs(pattern, replacement, text, *extra)
+    if all(any(c in text for c in group) for group in extra):
+        return pattern.subn(replacement, text)
+    return text, 0
+
+
+def _subn_in_runs(
+    pattern: Pattern, replacement: str, text: str, target: str, stops: str, stop_re
+) -> Tuple[str, int]:
+    """
+    Apply `pattern` only to the parts of runs between stop characters that
+    end with `target`. Matches cannot contain a stop character, so this
+    gives the same result as `pattern.subn` over the whole text. The runs
+    are joined with a stop character and substituted in one call.
+    """
+    bounds = []
+    last = 0
+    found = text.find(target)
+    while found >= 0:
+        start = max(max(text.rfind(c, last, found) for c in stops) + 1, last)
+        stop = stop_re.search(text, found)
+        end = stop.start() if stop else len(text)
+        run_end = text.rfind(target, found, end) + 1
+        bounds.append((start, run_end))
+        last = run_end
+        found = text.find(target, end)
+
+    separator = stops[0]
+    joined = separator.join([text[start:end] for start, end in bounds])
+    joined, count = pattern.subn(replacement, joined)
+    runs = joined.split(separator)
+
+    pieces = []
+    last = 0
+    for (start, end), run in zip(bounds, runs):
+        pieces.append(text[last:start])
+        pieces.append(run)
+        last = end
+    pieces.append(text[last:])
+    return "".join(pieces), count
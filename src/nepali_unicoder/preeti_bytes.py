@@ -0,0 +1,156 @@
+"""
+Preeti conversion straight from bytes.
+
+Preeti text is legacy 8-bit data: every byte is one character of the
+font's Windows-1252 layout. `PreetiBytesEngine` converts `bytes`,
+`bytearray`, `memoryview` or `mmap` input without decoding it to `str`
+first. Apart from `...`, every Preeti key is a single character, so the
+mapping phase is one `codecs.charmap_decode` call with a 256-entry table
+from each byte to its output text. Ellipses and decimal numbers are the
+only byte sequences that the tokenizer keeps as they are (`.` maps to
+`।` elsewhere); a bytes regex finds them. The post-rules then run on the
+mapped text exactly as in `Engine`.
+"""
+
+import codecs
+import mmap
+import os
+import re
+from typing import BinaryIO, List, Optional
+
+from nepali_unicoder.engine import Engine
+
+# A `.` that may start an ellipsis or be a decimal point. Searching for the
+# `.` first is much faster than matching the tokenizer's NUMBER pattern,
+# which stops at every digit (Preeti digits are letters).
+_DOT_RE = re.compile(rb"\.(?:\.\.|\d+)?")
+_DIGITS = frozenset(b"0123456789")
+
+
+class PreetiBytesEngine:
+    """
+    Converts 8-bit Preeti data to Unicode, with the same output as
+    `Engine(mode="preeti")` on the decoded text.
+
+    - `engine`: the Preeti Engine whose rules are used (default: the
+      shared one).
+    - `encoding`: the single-byte encoding of the input. Bytes that it
+      does not define raise `UnicodeDecodeError`, as decoding would.
+    """
+
+    def __init__(self, engine: Optional[Engine] = None, encoding: str = "cp1252"):
+        if engine is None:
+            engine = Engine.shared(mode="preeti")
+        if engine.mode != "preeti":
+            raise ValueError("PreetiBytesEngine needs a Preeti engine")
+        multi = [key for key, _ in engine._rules_matcher.items() if len(key) > 1]
+        if any(key != "..." for key in multi):
+            raise ValueError("The rules have multi-character keys; use Engine")
+        self.engine = engine
+        self.encoding = encoding
+
+        # Output text of each byte; None for bytes the encoding leaves undefined
+        singles = dict(engine._rules_matcher.items())
+        table: List[Optional[str]] = []
+        for byte in range(256):
+            try:
+                char = bytes([byte]).decode(encoding)
+            except UnicodeDecodeError:
+                table.append(None)
+                continue
+            if len(char) != 1:
+                raise ValueError(f"{encoding!r} is not a single-byte encoding")
+            table.append(singles.get(char) or char)
+        self._table = tuple(table)
+
+    def transliterate(self, data) -> str:
+        """Convert bytes-like `data` and return the Unicode text."""
+        view = memoryview(data)
+        if not view.nbytes:
+            return ""
+        output = self._map(view)
+        if self.engine.post_rules:
+            output = self.engine._apply_post_rules(output)
+        return output
+
+    def transliterate_bytes(self, data) -> bytes:
+        """Convert bytes-like `data` and return UTF-8 encoded output."""
+        return self.transliterate(data).encode("utf-8")
+
+    def _map(self, view: memoryview) -> str:
+        table = self._table
+        parts = []
+        last = 0
+        # End of the last number with a decimal point
+        number_end = -1
+        for match in _DOT_RE.finditer(view):
+            start, end = match.span()
+            if end - start == 3 and view[start + 1] == 0x2E:
+                kept = "..."
+            elif (
+                end - start > 1
+                and start
+                and view[start - 1] in _DIGITS
+                and start != number_end
+            ):
+                # The tokenizer's NUMBER keeps its decimal point, unless
+                # these digits were the fraction of the previous number
+                kept = "."
+                number_end = end
+                end = start + 1
+            else:
+                continue
+            if start > last:
+                parts.append(
+                    codecs.charmap_decode(view[last:start], "strict", table)[0]
+                )
+            parts.append(kept)
+            last = end
+        if last < len(view):
+            parts.append(codecs.charmap_decode(view[last:], "strict", table)[0])
+        return "".join(parts)
+
+    def _last_safe_cut(self, view: memoryview) -> int:
+        """The last safe cut in `view`, found by decoding a growing tail."""
+        window = 4096
+        while True:
+            start = max(len(view) - window, 0)
+            # Preeti cuts only depend on the text after them
+            tail = codecs.decode(view[start:], self.encoding)
+            cut = self.engine._last_safe_cut(tail)
+            if cut or not start:
+                return start + cut if cut else 0
+            window *= 4
+
+    def transliterate_file(
+        self, path: str, dst: BinaryIO, piece_size: int = 1 << 20
+    ) -> int:
+        """
+        Convert the file at `path` through a memory map, `piece_size` bytes
+        at a time (cut at safe split points), and write UTF-8 output to the
+        binary stream `dst`. Returns the number of bytes read.
+        """
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0:
+                return 0
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                view = memoryview(mapped)
+                try:
+                    start = 0
+                    while start < size:
+                        # Grow the piece until it has a safe cut
+                        span = piece_size
+                        end = min(start + span, size)
+                        while end < size:
+                            cut = self._last_safe_cut(view[start:end])
+                            if cut:
+                                end = start + cut
+                                break
+                            span *= 2
+                            end = min(start + span, size)
+                        dst.write(self.transliterate_bytes(view[start:end]))
+                        start = end
+                finally:
+                    view.release()
+        return size
@@ -0,0 +1,65 @@
+"""
+Script classification of input text, ahead of conversion.
+
+Much real input is already Unicode Devanagari, or mixes it with the text
+to convert. `classify_spans` splits text into runs of ASCII, Devanagari
+and other characters with a single regex pass. Engines built with
+`prescan=True` use the same kind of pass (`Engine._passthrough_re`) to
+copy runs of Devanagari and other non-ASCII letters through untouched,
+and hand only the text around them to the tokenizer, the matcher and the
+post-rules.
+
+`detect_mode` guesses whether ASCII text is Preeti or romanized Nepali
+from its letters: romanized text (and English) is about half vowels,
+while Preeti uses `f`, `l`, `]` and punctuation for vowel signs and has
+few `a`, `e`, `i`, `o` or `u`.
+"""
+
+import re
+from typing import Iterator, NamedTuple
+
+# Devanagari, Devanagari Extended and Vedic Extensions
+DEVANAGARI = "\u0900-\u097f\ua8e0-\ua8ff\u1cd0-\u1cff"
+
+_SPAN_RE = re.compile(
+    f"([\\x00-\\x7f]+)|([{DEVANAGARI}]+)|([^\\x00-\\x7f{DEVANAGARI}]+)"
+)
+_SPAN_KINDS = (None, "ascii", "devanagari", "other")
+
+# A run of printable ASCII: a word, with any punctuation attached
+_WORD_RE = re.compile(r"[!-~]+")
+_VOWELS = frozenset("aeiouAEIOU")
+
+
+class Span(NamedTuple):
+    kind: str  # 'ascii', 'devanagari' or 'other'
+    start: int
+    end: int
+
+
+def classify_spans(text: str) -> Iterator[Span]:
+    """Yield the maximal runs of ASCII, Devanagari and other characters."""
+    for match in _SPAN_RE.finditer(text):
+        yield Span(_SPAN_KINDS[match.lastindex], match.start(), match.end())
+
+
+def detect_mode(text: str, sample_size: int = 1 << 16) -> str:
+    """
+    Return "preeti" if the ASCII words in the first `sample_size`
+    characters of `text` look like Preeti, else "roman".
+    """
+    letters = vowels = marks = 0
+    for word in _WORD_RE.findall(text, 0, sample_size):
+        word_letters = sum(1 for char in word if char.isalpha())
+        if not word_letters:
+            continue
+        letters += word_letters
+        vowels += sum(1 for char in word if char in _VOWELS)
+        marks += sum(1 for char in word if not char.isalnum())
+
+    if not letters:
+        return "roman"
+    vowel_ratio = vowels / letters
+    if vowel_ratio < 0.2 or (vowel_ratio < 0.3 and marks / letters > 0.1):
+        return "preeti"
+    return "roman"
@@ -0,0 +1,159 @@
+"""
+Opt-in instrumentation of Engine.transliterate.
+
+`Engine.enable_profiling()` replaces the engine's `transliterate` with
+`transliterate_profiled`, a separate copy of the pipeline that records
+what it does in an `EngineStats`. The regular code path is not touched,
+so an engine that is not being profiled pays nothing.
+
+The profiled path gives the same output, but it is slower: ROMAN tokens
+are matched one `longest_match` at a time to record match lengths and
+the word cache is bypassed. Post-rules go through the engine's
+`PostRuleRewriter`, as in production, one step (rule) at a time so that
+each step's time and substitutions can be recorded.
+"""
+
+import time
+from collections import Counter
+from typing import Dict, List
+
+from nepali_unicoder.postrules import apply_step
+
+_clock = time.perf_counter
+
+
+class EngineStats:
+    """Counters collected while an Engine is being profiled."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        self.calls = 0
+        self.chars = 0
+        # Seconds spent in tokenize, roman, number, literal, post_rules, total
+        self.stage_seconds: Dict[str, float] = Counter()
+        self.token_counts: Dict[str, int] = Counter()
+        # Length of each matched key -> number of matches
+        self.match_lengths: Dict[int, int] = Counter()
+        # Characters in ROMAN tokens that no key matched, passed through as-is
+        self.unmatched: Dict[str, int] = Counter()
+        # One entry per PostRuleRewriter step (one per post-rule), in order
+        self.post_rules: List[dict] = []
+
+    def as_dict(self) -> dict:
+        return {
+            "calls": self.calls,
+            "chars": self.chars,
+            "stage_seconds": dict(self.stage_seconds),
+            "token_counts": dict(self.token_counts),
+            "match_lengths": {str(k): v for k, v in sorted(self.match_lengths.items())},
+            "unmatched": dict(self.unmatched),
+            "post_rules": [dict(rule) for rule in self.post_rules],
+        }
+
+    def report(self, top: int = 10) -> str:
+        """A human-readable summary, listing the `top` slowest post-rules."""
+        lines = [f"{self.calls} call(s), {self.chars} chars"]
+        total = self.stage_seconds.get("total", 0.0)
+        lines.append("stages:")
+        for stage, seconds in sorted(
+            self.stage_seconds.items(), key=lambda item: -item[1]
+        ):
+            if stage != "total":
+                share = seconds / total if total else 0.0
+                lines.append(f"  {stage:12} {seconds * 1000:10.2f}ms {share:6.1%}")
+        lines.append(f"  {'total':12} {total * 1000:10.2f}ms")
+
+        lines.append("tokens: " + _format_counts(self.token_counts))
+        lines.append(
+            "match lengths: "
+            + ", ".join(f"{k}:{v}" for k, v in sorted(self.match_lengths.items()))
+        )
+        lines.append("unmatched: " + _format_counts(self.unmatched, top, repr))
+
+        rules = sorted(self.post_rules, key=lambda rule: -rule["seconds"])[:top]
+        if rules:
+            lines.append("slowest post-rules (PostRuleRewriter steps):")
+            for rule in rules:
+                lines.append(
+                    f"  {rule['seconds'] * 1000:8.2f}ms {rule['count']:8d} subs  "
+                    f"{rule['kind']:7} {rule['pattern']!r} -> {rule['replacement']!r}"
+                )
+        return "\n".join(lines)
+
+
+def _format_counts(counts, top=None, key_format=str) -> str:
+    items = Counter(counts).most_common(top)
+    return ", ".join(f"{key_format(k)}:{v}" for k, v in items) or "-"
+
+
+def transliterate_profiled(engine, text: str, stats: EngineStats) -> str:
+    """`engine.transliterate(text)`, recording into `stats`."""
+    stats.calls += 1
+    stats.chars += len(text)
+    if not text:
+        return ""
+
+    stage = stats.stage_seconds
+    start = _clock()
+    tokens = engine.tokenizer.tokenize(text, use_blocks=engine.use_blocks)
+    stage["tokenize"] += _clock() - start
+
+    matcher = engine.matcher
+    digit_table = engine._digit_table
+    counts = stats.token_counts
+    lengths = stats.match_lengths
+    unmatched = stats.unmatched
+    result = []
+
+    for value, token_type in tokens:
+        counts[token_type] += 1
+        token_start = _clock()
+        if token_type == "ROMAN":
+            idx = 0
+            n = len(value)
+            while idx < n:
+                match_val, match_len = matcher.longest_match(value, idx)
+                if match_val:
+                    lengths[match_len] += 1
+                    result.append(match_val)
+                    idx += match_len
+                else:
+                    unmatched[value[idx]] += 1
+                    result.append(value[idx])
+                    idx += 1
+            stage["roman"] += _clock() - token_start
+        elif token_type == "NUMBER":
+            result.append(value.translate(digit_table))
+            stage["number"] += _clock() - token_start
+        else:
+            result.append(value)
+            stage["literal"] += _clock() - token_start
+
+    output = "".join(result)
+
+    if engine.post_rules:
+        rewriter = engine._post_rewriter
+        if not stats.post_rules:
+            stats.post_rules = [
+                {
+                    "kind": kind,
+                    "pattern": getattr(pattern, "pattern", pattern),
+                    "replacement": replacement,
+                    "count": 0,
+                    "seconds": 0.0,
+                }
+                for kind, pattern, replacement, _ in rewriter.steps
+            ]
+        post_start = _clock()
+        if rewriter.triggered(output):
+            for rule, step in zip(stats.post_rules, rewriter.steps):
+                rule_start = _clock()
+                output, count = apply_step(step, output)
+                rule["seconds"] += _clock() - rule_start
+                rule["count"] += count
+        stage["post_rules"] += _clock() - post_start
+
+    stage["total"] += _clock() - start
+    return output
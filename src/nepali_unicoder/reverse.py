@@ -0,0 +1,243 @@
+"""
+Reverse conversion: Unicode Devanagari back to Roman or Preeti.
+
+The tables loaded by `RuleLoader` and `PreetiLoader` are inverted into
+their own longest-match tries, so the reverse modes reuse the compiled trie
+matchers, streaming, batching and the process pool of the forward engine.
+
+- `unicode-roman` writes Roman text that the `roman` mode converts back to
+  the same Devanagari. Where two keys would run together into a different
+  key (`क्` + `ह` is `k` + `ha`, not `kha`), an empty block `{}` separates
+  them, and characters that the `roman` mode would convert (Latin letters,
+  ASCII digits, `.`) are wrapped in `{...}` blocks.
+- `unicode-preeti` first undoes the reordering done by the Preeti
+  post-rules (a reph `र्` is typed after its syllable, `ि` before its
+  consonant cluster), then maps every character back to a Preeti key.
+
+Custom word mappings (`word_maps.json`) are not inverted: they are whole
+words, and as reverse keys they would also match inside unrelated words.
+"""
+
+import re
+from typing import Iterable, List, Tuple
+
+from nepali_unicoder.cache import load_cached
+from nepali_unicoder.engine import REVERSE_MODES, Engine
+from nepali_unicoder.loader import PreetiLoader, RuleLoader
+from nepali_unicoder.postrules import unbounded_contexts
+from nepali_unicoder.trie import Trie
+
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+# A consonant, with an optional nukta
+_CONSONANT = "[क-हक़-य़]़?"
+_CLUSTER = f"(?:{_CONSONANT}्)*{_CONSONANT}"
+_SIGNS = "[ािीुूृेैोौंःँ]"
+
+# Applied in order before mapping in `unicode-preeti` mode. They undo the
+# reordering post-rules, the last of them first.
+PRE_RULES = [
+    # A reph is typed as `{` after the syllable it sits on
+    (f"र्({_CLUSTER}{_SIGNS}*)", r"\1{"),
+    # ि is typed before the consonant cluster it follows
+    (f"({_CLUSTER})ि", r"ि\1"),
+]
+
+
+def _preference(key: str) -> Tuple[bool, bool, int, str]:
+    """
+    Sort order among keys with the same value: keys without characters
+    the Tokenizer treats specially, then lower case ones, then the
+    shortest, then the first alphabetically.
+    """
+    return ("." in key or "{" in key or "}" in key, key != key.lower(), len(key), key)
+
+
+def invert(pairs: Iterable[Tuple[str, str]]) -> Trie:
+    """
+    A Trie mapping every non-empty value in `pairs` to one of its keys,
+    chosen deterministically by `_preference`.
+    """
+    best = {}
+    for key, value in pairs:
+        if not value:
+            continue
+        if value not in best or _preference(key) < _preference(best[value]):
+            best[value] = key
+    trie = Trie()
+    for value, key in sorted(best.items()):
+        trie.add(value, key)
+    return trie
+
+
+def _is_literal(pattern: str) -> bool:
+    return all(op == sre_parse.LITERAL for op, _ in sre_parse.parse(pattern))
+
+
+def _is_anchored(forward: Engine, contexts, candidate: str) -> bool:
+    """
+    Whether every target of an unbounded post-rule (`[^stops]+?target`)
+    in `candidate` directly follows one of its stops, so that the rule
+    cannot pull it back to an earlier word.
+    """
+    for target, stops in contexts:
+        for idx, char in enumerate(candidate):
+            if char != target:
+                continue
+            if forward.transliterate(candidate[:idx])[-1:] not in stops:
+                return False
+    return True
+
+
+def _build_reverse_artifact(mode: str) -> dict:
+    """Build the cacheable tables for a ReverseEngine in `mode`."""
+    if mode == "unicode-preeti":
+        loader = PreetiLoader()
+        trie = invert(loader.load().items())
+        # Post-rules that merge a literal sequence into another character
+        # (`उm` -> `ऊ`) give extra keys. Keep those the forward direction
+        # turns back into the same character.
+        base = trie.compile()
+        forward = Engine.shared(mode="preeti")
+        post_rules = loader.get_post_rules()
+        contexts = unbounded_contexts(post_rules)
+        for pattern, replacement in post_rules:
+            if len(pattern) < 2 or not replacement or "\\" in replacement:
+                continue
+            if not _is_literal(pattern):
+                continue
+            if base.longest_match(replacement)[1] == len(replacement):
+                continue
+            candidate = "".join(base.scan(pattern))
+            if forward.transliterate(candidate) == replacement and _is_anchored(
+                forward, contexts, candidate
+            ):
+                trie.add(replacement, candidate)
+    else:
+        trie = invert(RuleLoader().load(custom=False).items())
+    return {
+        "compiled": trie.compile(),
+        "word_keys": [],
+        "post_rules": [],
+        "post_plan": [],
+        "contexts": [],
+    }
+
+
+def _escape(run: str) -> str:
+    """Write `run` so that the roman mode passes it through unchanged."""
+    parts = []
+    for piece in re.split("([{}])", run):
+        if piece == "{":
+            parts.append("{{")
+        elif piece == "}":
+            parts.append("}")
+        elif piece:
+            parts.append("{" + piece + "}")
+    return "".join(parts)
+
+
+class ReverseEngine(Engine):
+    """
+    Engine for the reverse modes `unicode-roman` and `unicode-preeti`.
+
+    Use `Engine.shared(mode=...)` or `Converter(mode=...)` rather than
+    building one directly. The word cache, prescan and profiling are not
+    supported.
+    """
+
+    def __init__(
+        self,
+        mode: str = "unicode-roman",
+        backend: str = "trie",
+        word_cache_size: int = 0,
+        prescan: bool = False,
+    ):
+        if mode not in REVERSE_MODES:
+            raise ValueError(f"Unknown reverse mode: {mode!r}")
+        if word_cache_size:
+            raise ValueError("The word cache is not supported in reverse modes")
+        if prescan:
+            raise ValueError("Prescan is not supported in reverse modes")
+        super().__init__(mode=mode, backend=backend)
+        # `{` and `}` are ordinary characters in Unicode text
+        self.use_blocks = False
+
+        if mode == "unicode-roman":
+            forward = Engine.shared(mode="roman")._rules_matcher
+            self._forward = forward
+            self._roman_starts = frozenset(forward.transitions[0])
+            # Output -> the forward transitions after it, for outputs that
+            # are a prefix of a longer forward key
+            self._continuations = {}
+            for _, output in self.trie.items():
+                state = 0
+                for char in output:
+                    state = forward.transitions[state][char]
+                if forward.transitions[state]:
+                    self._continuations[output] = forward.transitions[state]
+            key_chars = set().union(*forward.transitions) | {"{", "}"}
+            self._escape_re = re.compile(
+                "([" + re.escape("".join(sorted(key_chars))) + "]+)"
+            )
+        else:
+            self._pre_rules = [
+                (re.compile(pattern), replacement) for pattern, replacement in PRE_RULES
+            ]
+
+    def _load_artifact(self) -> dict:
+        loader = PreetiLoader() if self.mode == "unicode-preeti" else RuleLoader()
+        return load_cached(
+            self.mode,
+            loader.source_files(),
+            lambda: _build_reverse_artifact(self.mode),
+        )
+
+    def enable_profiling(self):
+        raise ValueError("Profiling is not supported in reverse modes")
+
+    def _map(self, text: str) -> str:
+        if self.mode == "unicode-preeti":
+            for pattern, replacement in self._pre_rules:
+                text = pattern.sub(replacement, text)
+            return "".join(self.matcher.scan(text))
+
+        # Runs of characters that the roman mode would convert alternate
+        # with runs of Unicode text
+        parts = self._escape_re.split(text)
+        for idx, part in enumerate(parts):
+            if idx % 2:
+                parts[idx] = _escape(part)
+            elif part:
+                parts[idx] = self._romanize(part)
+        return "".join(parts)
+
+    def _romanize(self, text: str) -> str:
+        segments = self.matcher.scan(text)
+        starts = self._roman_starts
+        continuations = self._continuations
+        longest_match = self._forward.longest_match
+        max_len = self._forward.max_key_len
+        result: List[str] = []
+        append = result.append
+        n = len(segments)
+
+        for idx, segment in enumerate(segments):
+            append(segment)
+            # Only a segment that a longer forward key extends, followed by
+            # a character of that key, can merge with what follows
+            follow = continuations.get(segment)
+            if follow is None or idx + 1 >= n or segments[idx + 1][0] not in follow:
+                continue
+            ahead = segment
+            j = idx + 1
+            while j < n and len(ahead) < max_len and segments[j][0] in starts:
+                ahead += segments[j]
+                j += 1
+            if longest_match(ahead)[1] != len(segment):
+                append("{}")
+
+        return "".join(result)
@@ -0,0 +1,221 @@
+"""
+asyncio API and a small stdlib HTTP server around the shared engines.
+
+Conversion is CPU-bound, so `AsyncConverter` never runs it on the event
+loop: each call is handed to an executor (the loop's default thread pool
+unless one is given) and a semaphore bounds how many calls are in flight,
+so a burst of large payloads queues up instead of piling onto the pool.
+"""
+
+import asyncio
+import json
+import threading
+from concurrent.futures import Executor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterable, List, Optional, Sequence
+
+from nepali_unicoder.engine import MODES, REVERSE_MODES, Engine
+from nepali_unicoder.reverse import ReverseEngine
+
+
+def _convert_batch(mode: str, backend: str, texts: Sequence[str]) -> List[str]:
+    # Module-level so it can also be sent to a ProcessPoolExecutor
+    engine = Engine.shared(mode=mode, backend=backend)
+    return [engine.transliterate(text) for text in texts]
+
+
+class AsyncConverter:
+    """
+    Convert text from coroutines without blocking the event loop.
+
+    - `executor`: where conversions run. `None` uses the loop's default
+      thread pool; a `ProcessPoolExecutor` spreads work over several cores.
+    - `max_concurrency`: at most this many conversions are submitted to the
+      executor at once; further calls wait for a free slot.
+    - `chunksize`: `aconvert_many` submits the texts in batches of this
+      size, so each executor job amortises its scheduling overhead.
+    """
+
+    def __init__(
+        self,
+        mode: str = "roman",
+        backend: str = "trie",
+        executor: Optional[Executor] = None,
+        max_concurrency: int = 8,
+        chunksize: int = 64,
+    ):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.mode = mode
+        self.backend = backend
+        self.executor = executor
+        self.max_concurrency = max_concurrency
+        self.chunksize = chunksize
+        # Build (or load) the engine now rather than on the first request
+        Engine.shared(mode=mode, backend=backend)
+        self._semaphore = None
+        self._semaphore_loop = None
+
+    def _slot(self) -> asyncio.Semaphore:
+        # Semaphores are bound to a loop on older Pythons, so make one per loop
+        loop = asyncio.get_running_loop()
+        if self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    async def _run(self, texts: Sequence[str]) -> List[str]:
+        loop = asyncio.get_running_loop()
+        async with self._slot():
+            return await loop.run_in_executor(
+                self.executor, _convert_batch, self.mode, self.backend, texts
+            )
+
+    async def aconvert(self, text: str) -> str:
+        """Convert one text in the executor."""
+        results = await self._run([text])
+        return results[0]
+
+    async def aconvert_many(self, texts: Iterable[str]) -> List[str]:
+        """Convert many texts in batches, returning the results in order."""
+        texts = list(texts)
+        batches = [
+            texts[i : i + self.chunksize] for i in range(0, len(texts), self.chunksize)
+        ]
+        results = await asyncio.gather(*(self._run(batch) for batch in batches))
+        return [text for batch in results for text in batch]
+
+
+class ConversionHandler(BaseHTTPRequestHandler):
+    """
+    JSON endpoint:
+
+    - `POST /convert` with `{"mode": "roman", "texts": [...]}` (or a single
+      `"text"`) returns `{"results": [...]}` (or `{"result": ...}`).
+    - `POST /reload` reads the dictionary files of every mode again and
+      returns `{"dictionaries": {mode: [names]}}`.
+    - `GET /health` returns `{"status": "ok"}`.
+    """
+
+    server_version = "nepali_unicoder"
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send(200, {"status": "ok"})
+        else:
+            self._send(404, {"error": "not found"})
+
+    def do_POST(self):
+        if self.path == "/reload":
+            self._reload()
+            return
+        if self.path != "/convert":
+            self._send(404, {"error": "not found"})
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            self._send(400, {"error": "invalid Content-Length"})
+            return
+        if length > self.server.max_body:
+            self._send(413, {"error": "request body too large"})
+            return
+        try:
+            request = json.loads(self.rfile.read(length).decode("utf-8"))
+            mode = request.get("mode", "roman")
+            if mode not in MODES:
+                raise ValueError(f"Unknown mode: {mode!r}")
+            single = "texts" not in request
+            texts = [request["text"]] if single else request["texts"]
+            if not isinstance(texts, list) or not all(
+                isinstance(text, str) for text in texts
+            ):
+                raise ValueError("texts must be a list of strings")
+        except (ValueError, KeyError, AttributeError) as e:
+            self._send(400, {"error": str(e)})
+            return
+
+        engine = self.server.engines[mode]
+        with self.server.slots:
+            results = [engine.transliterate(text) for text in texts]
+
+        if single:
+            self._send(200, {"result": results[0]})
+        else:
+            self._send(200, {"results": results})
+
+    def _reload(self) -> None:
+        try:
+            for engine in self.server.engines.values():
+                engine.dictionaries.reload()
+        except (OSError, ValueError) as e:
+            # The engines keep the dictionaries they had
+            self._send(500, {"error": str(e)})
+            return
+        self._send(
+            200,
+            {
+                "dictionaries": {
+                    mode: engine.dictionaries.names()
+                    for mode, engine in self.server.engines.items()
+                }
+            },
+        )
+
+    def _send(self, status: int, payload: dict) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+
+def make_server(
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    backend: str = "trie",
+    max_concurrency: int = 8,
+    max_body: int = 16 << 20,
+    quiet: bool = False,
+    dictionaries: Sequence[str] = (),
+) -> ThreadingHTTPServer:
+    """
+    Create (but do not start) the HTTP server. Engines for every mode are
+    built up front; `max_concurrency` bounds how many requests convert at
+    the same time and `max_body` rejects larger payloads with 413.
+    `dictionaries` are JSON files added as dictionary layers (named by
+    their path) to the `roman` engine. The server's engines are its own,
+    so its layers and `/reload` do not change the shared engines.
+    """
+    server = ThreadingHTTPServer((host, port), ConversionHandler)
+    server.daemon_threads = True
+    server.engines = {
+        mode: (ReverseEngine if mode in REVERSE_MODES else Engine)(
+            mode=mode, backend=backend
+        )
+        for mode in MODES
+    }
+    for path in dictionaries:
+        server.engines["roman"].dictionaries.add(path, path)
+    server.slots = threading.BoundedSemaphore(max_concurrency)
+    server.max_body = max_body
+    server.quiet = quiet
+    return server
+
+
+def serve(host: str = "127.0.0.1", port: int = 8000, **kwargs) -> None:
+    """Run the HTTP server until interrupted."""
+    server = make_server(host, port, **kwargs)
+    print(f"Serving on http://{host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -0,0 +1,409 @@
+"""
+Conversion of columns of tabular data: lists, pandas Series, Arrow arrays,
+CSV files, JSON Lines files and (with pyarrow) Parquet files.
+
+Columns of names, places and addresses repeat the same values many times,
+so each distinct value is converted once. `ColumnConverter` keeps the
+conversions of recent values in a bounded cache shared by all the columns
+and chunks it sees, and converts the values it has not seen in batches
+with `Engine.transliterate_many`, on a process pool if `workers > 1`.
+
+Files are read and written in chunks of `chunk_rows` rows, so memory is
+bounded by a chunk and the cache, not by the size of the file. pandas and
+pyarrow are optional: they are only imported for their own column types
+and for Parquet files.
+"""
+
+import csv
+import itertools
+import json
+import multiprocessing
+import time
+from typing import Dict, Iterable, List, Mapping, Sequence, TextIO, Union
+
+from nepali_unicoder.engine import Engine
+from nepali_unicoder.parallel import _convert_batch_in_worker, _init_worker
+
+
+class TabularResult:
+    """Totals of a `convert_csv`, `convert_jsonl` or `convert_parquet` run."""
+
+    def __init__(self, rows: int, values: int, converted: int, seconds: float):
+        self.rows = rows
+        self.values = values
+        self.converted = converted
+        self.seconds = seconds
+
+    @property
+    def rows_per_sec(self) -> float:
+        if not self.seconds:
+            return 0.0
+        return self.rows / self.seconds
+
+    def __repr__(self) -> str:
+        return (
+            f"TabularResult(rows={self.rows}, values={self.values}, "
+            f"converted={self.converted}, seconds={self.seconds:.3f})"
+        )
+
+
+class ColumnConverter:
+    """
+    Converts column values, each distinct value once.
+
+    - `workers`: processes used to convert new distinct values; with 1
+      (default) they are converted in this process.
+    - `batch_size`: distinct values converted per `transliterate_many`
+      call, and per task sent to a worker.
+    - `cache_size`: conversions kept between calls. The cache is emptied
+      when it grows past this, which bounds memory on columns with
+      millions of distinct values.
+
+    Values that are not strings (None, NaN, numbers) are returned as is.
+    Use it as a context manager, or call `close()`, to stop the pool.
+    """
+
+    def __init__(
+        self,
+        mode: str = "roman",
+        backend: str = "trie",
+        workers: int = 1,
+        batch_size: int = 1024,
+        cache_size: int = 1 << 20,
+        prescan: bool = False,
+    ):
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.engine = Engine.shared(mode=mode, backend=backend, prescan=prescan)
+        self.batch_size = batch_size
+        self.cache_size = cache_size
+        self.cache: Dict[str, str] = {}
+        # Values seen and values actually converted, over all calls
+        self.values = 0
+        self.converted = 0
+        self._pool = None
+        if workers > 1:
+            self._pool = multiprocessing.Pool(
+                workers,
+                initializer=_init_worker,
+                initargs=(mode, backend, 0, prescan),
+            )
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+
+    def __enter__(self) -> "ColumnConverter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def lookup(self, values: Iterable) -> Dict[str, str]:
+        """Map each distinct string in `values` to its conversion."""
+        cache = self.cache
+        wanted = {}
+        new = []
+        for value in values:
+            if value.__class__ is not str or value in wanted:
+                continue
+            converted = cache.get(value)
+            if converted is None:
+                new.append(value)
+            wanted[value] = converted
+
+        if new:
+            if len(cache) + len(new) > self.cache_size:
+                cache.clear()
+            for value, converted in zip(new, self._convert(new)):
+                cache[value] = wanted[value] = converted
+            self.converted += len(new)
+        return wanted
+
+    def _convert(self, texts: List[str]) -> Iterable[str]:
+        size = self.batch_size
+        if self._pool is None:
+            return self.engine.transliterate_many(texts, batch_size=size)
+        batches = [texts[i : i + size] for i in range(0, len(texts), size)]
+        return itertools.chain.from_iterable(
+            self._pool.imap(_convert_batch_in_worker, batches)
+        )
+
+    def convert_values(self, values: Sequence) -> list:
+        """Convert a sequence of values, returning a list."""
+        self.values += len(values)
+        mapping = self.lookup(values)
+        get = mapping.get
+        return [
+            get(value, value) if value.__class__ is str else value for value in values
+        ]
+
+    def convert_column(self, column):
+        """
+        Convert a column: a pandas Series (returns a Series with the same
+        index), a pyarrow Array or ChunkedArray (returns the same kind of
+        array), or any other sequence (returns a list).
+        """
+        module = type(column).__module__
+        if module.startswith("pandas"):
+            return self._convert_series(column)
+        if module.startswith("pyarrow"):
+            return self._convert_arrow(column)
+        return self.convert_values(column)
+
+    def _convert_series(self, series):
+        self.values += len(series)
+        mapping = self.lookup(series.unique())
+        # Values that are not strings map to NaN; put the originals back
+        return series.map(mapping).fillna(series)
+
+    def _convert_arrow(self, array):
+        import pyarrow as pa
+
+        if isinstance(array, pa.ChunkedArray):
+            return pa.chunked_array(
+                [self._convert_arrow(chunk) for chunk in array.chunks],
+                type=array.type,
+            )
+        encoded = array
+        if not pa.types.is_dictionary(array.type):
+            if not (
+                pa.types.is_string(array.type) or pa.types.is_large_string(array.type)
+            ):
+                return array
+            encoded = array.dictionary_encode()
+        self.values += len(array)
+        dictionary = encoded.dictionary.to_pylist()
+        mapping = self.lookup(dictionary)
+        values = pa.array(
+            [mapping.get(value, value) for value in dictionary],
+            type=encoded.dictionary.type,
+        )
+        if pa.types.is_dictionary(array.type):
+            return pa.DictionaryArray.from_arrays(encoded.indices, values)
+        return values.take(encoded.indices)
+
+
+def convert_column(
+    column,
+    mode: str = "roman",
+    backend: str = "trie",
+    workers: int = 1,
+    prescan: bool = False,
+):
+    """
+    Convert one column (a list, pandas Series or pyarrow array), each
+    distinct value once. See `ColumnConverter.convert_column`.
+    """
+    with ColumnConverter(mode, backend, workers=workers, prescan=prescan) as converter:
+        return converter.convert_column(column)
+
+
+def _column_indexes(header: List[str], columns: Sequence[str]) -> List[int]:
+    indexes = []
+    for name in columns:
+        if name not in header:
+            raise ValueError(f"column {name!r} is not in the header")
+        indexes.append(header.index(name))
+    return indexes
+
+
+def convert_csv(
+    src: TextIO,
+    dst: TextIO,
+    columns: Sequence[str],
+    mode: str = "roman",
+    backend: str = "trie",
+    workers: int = 1,
+    chunk_rows: int = 65536,
+    prescan: bool = False,
+    **fmtparams,
+) -> TabularResult:
+    """
+    Copy CSV rows from `src` to `dst`, converting the named `columns`.
+
+    The first row is the header and is copied as is. Rows are read and
+    written `chunk_rows` at a time. Open both files with `newline=""`;
+    `fmtparams` (such as `delimiter`) are passed to `csv.reader` and
+    `csv.writer`.
+    """
+    reader = csv.reader(src, **fmtparams)
+    writer = csv.writer(dst, **fmtparams)
+    start = time.perf_counter()
+    header = next(reader, None)
+    if header is None:
+        return TabularResult(0, 0, 0, time.perf_counter() - start)
+    indexes = _column_indexes(header, columns)
+    writer.writerow(header)
+
+    rows = 0
+    with ColumnConverter(mode, backend, workers=workers, prescan=prescan) as converter:
+        while True:
+            chunk = list(itertools.islice(reader, chunk_rows))
+            if not chunk:
+                break
+            values = [row[i] for row in chunk for i in indexes if i < len(row)]
+            mapping = converter.lookup(values)
+            converter.values += len(values)
+            for row in chunk:
+                for i in indexes:
+                    if i < len(row):
+                        row[i] = mapping[row[i]]
+            writer.writerows(chunk)
+            rows += len(chunk)
+
+    return TabularResult(
+        rows,
+        converter.values,
+        converter.converted,
+        time.perf_counter() - start,
+    )
+
+
+def convert_jsonl(
+    src: TextIO,
+    dst: TextIO,
+    fields: Union[Sequence[str], Mapping[str, str]],
+    mode: str = "roman",
+    backend: str = "trie",
+    workers: int = 1,
+    chunk_rows: int = 8192,
+    prescan: bool = False,
+) -> TabularResult:
+    """
+    Copy JSON Lines (NDJSON) records from `src` to `dst`, converting the
+    named top-level `fields` of each record.
+
+    `fields` is a list of names converted with `mode`, or a mapping from
+    each name to its own mode (such as `{"name": "roman", "legacy":
+    "preeti"}`). Field values that are not strings are kept as they are.
+    Records are read and written `chunk_rows` lines at a time, in order.
+    Output records are compact and keep non-ASCII text unescaped. Records
+    without any of the fields, and blank lines, are copied unchanged.
+    Raises ValueError for a line that is not a JSON object.
+    """
+    if not isinstance(fields, Mapping):
+        fields = dict.fromkeys(fields, mode)
+    start = time.perf_counter()
+    encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+    decode = json.JSONDecoder().decode
+
+    converters: Dict[str, ColumnConverter] = {}
+    rows = 0
+    # Lines read before the current chunk, for error messages
+    line_number = 0
+    try:
+        for field_mode in dict.fromkeys(fields.values()):
+            converters[field_mode] = ColumnConverter(
+                field_mode, backend, workers=workers, prescan=prescan
+            )
+        # Converter of each field, grouped by mode so that each mode looks
+        # up the values of all its fields at once
+        by_mode = [
+            (converters[field_mode], [f for f, m in fields.items() if m == field_mode])
+            for field_mode in converters
+        ]
+
+        while True:
+            lines = list(itertools.islice(src, chunk_rows))
+            if not lines:
+                break
+            records = []
+            for offset, line in enumerate(lines):
+                if not line.strip():
+                    records.append(None)
+                    continue
+                try:
+                    record = decode(line)
+                except ValueError as exc:
+                    raise ValueError(
+                        f"line {line_number + offset + 1}: {exc}"
+                    ) from None
+                if not isinstance(record, dict):
+                    raise ValueError(
+                        f"line {line_number + offset + 1}: expected a JSON object"
+                    )
+                records.append(record)
+            line_number += len(lines)
+            rows += len(lines) - records.count(None)
+
+            changed = [False] * len(records)
+            for converter, names in by_mode:
+                values = []
+                for record in records:
+                    if record is not None:
+                        for name in names:
+                            value = record.get(name)
+                            if value.__class__ is str:
+                                values.append(value)
+                converter.values += len(values)
+                mapping = converter.lookup(values)
+                for index, record in enumerate(records):
+                    if record is not None:
+                        for name in names:
+                            value = record.get(name)
+                            if value.__class__ is str:
+                                record[name] = mapping[value]
+                                changed[index] = True
+
+            out = []
+            for line, record, is_changed in zip(lines, records, changed):
+                if is_changed:
+                    out.append(encode(record) + "\n")
+                else:
+                    out.append(line if line.endswith("\n") else line + "\n")
+            dst.write("".join(out))
+    finally:
+        for converter in converters.values():
+            converter.close()
+
+    return TabularResult(
+        rows,
+        sum(converter.values for converter in converters.values()),
+        sum(converter.converted for converter in converters.values()),
+        time.perf_counter() - start,
+    )
+
+
+def convert_parquet(
+    src: str,
+    dst: str,
+    columns: Sequence[str],
+    mode: str = "roman",
+    backend: str = "trie",
+    workers: int = 1,
+    chunk_rows: int = 65536,
+    prescan: bool = False,
+) -> TabularResult:
+    """
+    Write a copy of the Parquet file `src` to `dst` with the named string
+    `columns` converted, `chunk_rows` rows at a time. Requires pyarrow.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as exc:
+        raise ImportError("convert_parquet requires pyarrow") from exc
+
+    start = time.perf_counter()
+    source = pq.ParquetFile(src)
+    schema = source.schema_arrow
+    indexes = _column_indexes(schema.names, columns)
+    rows = 0
+    with ColumnConverter(mode, backend, workers=workers, prescan=prescan) as converter:
+        with pq.ParquetWriter(dst, schema) as writer:
+            for batch in source.iter_batches(batch_size=chunk_rows):
+                arrays = list(batch.columns)
+                for i in indexes:
+                    arrays[i] = converter.convert_column(arrays[i])
+                writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=schema))
+                rows += batch.num_rows
+
+    return TabularResult(
+        rows,
+        converter.values,
+        converter.converted,
+        time.perf_counter() - start,
+    )
@@ -1,85 +1,55 @@
-from dataclasses import dataclass
-from typing import List
+import re
+from typing import Iterator, List, NamedTuple
 
 
-@dataclass
-class Token:
+class Token(NamedTuple):
     value: str
     type: str  # 'ROMAN', 'BLOCK', 'PUNCTUATION', 'UNKNOWN', 'LITERAL', 'NUMBER'
 
 
+# One alternation per mode, tried in priority order at each position:
+# ellipsis, escaped brace `{{`, block `{content}`, stray brace, number.
+# Each alternative has exactly one group holding the token value, so
+# `match.lastindex` selects the token type. Text between matches is ROMAN.
+# The leading lookahead lets the search skip plain text without trying
+# every alternative at each position.
+_BLOCK_PATTERN = re.compile(
+    r"(?=[.{}\d])(?:(\.\.\.)|\{(\{)|\{([^}]*)\}|([{}])|(\d+(?:\.\d+)?))"
+)
+_BLOCK_TYPES = (None, "LITERAL", "LITERAL", "BLOCK", "LITERAL", "NUMBER")
+
+_PLAIN_PATTERN = re.compile(r"(?=[.\d])(?:(\.\.\.)|(\d+(?:\.\d+)?))")
+_PLAIN_TYPES = (None, "LITERAL", "NUMBER")
+
+# Builds a Token without going through the NamedTuple's Python-level __new__
+_new_token = tuple.__new__
+
+
 class Tokenizer:
     def tokenize(self, text: str, use_blocks: bool = True) -> List[Token]:
         """
         Split text into tokens using regex-based matching for robustness.
         """
-        import re
-
-        tokens = []
-        i = 0
-        n = len(text)
-        roman_buffer = []
-
-        # Pre-compile regexes
-        # Note: re.match checks from the beginning of the string (or at pos)
-        re_block = re.compile(r"\{([^}]*)\}")
-        re_number = re.compile(r"\d+(\.\d+)?")
-
-        def flush_roman():
-            if roman_buffer:
-                tokens.append(Token(value="".join(roman_buffer), type="ROMAN"))
-                roman_buffer.clear()
-
-        while i < n:
-            # 1. Check for Ellipsis (Priority)
-            if text.startswith("...", i):
-                flush_roman()
-                tokens.append(Token(value="...", type="LITERAL"))
-                i += 3
-                continue
+        return list(self.iter_tokens(text, use_blocks))
 
-            # 2. Check for Blocks and Braces (if enabled)
-            if use_blocks:
-                # Escaped brace {{
-                if text.startswith("{{", i):
-                    flush_roman()
-                    tokens.append(Token(value="{", type="LITERAL"))
-                    i += 2
-                    continue
-
-                # Block {content}
-                match_block = re_block.match(text, i)
-                if match_block:
-                    flush_roman()
-                    tokens.append(Token(value=match_block.group(1), type="BLOCK"))
-                    i = match_block.end()
-                    continue
-
-                # Unmatched closing brace }
-                if text.startswith("}", i):
-                    flush_roman()
-                    tokens.append(Token(value="}", type="LITERAL"))
-                    i += 1
-                    continue
-
-                # Unmatched opening brace {
-                if text.startswith("{", i):
-                    flush_roman()
-                    tokens.append(Token(value="{", type="LITERAL"))
-                    i += 1
-                    continue
-
-            # 3. Check for Numbers
-            match_number = re_number.match(text, i)
-            if match_number:
-                flush_roman()
-                tokens.append(Token(value=match_number.group(0), type="NUMBER"))
-                i = match_number.end()
-                continue
-
-            # 4. Fallback: Accumulate Roman
-            roman_buffer.append(text[i])
-            i += 1
-
-        flush_roman()
-        return tokens
+    def iter_tokens(self, text: str, use_blocks: bool = True) -> Iterator[Token]:
+        """
+        Lazily yield the tokens of `tokenize`, one precompiled regex search
+        at a time.
+        """
+        if use_blocks:
+            pattern, types = _BLOCK_PATTERN, _BLOCK_TYPES
+        else:
+            pattern, types = _PLAIN_PATTERN, _PLAIN_TYPES
+
+        last = 0
+        for match in pattern.finditer(text):
+            start = match.start()
+            if start > last:
+                yield _new_token(Token, (text[last:start], "ROMAN"))
+            index = match.lastindex
+            yield _new_token(Token, (match.group(index), types[index]))
+            last = match.end()
+
+        if last < len(text):
+            yield _new_token(Token, (text[last:], "ROMAN"))
@@ -1,4 +1,8 @@
-from typing import Dict, Optional, Tuple
+import bisect
+import re
+from array import array
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 
 class TrieNode:
@@ -51,3 +55,372 @@ class Trie:
                 last_match_len = current_len
 
         return last_match_value, last_match_len
+
+    def items(self) -> Iterator[Tuple[str, str]]:
+        """Yield every (key, value) pair stored in the Trie."""
+        stack = [(self.root, "")]
+        while stack:
+            node, prefix = stack.pop()
+            if node.is_end:
+                yield prefix, node.value
+            for char, child in node.children.items():
+                stack.append((child, prefix + char))
+
+    def compile(self) -> "CompiledTrie":
+        """Freeze the Trie into a flat transition table for fast scanning."""
+        return CompiledTrie(self)
+
+    def compile_regex(self) -> "RegexMatcher":
+        """Compile the Trie into a single regex alternation."""
+        return RegexMatcher(self)
+
+    def compact(self) -> "CompactTrie":
+        """Copy the Trie into a read-only CompactTrie."""
+        return CompactTrie(self.items())
+
+
+class CompiledTrie:
+    """
+    Read-only, array-backed version of a Trie.
+
+    Nodes are numbered in breadth-first order and stored in two parallel
+    tuples: `transitions[state]` maps a character to the next state and
+    `values[state]` holds the mapped value (None if no key ends there).
+    `scan` walks a whole chunk in a single call instead of one
+    `longest_match` call per output unit. Nothing is modified after
+    construction, so one instance can be shared by any number of threads.
+    """
+
+    __slots__ = ("transitions", "values", "max_key_len")
+
+    def __init__(self, trie: Trie):
+        transitions: List[Dict[str, int]] = []
+        values: List[Optional[str]] = []
+        self.max_key_len = 0
+
+        queue = deque([(trie.root, 0)])
+        while queue:
+            node, depth = queue.popleft()
+            table: Dict[str, int] = {}
+            transitions.append(table)
+            values.append(node.value if node.is_end else None)
+            if node.is_end and depth > self.max_key_len:
+                self.max_key_len = depth
+            for char, child in node.children.items():
+                # Children are numbered in the order they are dequeued
+                table[char] = len(transitions) + len(queue)
+                queue.append((child, depth + 1))
+        self.transitions: Tuple[Dict[str, int], ...] = tuple(transitions)
+        self.values: Tuple[Optional[str], ...] = tuple(values)
+
+    def to_trie(self) -> Trie:
+        """Rebuild an equivalent, mutable Trie."""
+        trie = Trie()
+        nodes = [trie.root] + [TrieNode() for _ in self.transitions[1:]]
+        for state, table in enumerate(self.transitions):
+            node = nodes[state]
+            if self.values[state] is not None:
+                node.is_end = True
+                node.value = self.values[state]
+            for char, child in table.items():
+                node.children[char] = nodes[child]
+        return trie
+
+    def items(self) -> Iterator[Tuple[str, str]]:
+        """Yield every (key, value) pair, like Trie.items."""
+        stack = [(0, "")]
+        while stack:
+            state, prefix = stack.pop()
+            if self.values[state] is not None:
+                yield prefix, self.values[state]
+            for char, child in self.transitions[state].items():
+                stack.append((child, prefix + char))
+
+    def longest_match(
+        self, text: str, start_index: int = 0
+    ) -> Tuple[Optional[str], int]:
+        """Same contract as Trie.longest_match."""
+        transitions = self.transitions
+        values = self.values
+        state = 0
+        last_match_value = None
+        last_match_len = 0
+        i = start_index
+        n = len(text)
+
+        while i < n:
+            state = transitions[state].get(text[i])
+            if state is None:
+                break
+            i += 1
+            if values[state] is not None:
+                last_match_value = values[state]
+                last_match_len = i - start_index
+
+        return last_match_value, last_match_len
+
+    def scan(self, text: str) -> List[str]:
+        """
+        Greedily segment the whole text and return the output segments.
+        Characters without a (non-empty) match are passed through as-is,
+        exactly like the per-position loop in Engine.
+        """
+        transitions = self.transitions
+        values = self.values
+        root = transitions[0]
+        result: List[str] = []
+        append = result.append
+        i = 0
+        n = len(text)
+
+        while i < n:
+            state = root.get(text[i])
+            if state is None:
+                append(text[i])
+                i += 1
+                continue
+
+            j = i + 1
+            match_value = values[state]
+            match_end = j
+            table = transitions[state]
+            while table and j < n:
+                state = table.get(text[j])
+                if state is None:
+                    break
+                j += 1
+                if values[state] is not None:
+                    match_value = values[state]
+                    match_end = j
+                table = transitions[state]
+
+            if match_value:
+                append(match_value)
+                i = match_end
+            else:
+                append(text[i])
+                i += 1
+
+        return result
+
+
+class CompactTrie:
+    """
+    Read-only trie stored in a few flat arrays, for large key sets.
+
+    A Trie spends a Python object and a dict on every node; with hundreds
+    of thousands of keys that is gigabytes. Here nodes are numbered in
+    breadth-first order, so the children of a node are consecutive and
+    the node reached by edge `i` is simply `i + 1`:
+
+    - `labels`: the edge characters of all nodes, one string, each node's
+      edges sorted and contiguous;
+    - `offsets[state]` to `offsets[state + 1]`: that node's edges;
+    - `value_ids[state]`: index into `value_table`, or -1 if no key ends
+      at the node. Equal values are stored once.
+
+    An edge is found with `labels.find(char, start, end)`, which searches
+    the node's few edges in C. `longest_match` and `scan` have the same
+    contracts as on Trie and CompiledTrie.
+    """
+
+    __slots__ = ("labels", "offsets", "value_ids", "value_table", "max_key_len")
+
+    def __init__(self, items: Iterable[Tuple[str, str]] = ()):
+        entries = dict(items)
+        keys = sorted(entries)
+        labels: List[str] = []
+        self.offsets = array("i", [0])
+        self.value_ids = array("i")
+        self.value_table: List[str] = []
+        self.max_key_len = max(map(len, keys), default=0)
+        value_index: Dict[str, int] = {}
+
+        # Each queued node is the run keys[lo:hi] sharing a prefix of
+        # length `depth`. Sorted keys keep every child's run contiguous.
+        queue = deque([(0, len(keys), 0)])
+        while queue:
+            lo, hi, depth = queue.popleft()
+            value_id = -1
+            if lo < hi and len(keys[lo]) == depth:
+                value = entries[keys[lo]]
+                value_id = value_index.setdefault(value, len(self.value_table))
+                if value_id == len(self.value_table):
+                    self.value_table.append(value)
+                lo += 1
+            self.value_ids.append(value_id)
+
+            while lo < hi:
+                key = keys[lo]
+                char = key[depth]
+                if char == "\U0010ffff":
+                    end = hi
+                else:
+                    # The first key after every key with this next character
+                    bound = key[:depth] + chr(ord(char) + 1)
+                    end = bisect.bisect_left(keys, bound, lo, hi)
+                labels.append(char)
+                queue.append((lo, end, depth + 1))
+                lo = end
+            self.offsets.append(len(labels))
+
+        self.labels = "".join(labels)
+
+    def __len__(self) -> int:
+        return sum(1 for value_id in self.value_ids if value_id >= 0)
+
+    def items(self) -> Iterator[Tuple[str, str]]:
+        """Yield every (key, value) pair, like Trie.items."""
+        stack = [(0, "")]
+        while stack:
+            state, prefix = stack.pop()
+            value_id = self.value_ids[state]
+            if value_id >= 0:
+                yield prefix, self.value_table[value_id]
+            for edge in range(self.offsets[state], self.offsets[state + 1]):
+                stack.append((edge + 1, prefix + self.labels[edge]))
+
+    def to_trie(self) -> Trie:
+        """Rebuild an equivalent, mutable Trie."""
+        trie = Trie()
+        for key, value in self.items():
+            trie.add(key, value)
+        return trie
+
+    def longest_match(
+        self, text: str, start_index: int = 0
+    ) -> Tuple[Optional[str], int]:
+        """Same contract as Trie.longest_match."""
+        find = self.labels.find
+        offsets = self.offsets
+        value_ids = self.value_ids
+        state = 0
+        last_match_id = -1
+        last_match_len = 0
+        i = start_index
+        n = len(text)
+
+        while i < n:
+            edge = find(text[i], offsets[state], offsets[state + 1])
+            if edge < 0:
+                break
+            state = edge + 1
+            i += 1
+            if value_ids[state] >= 0:
+                last_match_id = value_ids[state]
+                last_match_len = i - start_index
+
+        if last_match_id < 0:
+            return None, 0
+        return self.value_table[last_match_id], last_match_len
+
+    def scan(self, text: str) -> List[str]:
+        """Same contract as CompiledTrie.scan."""
+        find = self.labels.find
+        offsets = self.offsets
+        value_ids = self.value_ids
+        value_table = self.value_table
+        root_end = offsets[1] if len(offsets) > 1 else 0
+        result: List[str] = []
+        append = result.append
+        i = 0
+        n = len(text)
+
+        while i < n:
+            edge = find(text[i], 0, root_end)
+            if edge < 0:
+                append(text[i])
+                i += 1
+                continue
+
+            state = edge + 1
+            j = i + 1
+            match_id = value_ids[state]
+            match_end = j
+            while j < n:
+                edge = find(text[j], offsets[state], offsets[state + 1])
+                if edge < 0:
+                    break
+                state = edge + 1
+                j += 1
+                if value_ids[state] >= 0:
+                    match_id = value_ids[state]
+                    match_end = j
+
+            if match_id >= 0 and value_table[match_id]:
+                append(value_table[match_id])
+                i = match_end
+            else:
+                append(text[i])
+                i += 1
+
+        return result
+
+
+class RegexMatcher:
+    """
+    Longest-match segmentation expressed as one compiled regex.
+
+    All keys are literal strings, so the Trie can be written as a single
+    alternation and the scanning loop runs inside the `re` module. The
+    alternation is factored along the Trie (`k(?:h(?:a)?)?` rather than
+    `kha|kh|k`) because `re` tries flat alternatives one by one, which is
+    much slower with ~1,000 keys. Nested greedy `?` groups still prefer
+    the longest key and backtrack to shorter ones.
+    """
+
+    __slots__ = ("pattern", "table", "max_key_len")
+
+    def __init__(self, trie: Trie):
+        self.table: Dict[str, str] = dict(trie.items())
+        if not all(self.table.values()):
+            # The trie path re-scans from the next character after a key
+            # with an empty value, which a single regex pass cannot express
+            raise ValueError("RegexMatcher does not support empty values")
+        self.max_key_len = max(map(len, self.table), default=0)
+
+        if self.table:
+            alternation = self._node_pattern(trie.root) + "|"
+        else:
+            alternation = ""
+        # Any other character falls through as a one-character segment
+        self.pattern = re.compile(alternation + "(?s:.)")
+
+    @classmethod
+    def _node_pattern(cls, node: TrieNode) -> str:
+        leaves = []
+        branches = []
+        for char, child in sorted(node.children.items()):
+            if not child.children:
+                leaves.append(re.escape(char))
+                continue
+            sub_pattern = cls._node_pattern(child)
+            if child.is_end:
+                sub_pattern = f"(?:{sub_pattern})?"
+            branches.append(re.escape(char) + sub_pattern)
+
+        if len(leaves) == 1:
+            branches.append(leaves[0])
+        elif leaves:
+            branches.append("[" + "".join(leaves) + "]")
+
+        if len(branches) == 1:
+            return branches[0]
+        return "(?:" + "|".join(branches) + ")"
+
+    def longest_match(
+        self, text: str, start_index: int = 0
+    ) -> Tuple[Optional[str], int]:
+        """Same contract as Trie.longest_match."""
+        match = self.pattern.match(text, start_index)
+        if match is None:
+            return None, 0
+        value = self.table.get(match.group())
+        if value is None:
+            return None, 0
+        return value, match.end() - start_index
+
+    def scan(self, text: str) -> List[str]:
+        """Same contract as CompiledTrie.scan."""
+        get = self.table.get
+        return [get(segment, segment) for segment in self.pattern.findall(text)]
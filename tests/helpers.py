@@ -0,0 +1,107 @@
+"""
+Set-up and random inputs shared by the test modules.
+
+A test module that builds engines points the rule table cache at a
+temporary directory for its duration:
+
+    setUpModule = use_temp_cache
+    tearDownModule = restore_cache
+"""
+
+import os
+import tempfile
+from unittest import mock
+
+ROMAN_PIECES = [
+    "mero",
+    "naam",
+    "nepaal",
+    "kha",
+    "gyaana",
+    "namaste",
+    "om",
+    "aum",
+    "{english}",
+    "{two words}",
+    "{{",
+    "}",
+    "{",
+    "12",
+    "3.5",
+    "...",
+    ".",
+    "..",
+    "|",
+    " ",
+    " ",
+    "  ",
+    "\n",
+    "\n\n",
+    "\t",
+]
+PREETI_PREFIXES = [
+    "d]/f",
+    "gfd",
+    ";~hLj",
+    "xf]",
+    "g]kfn",
+    "s{",
+    "sf{",
+    "sl",
+    "qm",
+    "Qm",
+    "pm",
+    "em",
+    "km",
+    "m",
+    "cf]",
+    "5'§}",
+    "k|;Ën]",
+    "M",
+    "Ù",
+    "1.5",
+    "...",
+    "{",
+    "}",
+    "l",
+    " ",
+    " ",
+    "  ",
+    "\n",
+    "\n\n",
+]
+
+# Temporary cache directories of the test modules set up so far
+_temp_caches = []
+
+
+def use_temp_cache():
+    """
+    Point the rule table cache at a new temporary directory, so that tests
+    do not write to the user's cache.
+    """
+    tmp = tempfile.TemporaryDirectory()
+    patcher = mock.patch.dict(os.environ, {"NEPALI_UNICODER_CACHE_DIR": tmp.name})
+    patcher.start()
+    _temp_caches.append((tmp, patcher))
+
+
+def restore_cache():
+    """Undo the last `use_temp_cache`."""
+    tmp, patcher = _temp_caches.pop()
+    patcher.stop()
+    tmp.cleanup()
+
+
+def random_text(rng, pieces, length):
+    return "".join(rng.choice(pieces) for _ in range(length))
+
+
+def random_chunks(rng, text):
+    chunks = []
+    i = 0
+    while i < len(text):
+        size = rng.randint(1, 12)
+        chunks.append(text[i : i + size])
+        i += size
+    return chunks
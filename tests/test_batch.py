@@ -0,0 +1,70 @@
+import os
+import random
+import sys
+import unittest
+
+# Add src to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from helpers import (
+    PREETI_PREFIXES,
+    ROMAN_PIECES,
+    random_text,
+    restore_cache,
+    use_temp_cache,
+)
+
+from nepali_unicoder.convert import Converter
+from nepali_unicoder.engine import Engine
+
+setUpModule = use_temp_cache
+tearDownModule = restore_cache
+
+
+class TestTransliterateMany(unittest.TestCase):
+    def check_mode(self, engine, pieces, seed):
+        rng = random.Random(seed)
+        texts = [random_text(rng, pieces, rng.randint(0, 6)) for _ in range(3000)]
+        expected = [engine.transliterate(text) for text in texts]
+        self.assertEqual(engine.transliterate_many(texts), expected)
+        self.assertEqual(engine.transliterate_many(texts, batch_size=7), expected)
+        self.assertEqual(engine.transliterate_many(iter(texts)), expected)
+
+    def test_roman(self):
+        self.check_mode(Engine(), ROMAN_PIECES + ["\x00"], seed=1)
+
+    def test_roman_without_braces(self):
+        pieces = [p for p in ROMAN_PIECES if "{" not in p and "}" not in p]
+        self.check_mode(Engine(), pieces, seed=2)
+
+    def test_preeti(self):
+        self.check_mode(Engine(mode="preeti"), PREETI_PREFIXES + ["\x00"], seed=3)
+
+    def test_word_cache(self):
+        self.check_mode(Engine(word_cache_size=32), ROMAN_PIECES, seed=4)
+
+    def test_edge_cases(self):
+        engine = Engine(mode="preeti")
+        texts = ["", "12", "...", "s{", "", "qm", "\x00s{\x00"]
+        self.assertEqual(
+            engine.transliterate_many(texts),
+            [engine.transliterate(text) for text in texts],
+        )
+        self.assertEqual(engine.transliterate_many([]), [])
+
+    def test_profiling_falls_back(self):
+        engine = Engine()
+        stats = engine.enable_profiling()
+        engine.transliterate_many(["ka", "kha"])
+        self.assertEqual(stats.calls, 2)
+
+    def test_convert_many_single_worker(self):
+        texts = (f"ka {i}" for i in range(10))
+        results = Converter().convert_many(texts, workers=1, chunksize=3)
+        self.assertEqual(
+            list(results), [Converter().convert(f"ka {i}") for i in range(10)]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+# Add src to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from helpers import restore_cache, use_temp_cache
+
+from nepali_unicoder import bench
+
+setUpModule = use_temp_cache
+tearDownModule = restore_cache
+
+
+class TestBench(unittest.TestCase):
+    def test_run_reports_every_stage(self):
+        report = bench.run(size_mb=0.002, repeat=1)
+        results = report["results"]
+        for mode in bench.MODES:
+            self.assertIn(f"{mode}/startup/engine_cold", results)
+            for corpus in ("realistic", "synthetic"):
+                for stage in ("tokenize", "trie_longest_match", "transliterate"):
+                    result = results[f"{mode}/{corpus}/{stage}"]
+                    self.assertGreater(result["seconds"], 0)
+                    self.assertGreater(result["chars_per_sec"], 0)
+        self.assertIn("preeti/realistic/post_rules", results)
+        self.assertNotIn("roman/realistic/post_rules", results)
+        self.assertIsNone(results["roman/startup/load_rules"]["chars_per_sec"])
+        json.dumps(report)
+
+    def test_cold_engine_restores_environment(self):
+        for value in (None, "0"):
+            env = {} if value is None else {"NEPALI_UNICODER_NO_CACHE": value}
+            with mock.patch.dict(os.environ, env):
+                if value is None:
+                    os.environ.pop("NEPALI_UNICODER_NO_CACHE", None)
+                bench._cold_engine("roman")
+                self.assertEqual(os.environ.get("NEPALI_UNICODER_NO_CACHE"), value)
+
+    def test_only_filter(self):
+        report = bench.run(size_mb=0.002, repeat=1, modes=("roman",), only=["map"])
+        self.assertEqual(
+            sorted(report["results"]), ["roman/realistic/map", "roman/synthetic/map"]
+        )
+
+    def test_compare_flags_regressions(self):
+        base = {"results": {"a": {"seconds": 1.0}, "b": {"seconds": 1.0}}}
+        new = {"results": {"a": {"seconds": 1.5}, "b": {"seconds": 1.05}}}
+        with redirect_stdout(io.StringIO()):
+            self.assertEqual(bench.compare(base, new, threshold=0.1), ["a"])
+
+    def test_main_json_and_compare(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "out.json")
+            with redirect_stdout(io.StringIO()):
+                args = ["--kb", "2", "--repeat", "1", "--mode", "preeti"]
+                self.assertEqual(bench.main(args + ["--json", path]), 0)
+                self.assertEqual(bench.main(["--compare", path, path]), 0)
+            with open(path, encoding="utf-8") as f:
+                self.assertIn("meta", json.load(f))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,141 @@
+import json
+import os
+import random
+import sys
+import tempfile
+import unittest
+
+# Add src to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from helpers import (
+    PREETI_PREFIXES,
+    ROMAN_PIECES,
+    random_text,
+    restore_cache,
+    use_temp_cache,
+)
+
+from nepali_unicoder.bulk import JOURNAL_NAME, convert_dir, iter_mapped_text
+from nepali_unicoder.engine import Engine
+
+setUpModule = use_temp_cache
+tearDownModule = restore_cache
+
+
+def write(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write(text)
+
+
+def read(path):
+    with open(path, encoding="utf-8", newline="") as f:
+        return f.read()
+
+
+class TestConvertDir(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.src = os.path.join(self.tmp.name, "src")
+        self.dst = os.path.join(self.tmp.name, "dst")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def check_mode(self, mode, pieces, workers):
+        rng = random.Random(mode)
+        texts = {
+            "a.txt": random_text(rng, pieces, 3000),
+            os.path.join("sub", "b.txt"): random_text(rng, pieces + ["\r\n"], 2000),
+            "empty.txt": "",
+        }
+        for name, text in texts.items():
+            write(os.path.join(self.src, name), text)
+        write(os.path.join(self.src, "skip.csv"), "not matched")
+
+        result = convert_dir(
+            self.src, self.dst, mode=mode, workers=workers, piece_size=1000
+        )
+        self.assertEqual((result.files, result.skipped), (3, 0))
+        engine = Engine(mode=mode)
+        for name, text in texts.items():
+            converted = read(os.path.join(self.dst, name))
+            self.assertEqual(converted, engine.transliterate(text), name)
+        self.assertFalse(os.path.exists(os.path.join(self.dst, "skip.csv")))
+
+    def test_roman(self):
+        self.check_mode("roman", ROMAN_PIECES + ["नेपाल"], workers=1)
+
+    def test_preeti(self):
+        self.check_mode("preeti", PREETI_PREFIXES, workers=1)
+
+    def test_preeti_pool(self):
+        self.check_mode("preeti", PREETI_PREFIXES, workers=2)
+
+    def test_resume(self):
+        write(os.path.join(self.src, "a.txt"), "ka")
+        write(os.path.join(self.src, "b.txt"), "kha")
+        convert_dir(self.src, self.dst, workers=1)
+
+        result = convert_dir(self.src, self.dst, workers=1)
+        self.assertEqual((result.files, result.skipped), (0, 2))
+
+        # A changed source, a lost output and a torn journal line
+        write(os.path.join(self.src, "a.txt"), "ga")
+        os.remove(os.path.join(self.dst, "b.txt"))
+        with open(os.path.join(self.dst, JOURNAL_NAME), "a") as f:
+            f.write('{"path": "c.tx')
+        result = convert_dir(self.src, self.dst, workers=1)
+        self.assertEqual((result.files, result.skipped), (2, 0))
+        self.assertEqual(read(os.path.join(self.dst, "a.txt")), "ग")
+
+        result = convert_dir(self.src, self.dst, workers=1, resume=False)
+        self.assertEqual(result.files, 2)
+        with open(os.path.join(self.dst, JOURNAL_NAME)) as f:
+            self.assertEqual(len([json.loads(line) for line in f]), 2)
+
+    def test_unsplit_files_are_reported(self):
+        # Single line breaks split Preeti text; one long line does not
+        lines = "d]/f gfd ;~hLj xf]\ng]kfn sf{ qm km cf]\n" * 100
+        write(os.path.join(self.src, "lines.txt"), lines)
+        write(os.path.join(self.src, "line.txt"), lines.replace("\n", " "))
+        result = convert_dir(
+            self.src, self.dst, mode="preeti", workers=1, piece_size=500
+        )
+        self.assertEqual(result.unsplit, ["line.txt"])
+        engine = Engine(mode="preeti")
+        for name in ("lines.txt", "line.txt"):
+            converted = read(os.path.join(self.dst, name))
+            source = read(os.path.join(self.src, name))
+            self.assertEqual(converted, engine.transliterate(source), name)
+
+    def test_prescan(self):
+        text = "g]kfn किताब sf]\n" * 50
+        write(os.path.join(self.src, "a.txt"), text)
+        result = convert_dir(self.src, self.dst, mode="preeti", workers=1)
+        self.assertEqual(result.files, 1)
+
+        # Prescanning changes the output, so the file is converted again
+        result = convert_dir(self.src, self.dst, mode="preeti", workers=1, prescan=True)
+        self.assertEqual((result.files, result.skipped), (1, 0))
+        engine = Engine(mode="preeti", prescan=True)
+        self.assertEqual(
+            read(os.path.join(self.dst, "a.txt")), engine.transliterate(text)
+        )
+
+        with self.assertRaises(ValueError):
+            convert_dir(self.src, self.dst, mode="unicode-roman", prescan=True)
+
+    def test_mapped_text_keeps_multibyte_characters(self):
+        text = "क" * 100
+        path = os.path.join(self.tmp.name, "k.txt")
+        write(path, text)
+        # 3-byte characters in 7-byte windows
+        pieces = list(iter_mapped_text(path, piece_size=7))
+        self.assertGreater(len(pieces), 1)
+        self.assertEqual("".join(pieces), text)
+
+
+if __name__ == "__main__":
+    unittest.main()
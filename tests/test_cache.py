@@ -0,0 +1,135 @@
+import os
+import pickle
+import sys
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+# Add src to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from helpers import restore_cache, use_temp_cache
+
+from nepali_unicoder import cache
+from nepali_unicoder.convert import Converter, convert
+from nepali_unicoder.engine import Engine
+from nepali_unicoder.reverse import ReverseEngine
+
+setUpModule = use_temp_cache
+tearDownModule = restore_cache
+
+
+class TestLoadCached(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.source = os.path.join(self.tmp.name, "rules.json")
+        with open(self.source, "w") as f:
+            f.write('{"k": "क्"}')
+        patcher = mock.patch.dict(
+            os.environ, {"NEPALI_UNICODER_CACHE_DIR": self.tmp.name}
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.builds = 0
+
+    def build(self):
+        self.builds += 1
+        return {"value": self.builds}
+
+    def test_second_load_uses_cache(self):
+        first = cache.load_cached("test", [self.source], self.build)
+        second = cache.load_cached("test", [self.source], self.build)
+        self.assertEqual(first, second)
+        self.assertEqual(self.builds, 1)
+
+    def test_changed_source_rebuilds(self):
+        cache.load_cached("test", [self.source], self.build)
+        with open(self.source, "w") as f:
+            f.write('{"k": "ख्"}')
+        result = cache.load_cached("test", [self.source], self.build)
+        self.assertEqual(result, {"value": 2})
+
+    def test_corrupt_cache_rebuilds(self):
+        cache.load_cached("test", [self.source], self.build)
+        for name in os.listdir(self.tmp.name):
+            if name.endswith(".pickle"):
+                with open(os.path.join(self.tmp.name, name), "wb") as f:
+                    f.write(b"not a pickle")
+        result = cache.load_cached("test", [self.source], self.build)
+        self.assertEqual(result, {"value": 2})
+
+    def test_version_mismatch_rebuilds(self):
+        cache.load_cached("test", [self.source], self.build)
+        for name in os.listdir(self.tmp.name):
+            if name.endswith(".pickle"):
+                path = os.path.join(self.tmp.name, name)
+                with open(path, "rb") as f:
+                    payload = pickle.load(f)
+                payload["version"] = -1
+                with open(path, "wb") as f:
+                    pickle.dump(payload, f)
+        result = cache.load_cached("test", [self.source], self.build)
+        self.assertEqual(result, {"value": 2})
+
+    def test_changed_code_rebuilds(self):
+        cache.load_cached("test", [self.source], self.build)
+        with mock.patch.object(cache, "code_hash", return_value="new code"):
+            result = cache.load_cached("test", [self.source], self.build)
+        self.assertEqual(result, {"value": 2})
+
+    def test_unwritable_cache_warns(self):
+        # A file where the cache directory should be
+        path = os.path.join(self.tmp.name, "file")
+        with open(path, "w"):
+            pass
+        with mock.patch.dict(os.environ, {"NEPALI_UNICODER_CACHE_DIR": path}):
+            with self.assertWarns(RuntimeWarning):
+                result = cache.load_cached("test", [self.source], self.build)
+        self.assertEqual(result, {"value": 1})
+
+    def test_unpicklable_artifact_raises(self):
+        with self.assertRaises(TypeError):
+            cache.load_cached("test", [self.source], threading.Lock)
+        self.assertEqual(os.listdir(self.tmp.name), ["rules.json"])
+
+    def test_disabled(self):
+        with mock.patch.dict(os.environ, {"NEPALI_UNICODER_NO_CACHE": "1"}):
+            cache.load_cached("test", [self.source], self.build)
+            cache.load_cached("test", [self.source], self.build)
+        self.assertEqual(self.builds, 2)
+
+    def test_cached_engine_matches_fresh(self):
+        for mode in ("roman", "preeti"):
+            cold = Engine(mode=mode)
+            warm = Engine(mode=mode)
+            self.assertEqual(warm.post_rules, cold.post_rules)
+            self.assertEqual(dict(warm.trie.items()), dict(cold.trie.items()))
+            self.assertEqual(
+                warm.transliterate("s{sf mero naam"),
+                cold.transliterate("s{sf mero naam"),
+            )
+
+
+class TestSharedEngine(unittest.TestCase):
+    def test_shared_instance(self):
+        self.assertIs(Engine.shared("preeti"), Engine.shared("preeti"))
+        self.assertIsNot(Engine.shared("preeti"), Engine.shared("roman"))
+
+    def test_converters_share_engine(self):
+        self.assertIs(Converter().engine, Converter().engine)
+        self.assertIs(Converter(mode="preeti").engine, Engine.shared("preeti"))
+
+    def test_private_engine(self):
+        converter = Converter(mode="preeti", shared=False)
+        self.assertIsNot(converter.engine, Engine.shared("preeti"))
+        self.assertIs(converter.engine, converter.engine)
+        self.assertEqual(converter.convert("g]kfn"), convert("g]kfn", mode="preeti"))
+        reverse = Converter(mode="unicode-roman", shared=False).engine
+        self.assertIsInstance(reverse, ReverseEngine)
+        self.assertIsNot(reverse, Engine.shared("unicode-roman"))
+
+
+if __name__ == "__main__":
+    unittest.main()
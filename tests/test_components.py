@@ -1,13 +1,15 @@
 import os
+import random
+import re
 import sys
 import unittest
 
 # Add src to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
 
-from nepali_unicoder.loader import RuleLoader
+from nepali_unicoder.loader import PreetiLoader, RuleLoader
 from nepali_unicoder.tokenizer import Tokenizer
-from nepali_unicoder.trie import Trie
+from nepali_unicoder.trie import CompactTrie, Trie
 
 
 class TestTrie(unittest.TestCase):
@@ -29,6 +31,127 @@ class TestTrie(unittest.TestCase):
         self.assertEqual(length, 0)
 
 
+def reference_scan(trie, text):
+    """Per-position longest_match loop, as originally done in Engine."""
+    result = []
+    idx = 0
+    while idx < len(text):
+        match_val, match_len = trie.longest_match(text, idx)
+        if match_val:
+            result.append(match_val)
+            idx += match_len
+        else:
+            result.append(text[idx])
+            idx += 1
+    return result
+
+
+class TestCompiledTrie(unittest.TestCase):
+    def test_longest_match(self):
+        trie = Trie()
+        trie.add("k", "क्")
+        trie.add("kha", "ख")
+        compiled = trie.compile()
+
+        self.assertEqual(compiled.longest_match("kha"), ("ख", 3))
+        self.assertEqual(compiled.longest_match("kh"), ("क्", 1))
+        self.assertEqual(compiled.longest_match("xkha", 1), ("ख", 3))
+        self.assertEqual(compiled.longest_match("z"), (None, 0))
+        self.assertEqual(compiled.max_key_len, 3)
+
+    def test_to_trie(self):
+        trie = RuleLoader().load()
+        rebuilt = trie.compile().to_trie()
+        self.assertEqual(dict(rebuilt.items()), dict(trie.items()))
+
+    def test_empty_value_passes_through(self):
+        trie = Trie()
+        trie.add("x", "")
+        self.assertEqual(trie.compile().scan("xy"), ["x", "y"])
+
+    def test_scan_matches_reference(self):
+        rng = random.Random(42)
+        for loader in (RuleLoader(), PreetiLoader()):
+            trie = loader.load()
+            compiled = trie.compile()
+            regex = trie.compile_regex()
+            alphabet = sorted({c for key, _ in trie.items() for c in key})
+            alphabet += [" ", "?", "\n", "\u0915"]
+            for _ in range(300):
+                text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 40)))
+                expected = reference_scan(trie, text)
+                self.assertEqual(compiled.scan(text), expected)
+                self.assertEqual("".join(regex.scan(text)), "".join(expected))
+
+
+class TestCompactTrie(unittest.TestCase):
+    def test_longest_match(self):
+        compact = CompactTrie([("k", "क्"), ("kha", "ख"), ("kha", "ख"), ("ga", "ग")])
+        self.assertEqual(len(compact), 3)
+        self.assertEqual(compact.longest_match("kha"), ("ख", 3))
+        self.assertEqual(compact.longest_match("kh"), ("क्", 1))
+        self.assertEqual(compact.longest_match("xkha", 1), ("ख", 3))
+        self.assertEqual(compact.longest_match("z"), (None, 0))
+        self.assertEqual(compact.max_key_len, 3)
+        self.assertEqual(CompactTrie().scan("ab"), ["a", "b"])
+
+    def test_loaders(self):
+        for loader in (RuleLoader(), PreetiLoader()):
+            trie = loader.load()
+            compact = loader.load(compact=True)
+            self.assertIsInstance(compact, CompactTrie)
+            self.assertEqual(dict(compact.items()), dict(trie.items()))
+            self.assertEqual(dict(trie.compact().to_trie().items()), dict(trie.items()))
+            self.assertEqual(dict(trie.compile().items()), dict(trie.items()))
+
+    def test_matches_trie(self):
+        rng = random.Random(7)
+        for loader in (RuleLoader(), PreetiLoader()):
+            trie = loader.load()
+            compact = trie.compact()
+            alphabet = sorted({c for key, _ in trie.items() for c in key})
+            alphabet += [" ", "?", "\u0915", "\U0010ffff"]
+            for _ in range(300):
+                text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 40)))
+                start = rng.randint(0, len(text))
+                self.assertEqual(
+                    compact.longest_match(text, start), trie.longest_match(text, start)
+                )
+                self.assertEqual(compact.scan(text), reference_scan(trie, text))
+
+    def test_empty_value_passes_through(self):
+        self.assertEqual(CompactTrie([("x", "")]).scan("xy"), ["x", "y"])
+
+
+class TestRegexMatcher(unittest.TestCase):
+    def test_longest_match(self):
+        trie = Trie()
+        trie.add("k", "क्")
+        trie.add("kha", "ख")
+        trie.add("a.b", "x")
+        regex = trie.compile_regex()
+
+        self.assertEqual(regex.longest_match("kha"), ("ख", 3))
+        self.assertEqual(regex.longest_match("kh"), ("क्", 1))
+        self.assertEqual(regex.longest_match("z"), (None, 0))
+        # Keys are escaped, not treated as patterns
+        self.assertEqual(regex.scan("a.b acb"), ["x", " ", "a", "c", "b"])
+
+    def test_empty_value_rejected(self):
+        trie = Trie()
+        trie.add("x", "")
+        with self.assertRaises(ValueError):
+            trie.compile_regex()
+
+
+class TestTrieItems(unittest.TestCase):
+    def test_items(self):
+        trie = Trie()
+        trie.add("k", "क्")
+        trie.add("ka", "क")
+        self.assertEqual(dict(trie.items()), {"k": "क्", "ka": "क"})
+
+
 class TestTokenizer(unittest.TestCase):
     def test_tokenize(self):
         tokenizer = Tokenizer()
@@ -52,6 +175,74 @@ class TestTokenizer(unittest.TestCase):
         self.assertEqual(tokens[0].type, "LITERAL")
 
 
+def reference_tokenize(text, use_blocks=True):
+    """Character-by-character tokenizer, as originally written."""
+    tokens = []
+    roman = []
+    i = 0
+
+    def flush():
+        if roman:
+            tokens.append(("".join(roman), "ROMAN"))
+            roman.clear()
+
+    while i < len(text):
+        block = re.match(r"\{([^}]*)\}", text[i:]) if use_blocks else None
+        number = re.match(r"\d+(\.\d+)?", text[i:])
+        if text.startswith("...", i):
+            flush()
+            tokens.append(("...", "LITERAL"))
+            i += 3
+        elif use_blocks and text.startswith("{{", i):
+            flush()
+            tokens.append(("{", "LITERAL"))
+            i += 2
+        elif block:
+            flush()
+            tokens.append((block.group(1), "BLOCK"))
+            i += block.end()
+        elif use_blocks and text[i] in "{}":
+            flush()
+            tokens.append((text[i], "LITERAL"))
+            i += 1
+        elif number:
+            flush()
+            tokens.append((number.group(0), "NUMBER"))
+            i += number.end()
+        else:
+            roman.append(text[i])
+            i += 1
+    flush()
+    return tokens
+
+
+class TestTokenizerParity(unittest.TestCase):
+    PIECES = ["ka", "mero ", "{", "}", "{{", "}}", ".", "...", "1", "23", "4.5", " "]
+
+    def test_matches_reference(self):
+        tokenizer = Tokenizer()
+        rng = random.Random(7)
+        for _ in range(3000):
+            text = "".join(rng.choice(self.PIECES) for _ in range(rng.randint(0, 10)))
+            for use_blocks in (True, False):
+                self.assertEqual(
+                    tokenizer.tokenize(text, use_blocks),
+                    reference_tokenize(text, use_blocks),
+                    (text, use_blocks),
+                )
+
+    def test_empty_block(self):
+        tokens = Tokenizer().tokenize("a{}b")
+        self.assertEqual(tokens, [("a", "ROMAN"), ("", "BLOCK"), ("b", "ROMAN")])
+
+    def test_iter_tokens_is_lazy(self):
+        tokens = Tokenizer().iter_tokens("ka 12 {x}")
+        self.assertEqual(next(tokens), ("ka ", "ROMAN"))
+        self.assertEqual(
+            list(tokens), [("12", "NUMBER"), (" ", "ROMAN"), ("x", "BLOCK")]
+        )
+
+
 class TestRuleLoader(unittest.TestCase):
     def test_load(self):
         loader = RuleLoader()
@@ -1,11 +1,18 @@
 import os
+import random
 import sys
 import unittest
 
 # Add src to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
 
+from helpers import PREETI_PREFIXES, random_text, restore_cache, use_temp_cache
+
 from nepali_unicoder.convert import Converter
+from nepali_unicoder.engine import Engine
+
+setUpModule = use_temp_cache
+tearDownModule = restore_cache
 
 
 class TestNepaliUnicoder(unittest.TestCase):
@@ -210,5 +217,47 @@ class TestPreetiUnicoder(unittest.TestCase):
         self.assertEqual(self.converter.convert("cf"), "आ")
 
 
+class TestNepaliUnicoderRegexBackend(TestNepaliUnicoder):
+    def setUp(self):
+        self.converter = Converter(backend="regex")
+
+
+class TestPreetiUnicoderRegexBackend(TestPreetiUnicoder):
+    def setUp(self):
+        self.converter = Converter(mode="preeti", backend="regex")
+
+
+class TestNepaliUnicoderCompactBackend(TestNepaliUnicoder):
+    def setUp(self):
+        self.converter = Converter(backend="compact")
+
+
+class TestPreetiUnicoderCompactBackend(TestPreetiUnicoder):
+    def setUp(self):
+        self.converter = Converter(mode="preeti", backend="compact")
+
+
+class TestSingleCharacterTables(unittest.TestCase):
+    def test_numbers(self):
+        engine = Engine()
+        self.assertEqual(engine.transliterate("12.50 ka 7"), "१२.५० क ७")
+        # Digits that are not keys are kept
+        self.assertEqual(engine.transliterate("१२ ٣"), "१२ ٣")
+
+    def test_translated_runs_match_scan(self):
+        engine = Engine(mode="preeti")
+        self.assertIsNotNone(engine._single_table)
+        self.assertIsNone(Engine()._single_table)
+        reference = Engine(mode="preeti")
+        reference._single_table = None
+        rng = random.Random(0)
+        pieces = PREETI_PREFIXES + [".", "..", "....", "12", "a.b", "–", "क"]
+        for _ in range(500):
+            text = random_text(rng, pieces, rng.randint(0, 12))
+            self.assertEqual(
+                engine.transliterate(text), reference.transliterate(text), text
+            )
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,220 @@
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import unittest
+import urllib.request
+
+# Add src to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from helpers import (
+    PREETI_PREFIXES,
+    ROMAN_PIECES,
+    random_text,
+    restore_cache,
+    use_temp_cache,
+)
+
+from nepali_unicoder.dictionary import WordList
+from nepali_unicoder.engine import Engine
+from nepali_unicoder.loader import PreetiLoader, RuleLoader
+from nepali_unicoder.service import make_server
+from nepali_unicoder.trie import Trie
+
+setUpModule = use_temp_cache
+tearDownModule = restore_cache
+
+
+def random_entries(rng, chars, count):
+    entries = {}
+    while len(entries) < count:
+        key = "".join(rng.choice(chars) for _ in range(rng.randint(1, 6)))
+        entries[key] = f"<{key}>"
+    return entries
+
+
+class TestWordList(unittest.TestCase):
+    def test_longest_match_parity(self):
+        rng = random.Random(0)
+        entries = random_entries(rng, "abc", 60)
+        words = WordList(entries)
+        trie = Trie()
+        for key, value in entries.items():
+            trie.add(key, value)
+        for _ in range(2000):
+            text = "".join(rng.choice("abcd") for _ in range(rng.randint(0, 8)))
+            start = rng.randint(0, len(text))
+            self.assertEqual(
+                words.longest_match(text, start), trie.longest_match(text, start)
+            )
+
+    def test_empty(self):
+        self.assertEqual(WordList({}).longest_match("abc"), (None, 0))
+
+
+class TestDictionaryLayers(unittest.TestCase):
+    def assert_parity(self, mode, pieces, seed, **engine_args):
+        """A layered engine converts like one whose Trie has the entries."""
+        rng = random.Random(seed)
+        engine = Engine(mode=mode, **engine_args)
+        chars = sorted(c for c in engine._key_chars if c.isalpha() or c in ";/[]")
+        first = random_entries(rng, chars, 200)
+        second = random_entries(rng, chars, 200)
+        engine.dictionaries.add("first", first)
+        engine.dictionaries.add("second", second)
+
+        trie = (PreetiLoader() if mode == "preeti" else RuleLoader()).load()
+        for key, value in list(first.items()) + list(second.items()):
+            trie.add(key, value)
+        expected = Engine(trie=trie, mode=mode)
+        expected.post_rules = engine.post_rules
+        expected._post_rewriter = engine._post_rewriter
+
+        words = pieces + list(first)[:20] + list(second)[:20]
+        for _ in range(500):
+            text = random_text(rng, words, rng.randint(0, 20))
+            self.assertEqual(
+                engine.transliterate(text), expected.transliterate(text), text
+            )
+
+    def test_roman_parity(self):
+        self.assert_parity("roman", ROMAN_PIECES, seed=1)
+
+    def test_preeti_parity(self):
+        self.assert_parity("preeti", PREETI_PREFIXES, seed=2)
+
+    def test_regex_backend_parity(self):
+        self.assert_parity("roman", ROMAN_PIECES, seed=3, backend="regex")
+
+    def test_word_cache_parity(self):
+        self.assert_parity("roman", ROMAN_PIECES, seed=4, word_cache_size=64)
+
+    def test_add_remove(self):
+        engine = Engine(word_cache_size=16)
+        plain = engine.transliterate("google ma")
+        engine.dictionaries.add("brands", {"google": "गुगल"})
+        self.assertEqual(engine.transliterate("google ma"), "गुगल म")
+        # Later layers take precedence
+        engine.dictionaries.add("override", {"google": "गूगल"})
+        self.assertEqual(engine.transliterate("google"), "गूगल")
+        # Replacing a layer keeps its place
+        engine.dictionaries.add("brands", {"google": "X"})
+        self.assertEqual(engine.dictionaries.names(), ["brands", "override"])
+        self.assertEqual(engine.transliterate("google"), "गूगल")
+        engine.dictionaries.remove("override")
+        self.assertEqual(engine.transliterate("google"), "X")
+        engine.dictionaries.clear()
+        self.assertEqual(engine.transliterate("google ma"), plain)
+        with self.assertRaises(KeyError):
+            engine.dictionaries.remove("brands")
+
+    def test_reload_file(self):
+        engine = Engine()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "words.json")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({"nepal": "नेपाल"}, f)
+            engine.dictionaries.add("file", path)
+            engine.dictionaries.add("inline", {"ktm": "काठमाडौं"})
+            self.assertEqual(engine.transliterate("nepal ktm"), "नेपाल काठमाडौं")
+
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({"nepal": "नेपाल्"}, f)
+            engine.dictionaries.reload()
+            self.assertEqual(engine.transliterate("nepal ktm"), "नेपाल् काठमाडौं")
+
+            # A failed reload keeps the previous entries
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("[]")
+            with self.assertRaises(ValueError):
+                engine.dictionaries.reload("file")
+            self.assertEqual(engine.transliterate("nepal"), "नेपाल्")
+
+    def test_invalid_entries(self):
+        engine = Engine()
+        for entries in ({"two words": "x"}, {"": "x"}, {"ka": ""}, {"क": "x"}):
+            with self.assertRaises(ValueError):
+                engine.dictionaries.add("bad", entries)
+        self.assertEqual(engine.dictionaries.names(), [])
+
+    def test_streaming_and_batch(self):
+        engine = Engine()
+        engine.dictionaries.add("words", {"mero": "M", "naam": "N"})
+        text = "mero naam {mero} naam12 mero\nnaam mero\n" * 50
+        expected = engine.transliterate(text)
+        self.assertIn("M N mero N१२ M", expected)
+        chunks = [text[i : i + 7] for i in range(0, len(text), 7)]
+        self.assertEqual("".join(engine.transliterate_stream(chunks)), expected)
+        lines = text.splitlines()
+        self.assertEqual(
+            engine.transliterate_many(lines),
+            [engine.transliterate(line) for line in lines],
+        )
+
+    def test_swap_during_conversion(self):
+        engine = Engine(word_cache_size=64)
+        text = "mero naam " * 200
+        outputs = {
+            engine.transliterate(text),
+            Engine(trie=self._with({"mero": "A"})).transliterate(text),
+            Engine(trie=self._with({"mero": "B"})).transliterate(text),
+        }
+        seen = set()
+        stop = threading.Event()
+
+        def convert():
+            while not stop.is_set():
+                seen.add(engine.transliterate(text))
+
+        threads = [threading.Thread(target=convert) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for idx in range(200):
+            engine.dictionaries.add("words", {"mero": "AB"[idx % 2]})
+        stop.set()
+        for thread in threads:
+            thread.join()
+        # Every conversion saw one whole set of entries
+        self.assertLessEqual(seen, outputs)
+
+    @staticmethod
+    def _with(entries):
+        trie = RuleLoader().load()
+        for key, value in entries.items():
+            trie.add(key, value)
+        return trie
+
+
+class TestServerReload(unittest.TestCase):
+    def test_reload(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "words.json")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({"nepal": "A"}, f)
+            server = make_server(port=0, quiet=True, dictionaries=[path])
+            engine = server.engines["roman"]
+            thread = threading.Thread(target=server.serve_forever, daemon=True)
+            thread.start()
+            try:
+                url = "http://127.0.0.1:%d" % server.server_address[1]
+                self.assertEqual(engine.transliterate("nepal"), "A")
+                with open(path, "w", encoding="utf-8") as f:
+                    json.dump({"nepal": "B"}, f)
+                request = urllib.request.Request(url + "/reload", data=b"")
+                with urllib.request.urlopen(request) as response:
+                    body = json.loads(response.read())
+                self.assertEqual(body["dictionaries"]["roman"], [path])
+                self.assertEqual(engine.transliterate("nepal"), "B")
+                # The shared engines do not get the server's layers
+                self.assertEqual(len(Engine.shared().dictionaries), 0)
+                self.assertNotIn(Engine.shared().transliterate("nepal"), "AB")
+            finally:
+                server.shutdown()
+                server.server_close()
+
+
+if __name__ == "__main__":
+    unittest.main()
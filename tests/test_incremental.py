@@ -0,0 +1,74 @@
+import os
+import random
+import sys
+import unittest
+
+# Add src to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from helpers import (
+    PREETI_PREFIXES,
+    ROMAN_PIECES,
+    random_text,
+    restore_cache,
+    use_temp_cache,
+)
+
+from nepali_unicoder.engine import Engine
+from nepali_unicoder.incremental import IncrementalTransliterator
+
+setUpModule = use_temp_cache
+tearDownModule = restore_cache
+
+
+class TestIncrementalTransliterator(unittest.TestCase):
+    def check_edits(self, mode, pieces):
+        engine = Engine.shared(mode=mode)
+        rng = random.Random(7)
+        for _ in range(20):
+            session = IncrementalTransliterator(
+                engine, text=random_text(rng, pieces, 30), piece_size=rng.randint(1, 40)
+            )
+            output = session.output
+            for _ in range(30):
+                text = session.text
+                start = rng.randint(0, len(text))
+                end = min(len(text), start + rng.choice([0, 0, 1, 5, 20]))
+                replacement = random_text(rng, pieces, rng.randint(0, 4))
+                change = session.replace(start, end, replacement)
+                # The returned change patches the previous output
+                output = output[: change.start] + change.text + output[change.end :]
+                expected = engine.transliterate(session.text)
+                self.assertEqual(session.output, expected, repr(session.text))
+                self.assertEqual(output, expected)
+
+    def test_roman_random_edits(self):
+        self.check_edits("roman", ROMAN_PIECES)
+
+    def test_preeti_random_edits(self):
+        self.check_edits("preeti", PREETI_PREFIXES + [" ", " ", "\n", "m", "l", "k"])
+
+    def test_typing(self):
+        engine = Engine.shared(mode="roman")
+        text = "mero naam {Python} 12 ... " * 40
+        session = IncrementalTransliterator(engine, piece_size=16)
+        for char in text:
+            session.append(char)
+        self.assertEqual(session.output, engine.transliterate(text))
+        self.assertGreater(len(session._pieces), 1)
+
+    def test_opening_brace_reconverts_the_rest(self):
+        session = IncrementalTransliterator(text="ka kha ga " * 10, piece_size=4)
+        session.insert(3, "{")
+        self.assertEqual(session.output, Engine.shared().transliterate(session.text))
+        session.delete(3, 4)
+        self.assertEqual(session.output, Engine.shared().transliterate(session.text))
+
+    def test_invalid_range(self):
+        session = IncrementalTransliterator(text="ka")
+        with self.assertRaises(ValueError):
+            session.replace(1, 5, "")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+import os
+import random
+import sys
+import unittest
+from unittest import mock
+
+# Add src to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from helpers import (
+    PREETI_PREFIXES,
+    ROMAN_PIECES,
+    random_text,
+    restore_cache,
+    use_temp_cache,
+)
+
+from nepali_unicoder.bench import ROMAN_WORDS
+from nepali_unicoder.engine import Engine
+from nepali_unicoder.lattice import KBestTransliterator
+
+setUpModule = use_temp_cache
+tearDownModule = restore_cache
+
+
+class TestKBestTransliterator(unittest.TestCase):
+    def setUp(self):
+        self.engine = Engine(mode="roman")
+        self.kbest = KBestTransliterator(self.engine)
+
+    def texts(self, k=5):
+        return [c.text for c in self.kbest.transliterate_kbest(self.text, k)]
+
+    def test_top_candidate_is_greedy(self):
+        # Words that run together, like "nepaal" + "aum", can segment better
+        # than greedily; separate them
+        rng = random.Random(0)
+        words = ROMAN_WORDS + ROMAN_PIECES + ["kri", "shree", "facebook"]
+        for _ in range(300):
+            text = " ".join(rng.choice(words) for _ in range(8))
+            best = self.kbest.transliterate_kbest(text, k=3)[0]
+            self.assertEqual(best.text, self.engine.transliterate(text), text)
+
+    def test_pruning_is_exact(self):
+        # The halanta penalty depends on the first character of a suffix,
+        # so pruning suffixes to k must not drop the best one of either kind
+        for word in ("saumoidh", "hgyNaume"):
+            best = self.kbest.transliterate_kbest(word, k=1)
+            self.assertEqual([c.text for c in best], [self.engine.transliterate(word)])
+        rng = random.Random(1)
+        for _ in range(200):
+            word = "".join(rng.choice("aiuemNhgysdkt") for _ in range(8))
+            every = self.kbest.transliterate_kbest(word, k=1000)
+            for k in (1, 3):
+                pruned = self.kbest.transliterate_kbest(word, k=k)
+                self.assertEqual(
+                    [c.score for c in pruned], [c.score for c in every[:k]], word
+                )
+
+    def test_alternatives(self):
+        self.text = "gyaan"
+        texts = self.texts()
+        self.assertEqual(texts[0], "ज्ञान्")
+        self.assertIn("ग्यान्", texts)
+        self.assertEqual(len(texts), len(set(texts)))
+        self.assertLessEqual(len(texts), 5)
+        self.assertEqual(self.texts(k=1), ["ज्ञान्"])
+
+    def test_scores_descend(self):
+        scores = [c.score for c in self.kbest.transliterate_kbest("mero naam", 8)]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+
+    def test_fixed_tokens(self):
+        self.text = "gyaan {gyaan} 3.5"
+        for text in self.texts():
+            self.assertTrue(text.endswith(" gyaan ३.५"), text)
+
+    def test_frequencies_rerank(self):
+        kbest = KBestTransliterator(self.engine, frequencies={"ग्यान्": 10**6})
+        self.assertEqual(kbest.transliterate_kbest("gyaan")[0].text, "ग्यान्")
+
+    def test_dictionary_layers(self):
+        self.text = "gyaan"
+        self.assertEqual(self.texts()[0], "ज्ञान्")
+        self.engine.dictionaries.add("words", {"gyaan": "ग्यान"})
+        self.assertEqual(self.texts()[0], "ग्यान")
+        self.engine.dictionaries.remove("words")
+        self.assertEqual(self.texts()[0], "ज्ञान्")
+
+    def test_word_keys_from_engine(self):
+        # The lattice takes the word map keys from the engine's tables
+        # instead of reading the data files again
+        self.assertIn("google", self.engine._word_keys)
+        with mock.patch(
+            "nepali_unicoder.loader.load_json_data", side_effect=AssertionError
+        ), mock.patch(
+            "nepali_unicoder.loader.RuleLoader.word_maps", side_effect=AssertionError
+        ):
+            best = self.kbest.transliterate_kbest("google", 2)[0]
+        self.assertEqual(best, ("गूगल", 6 * 6 + 6 * self.kbest.word_bonus))
+
+    def test_preeti(self):
+        engine = Engine(mode="preeti")
+        rng = random.Random(1)
+        for _ in range(100):
+            text = random_text(rng, PREETI_PREFIXES, 6)
+            best = engine.transliterate_kbest(text, k=2)[0]
+            self.assertEqual(best.text, engine.transliterate(text), text)
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            self.kbest.transliterate_kbest("mero", k=0)
+        with self.assertRaises(ValueError):
+            KBestTransliterator(mode="unicode-roman")
+
+
+if __name__ == "__main__":
+    unittest.main()
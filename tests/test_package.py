@@ -0,0 +1,115 @@
+import contextlib
+import io
+import os
+import subprocess
+import sys
+import unittest
+
+# Add src to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from helpers import restore_cache, use_temp_cache
+
+import nepali_unicoder
+from nepali_unicoder.__main__ import main
+from nepali_unicoder.convert import Converter
+
+SRC = sys.path[0]
+
+
+setUpModule = use_temp_cache
+tearDownModule = restore_cache
+
+
+def run_python(code):
+    env = dict(os.environ, PYTHONPATH=SRC)
+    result = subprocess.run(
+        [sys.executable, "-c", code], env=env, capture_output=True, text=True
+    )
+    result.check_returncode()
+    return result.stdout
+
+
+class TestPackage(unittest.TestCase):
+    def test_exports(self):
+        self.assertEqual(nepali_unicoder.convert("mero naam"), "मेरो नाम्")
+        self.assertEqual(nepali_unicoder.convert("g]kfn", mode="preeti"), "नेपाल")
+        self.assertIs(nepali_unicoder.Converter, Converter)
+        for name in nepali_unicoder.__all__:
+            self.assertIn(name, dir(nepali_unicoder))
+        with self.assertRaises(AttributeError):
+            nepali_unicoder.missing
+
+    def test_convert_after_submodule_import(self):
+        code = (
+            "import importlib\n"
+            "from nepali_unicoder.convert import Converter\n"
+            "import nepali_unicoder\n"
+            "module = importlib.import_module('nepali_unicoder.convert')\n"
+            "module = importlib.reload(module)\n"
+            "print(Converter().convert('nepaal'))\n"
+            "print(module.Converter().convert('nepaal'))\n"
+            "print(nepali_unicoder.convert('nepaal'))\n"
+        )
+        self.assertEqual(run_python(code).split(), ["नेपाल्"] * 3)
+
+    def test_lazy_imports(self):
+        code = (
+            "import sys\n"
+            "import nepali_unicoder\n"
+            "print(sorted(m for m in sys.modules if m.startswith('nepali')))\n"
+            "nepali_unicoder.Converter()\n"
+            "print('argparse' in sys.modules, 'multiprocessing' in sys.modules)\n"
+        )
+        self.assertEqual(
+            run_python(code).splitlines(),
+            ["['nepali_unicoder', 'nepali_unicoder.convert']", "False False"],
+        )
+
+    def test_converter_loads_on_first_use(self):
+        converter = Converter(mode="preeti", backend="compact")
+        self.assertIsNone(converter._engine)
+        self.assertEqual(converter.convert("g]kfn"), "नेपाल")
+        self.assertIsNotNone(converter._engine)
+        with self.assertRaises(ValueError):
+            Converter(backend="missing")
+
+
+class TestCliFastPath(unittest.TestCase):
+    def run_main(self, argv):
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            main(argv)
+        return out.getvalue()
+
+    def test_matches_full_parser(self):
+        # --prescan goes through argparse; it does not change roman output
+        for text in (["mero", "naam"], ["{Nepal}", "ko", "3.5"]):
+            self.assertEqual(
+                self.run_main(text), self.run_main(["--prescan"] + text), text
+            )
+        self.assertEqual(
+            self.run_main(["--preeti", "d]/f", "gfd"]),
+            Converter(mode="preeti").convert("d]/f gfd") + "\n",
+        )
+
+    def test_stdin(self):
+        code = (
+            "import sys\n"
+            "from nepali_unicoder.__main__ import main\n"
+            "main([])\n"
+            "print('argparse' in sys.modules)\n"
+        )
+        env = dict(os.environ, PYTHONPATH=SRC)
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            input="  mero naam\n",
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        self.assertEqual(result.stdout.splitlines(), ["मेरो नाम्", "False"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+import os
+import sys
+import unittest
+
+# Add src to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from helpers import restore_cache, use_temp_cache
+
+from nepali_unicoder.convert import Converter
+
+setUpModule = use_temp_cache
+tearDownModule = restore_cache
+
+
+class TestConvertMany(unittest.TestCase):
+    def check_mode(self, mode, texts):
+        converter = Converter(mode=mode)
+        expected = [converter.convert(text) for text in texts]
+        for workers in (1, 2):
+            results = list(converter.convert_many(texts, workers=workers, chunksize=3))
+            self.assertEqual(results, expected)
+
+    def test_roman_preserves_order(self):
+        texts = ["mero naam {Sanjeev} ho", "namaste", "", "123.5"] * 10
+        self.check_mode("roman", texts)
+
+    def test_preeti_preserves_order(self):
+        texts = ["s{sf", "sl", "k|;Ën]", "cf]"] * 10
+        self.check_mode("preeti", texts)
+
+    def test_accepts_lazy_iterable(self):
+        converter = Converter()
+        texts = (word for word in ["ka", "kha", "ga"])
+        results = converter.convert_many(texts, workers=2)
+        self.assertEqual(list(results), ["क", "ख", "ग"])
+
+    def test_invalid_workers(self):
+        with self.assertRaises(ValueError):
+            list(Converter().convert_many(["ka"], workers=0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+import itertools
+import os
+import random
+import re
+import sys
+import unittest
+
+# Add src to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from nepali_unicoder.loader import PreetiLoader
+from nepali_unicoder.postrules import (
+    LITERAL,
+    REGEX,
+    RUNS,
+    PostRuleRewriter,
+    barrier_plan,
+    exclude_char,
+    plan_post_rules,
+    required_chars,
+    unbounded_context,
+)
+
+POST_RULES = PreetiLoader().get_post_rules()
+CASCADE = [(re.compile(pattern), replacement) for pattern, replacement in POST_RULES]
+
+
+def cascade(text):
+    """The original rule-by-rule re.sub cascade."""
+    for pattern, replacement in CASCADE:
+        text = pattern.sub(replacement, text)
+    return text
+
+
+def rule_alphabet():
+    chars = set()
+    for pattern, replacement in POST_RULES:
+        chars.update(c for c in pattern + replacement if ord(c) > 127)
+    return sorted(chars) + ["m", "{", "क", "स", " ", "\n", ":"]
+
+
+class TestPlan(unittest.TestCase):
+    def test_kinds(self):
+        plan = {pattern: kind for kind, pattern, _, _ in plan_post_rules(POST_RULES)}
+        self.assertEqual(plan["त्रm"], LITERAL)
+        self.assertEqual(plan["([^उभप]+?)m"], RUNS)
+        self.assertEqual(plan["(त्र|त्त)([^उभप]+?)m"], RUNS)
+        self.assertEqual(plan["ि((.्)*[^्])"], REGEX)
+
+    def test_required_chars(self):
+        self.assertEqual(required_chars("ि((.्)*[^्])"), ["ि"])
+        self.assertEqual(required_chars("(a|b)c"), ["ab", "c"])
+        self.assertEqual(required_chars("x*y?"), [])
+
+    def test_unbounded_context(self):
+        self.assertEqual(unbounded_context("([^उभप]+?)m"), ("m", "उभप"))
+        self.assertIsNone(unbounded_context("ि((.्)*[^्])"))
+
+
+class TestPostRuleRewriter(unittest.TestCase):
+    def setUp(self):
+        self.rewriter = PostRuleRewriter(plan_post_rules(POST_RULES))
+
+    def test_exhaustive_short_strings(self):
+        alphabet = rule_alphabet()
+        for length in range(1, 4):
+            for chars in itertools.product(alphabet, repeat=length):
+                text = "".join(chars)
+                self.assertEqual(self.rewriter.apply(text), cascade(text), repr(text))
+
+    def test_random_long_strings(self):
+        alphabet = rule_alphabet()
+        rng = random.Random(0)
+        for _ in range(3000):
+            text = "".join(rng.choice(alphabet) for _ in range(rng.randint(4, 60)))
+            self.assertEqual(self.rewriter.apply(text), cascade(text), repr(text))
+
+    def test_m_runs(self):
+        for text in ["कखm", "पकखm", "कपखmm", "mm", "त्रकखmगm", "कm ख\nगm प"]:
+            self.assertEqual(self.rewriter.apply(text), cascade(text), repr(text))
+
+    def test_texts_without_triggers_are_unchanged(self):
+        for text in ["", "12.5", "abc, xyz!", "कखग"]:
+            self.assertEqual(self.rewriter.apply(text), cascade(text), repr(text))
+
+    def test_unguarded_plan_is_not_skipped(self):
+        # `x*` can match anywhere, so no input can be skipped
+        rewriter = PostRuleRewriter(plan_post_rules([("x*", "-")]))
+        self.assertEqual(rewriter.apply("ab"), re.sub("x*", "-", "ab"))
+        self.assertEqual(PostRuleRewriter([]).apply("ab"), "ab")
+
+
+class TestBarrierPlan(unittest.TestCase):
+    def test_joined_texts_match_separate_texts(self):
+        rewriter = PostRuleRewriter(barrier_plan(plan_post_rules(POST_RULES), "\x00"))
+        alphabet = rule_alphabet() + ["ः"] * 5
+        rng = random.Random(1)
+        for _ in range(2000):
+            texts = [
+                "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 8)))
+                for _ in range(rng.randint(1, 6))
+            ]
+            joined = rewriter.apply("\x00".join(texts))
+            self.assertEqual(joined.split("\x00"), [cascade(t) for t in texts], texts)
+
+    def test_exclude_char(self):
+        self.assertEqual(exclude_char("a.b", "#"), "a[^\\n\\U00000023]b")
+        self.assertEqual(exclude_char("[^ab]", "#"), "[^\\U00000023ab]")
+        self.assertEqual(exclude_char("[ab]\\1", "#"), "[ab]\\1")
+        self.assertIsNone(exclude_char("a(?=b)", "#"))
+        self.assertIsNone(exclude_char("\\bword", "#"))
+        self.assertIsNone(exclude_char("[#-z]", "#"))
+        self.assertIsNone(exclude_char("\\W", "#"))
+
+
+if __name__ == "__main__":
+    unittest.main()
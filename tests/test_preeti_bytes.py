@@ -0,0 +1,95 @@
+import io
+import mmap
+import os
+import random
+import sys
+import tempfile
+import unittest
+
+# Add src to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from helpers import PREETI_PREFIXES, random_text, restore_cache, use_temp_cache
+
+from nepali_unicoder.engine import Engine
+from nepali_unicoder.preeti_bytes import PreetiBytesEngine
+
+# Every byte that cp1252 defines
+DEFINED = [bytes([b]) for b in range(256) if b not in (0x81, 0x8D, 0x8F, 0x90, 0x9D)]
+
+
+setUpModule = use_temp_cache
+tearDownModule = restore_cache
+
+
+class TestPreetiBytesEngine(unittest.TestCase):
+    def setUp(self):
+        self.engine = Engine(mode="preeti")
+        self.bytes_engine = PreetiBytesEngine(self.engine)
+
+    def check(self, data):
+        expected = self.engine.transliterate(data.decode("cp1252"))
+        self.assertEqual(self.bytes_engine.transliterate(data), expected, data)
+
+    def test_parity(self):
+        rng = random.Random(0)
+        pieces = [p.encode("cp1252") for p in PREETI_PREFIXES] + [
+            b".",
+            b"...",
+            b"1.5",
+            b"2.",
+            b"\n\n",
+        ]
+        for _ in range(500):
+            self.check(b"".join(rng.choices(pieces, k=rng.randint(0, 12))))
+            self.check(b"".join(rng.choices(DEFINED, k=rng.randint(0, 12))))
+
+    def test_dots_and_numbers(self):
+        for data in (b"1.2.3", b"1.2.3.4", b"1...5", b"....", b"12..5", b"a.b", b".5"):
+            self.check(data)
+        self.assertEqual(self.bytes_engine.transliterate(b"1.5 ..."), "ज्ञ.छ ...")
+
+    def test_buffer_types(self):
+        data = "d]/f gfd ;~hLj xf] –".encode("cp1252")
+        expected = self.engine.transliterate(data.decode("cp1252"))
+        for buffer in (bytearray(data), memoryview(data)):
+            self.assertEqual(self.bytes_engine.transliterate(buffer), expected)
+        self.assertEqual(
+            self.bytes_engine.transliterate_bytes(data), expected.encode("utf-8")
+        )
+        self.assertEqual(self.bytes_engine.transliterate(b""), "")
+
+    def test_file(self):
+        rng = random.Random(1)
+        text = random_text(rng, PREETI_PREFIXES + ["\n\n", "m"], 3000)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "in.txt")
+            with open(path, "wb") as f:
+                f.write(text.encode("cp1252"))
+            dst = io.BytesIO()
+            size = self.bytes_engine.transliterate_file(path, dst, piece_size=100)
+            self.assertEqual(size, os.path.getsize(path))
+            self.assertEqual(
+                dst.getvalue().decode("utf-8"), self.engine.transliterate(text)
+            )
+            with open(path, "rb") as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    self.assertEqual(
+                        self.bytes_engine.transliterate(mapped),
+                        self.engine.transliterate(text),
+                    )
+
+    def test_errors(self):
+        with self.assertRaises(UnicodeDecodeError):
+            self.bytes_engine.transliterate(b"s\x81")
+        with self.assertRaises(ValueError):
+            PreetiBytesEngine(Engine.shared())
+        # Other single-byte encodings define every byte
+        latin = PreetiBytesEngine(self.engine, encoding="latin-1")
+        self.assertEqual(
+            latin.transliterate(b"s\x81"), self.engine.transliterate("s\x81")
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
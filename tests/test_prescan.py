@@ -0,0 +1,123 @@
+import os
+import random
+import sys
+import unittest
+
+# Add src to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from helpers import (
+    PREETI_PREFIXES,
+    ROMAN_PIECES,
+    random_text,
+    restore_cache,
+    use_temp_cache,
+)
+
+from nepali_unicoder.bench import PREETI_WORDS, ROMAN_WORDS, make_corpus
+from nepali_unicoder.convert import Converter
+from nepali_unicoder.engine import Engine
+from nepali_unicoder.prescan import Span, classify_spans, detect_mode
+
+UNICODE_PIECES = ["नेपाल", "किताब", "सर्वोच्च", "१२", "१.५", "’", "é", "日本", "–"]
+
+
+setUpModule = use_temp_cache
+tearDownModule = restore_cache
+
+
+class TestClassifySpans(unittest.TestCase):
+    def test_spans(self):
+        self.assertEqual(
+            list(classify_spans("ab नेपाल’s")),
+            [
+                Span("ascii", 0, 3),
+                Span("devanagari", 3, 8),
+                Span("other", 8, 9),
+                Span("ascii", 9, 10),
+            ],
+        )
+        self.assertEqual(list(classify_spans("")), [])
+
+
+class TestDetectMode(unittest.TestCase):
+    def test_corpora(self):
+        self.assertEqual(detect_mode(make_corpus(ROMAN_WORDS, 0.01)), "roman")
+        self.assertEqual(detect_mode(make_corpus(PREETI_WORDS, 0.01)), "preeti")
+        self.assertEqual(detect_mode("The quick brown fox, hello world."), "roman")
+        self.assertEqual(detect_mode("d]/f gfd ;~hLj xf] नेपाल"), "preeti")
+        # Nothing to go by
+        self.assertEqual(detect_mode("नेपाल १२"), "roman")
+
+
+class TestPrescan(unittest.TestCase):
+    def test_roman_parity(self):
+        # Devanagari already passes through roman mode unchanged
+        plain = Engine()
+        prescan = Engine(prescan=True)
+        rng = random.Random(0)
+        for _ in range(1000):
+            text = random_text(rng, ROMAN_PIECES + UNICODE_PIECES, rng.randint(0, 15))
+            self.assertEqual(
+                prescan.transliterate(text), plain.transliterate(text), text
+            )
+
+    def test_preeti_passes_devanagari_through(self):
+        plain = Engine(mode="preeti")
+        prescan = Engine(mode="preeti", prescan=True)
+        self.assertEqual(plain.transliterate("नेपाल किताब"), "नेपाल कतिाब")
+        self.assertEqual(prescan.transliterate("नेपाल किताब"), "नेपाल किताब")
+        self.assertEqual(
+            prescan.transliterate("d]/f gfd किताब ;~hLj"),
+            plain.transliterate("d]/f gfd ") + "किताब" + plain.transliterate(" ;~hLj"),
+        )
+        # Non-ASCII Preeti keys are still converted
+        self.assertEqual(prescan.transliterate("–"), plain.transliterate("–"))
+
+    def test_preeti_keeps_punctuation_in_the_text(self):
+        # A no-break space or other non-letter is not copied through, so
+        # post-rules still reach across it
+        plain = Engine(mode="preeti")
+        prescan = Engine(mode="preeti", prescan=True)
+        for text in ("*\xa0m", "k\u2014m", "s \u2026 m", "x \u0967\u0968 m"):
+            self.assertEqual(prescan.transliterate(text), plain.transliterate(text))
+        self.assertEqual(prescan.transliterate("*\xa0m"), "m\u096e\xa0")
+
+    def test_blocks_are_not_split(self):
+        engine = Engine(prescan=True)
+        self.assertEqual(engine.transliterate("ka {x नेपाल y} ka"), "क x नेपाल y क")
+
+    def test_batch_and_stream(self):
+        for mode, pieces in (("roman", ROMAN_PIECES), ("preeti", PREETI_PREFIXES)):
+            engine = Engine(mode=mode, prescan=True)
+            rng = random.Random(1)
+            texts = [
+                random_text(rng, pieces + UNICODE_PIECES, rng.randint(0, 10))
+                for _ in range(200)
+            ]
+            expected = [engine.transliterate(text) for text in texts]
+            self.assertEqual(engine.transliterate_many(texts, batch_size=16), expected)
+            for text in texts[:50]:
+                chunks = [text[i : i + 5] for i in range(0, len(text), 5)]
+                self.assertEqual(
+                    "".join(engine.transliterate_stream(chunks)),
+                    engine.transliterate(text),
+                )
+
+    def test_converter(self):
+        converter = Converter(mode="preeti", prescan=True)
+        self.assertTrue(converter.engine.prescan)
+        self.assertEqual(
+            list(converter.convert_many(["किताब", "d]/f"], workers=1)),
+            ["किताब", "मेरा"],
+        )
+
+    def test_unsupported(self):
+        with self.assertRaises(ValueError):
+            Engine(prescan=True).enable_profiling()
+        with self.assertRaises(ValueError):
+            Engine.shared(mode="unicode-roman", prescan=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+import contextlib
+import io
+import os
+import random
+import sys
+import unittest
+from unittest import mock
+
+# Add src to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from helpers import PREETI_PREFIXES, ROMAN_PIECES, restore_cache, use_temp_cache
+
+from nepali_unicoder.__main__ import main
+from nepali_unicoder.engine import Engine
+
+setUpModule = use_temp_cache
+tearDownModule = restore_cache
+
+
+class TestProfiling(unittest.TestCase):
+    def assert_parity(self, engine, pieces, seed):
+        reference = Engine(mode=engine.mode)
+        rng = random.Random(seed)
+        engine.enable_profiling()
+        for _ in range(1000):
+            text = "".join(rng.choice(pieces) for _ in range(rng.randint(0, 12)))
+            self.assertEqual(engine.transliterate(text), reference.transliterate(text))
+        return engine.disable_profiling()
+
+    def test_roman_parity(self):
+        stats = self.assert_parity(Engine(), ROMAN_PIECES, seed=1)
+        self.assertEqual(stats.calls, 1000)
+        self.assertGreater(stats.token_counts["ROMAN"], 0)
+        self.assertGreater(stats.token_counts["BLOCK"], 0)
+        self.assertGreater(stats.stage_seconds["number"], 0)
+        self.assertEqual(stats.post_rules, [])
+
+    def test_preeti_parity(self):
+        stats = self.assert_parity(Engine(mode="preeti"), PREETI_PREFIXES, seed=2)
+        self.assertEqual(len(stats.post_rules), len(Engine(mode="preeti").post_rules))
+        self.assertGreater(sum(rule["count"] for rule in stats.post_rules), 0)
+
+    def test_word_cache_engine(self):
+        self.assert_parity(Engine(word_cache_size=8), ROMAN_PIECES, seed=3)
+
+    def test_counters(self):
+        engine = Engine()
+        stats = engine.enable_profiling()
+        engine.transliterate("kha 12 {x}")
+        self.assertEqual(stats.chars, 10)
+        self.assertEqual(
+            dict(stats.token_counts), {"ROMAN": 2, "NUMBER": 1, "BLOCK": 1}
+        )
+        # "kha" is one 3-character key; the spaces match no key
+        self.assertEqual(dict(stats.match_lengths), {3: 1})
+        self.assertEqual(dict(stats.unmatched), {" ": 2})
+        self.assertIn("tokens: ", stats.report())
+        self.assertEqual(stats.as_dict()["match_lengths"], {"3": 1})
+
+    def test_post_rule_counts(self):
+        engine = Engine(mode="preeti")
+        stats = engine.enable_profiling()
+        engine.transliterate("s{ s{")
+        counts = {rule["pattern"]: rule["count"] for rule in stats.post_rules}
+        self.assertEqual(counts["((.्)*){"], 2)
+
+    def test_post_rules_run_through_rewriter(self):
+        # The steps of the production PostRuleRewriter are timed, and they
+        # count the same substitutions as the rules applied one by one
+        engine = Engine(mode="preeti")
+        stats = engine.enable_profiling()
+        rng = random.Random(4)
+        expected = [0] * len(engine.post_rules)
+        for _ in range(300):
+            text = "".join(rng.choice(PREETI_PREFIXES) for _ in range(12))
+            engine.transliterate(text)
+            output = engine._map(text)
+            for idx, (pattern, replacement) in enumerate(engine.post_rules):
+                output, count = pattern.subn(replacement, output)
+                expected[idx] += count
+        self.assertEqual([rule["count"] for rule in stats.post_rules], expected)
+        kinds = [rule["kind"] for rule in stats.post_rules]
+        self.assertEqual(kinds, [step[0] for step in engine._post_rewriter.steps])
+        self.assertIn("runs", kinds)
+        self.assertIn("PostRuleRewriter", stats.report())
+
+    def test_disabled_by_default(self):
+        engine = Engine()
+        self.assertIsNone(engine.stats)
+        self.assertNotIn("transliterate", vars(engine))
+        engine.enable_profiling()
+        self.assertIs(engine.enable_profiling(), engine.stats)
+        engine.disable_profiling()
+        self.assertNotIn("transliterate", vars(engine))
+        self.assertIsNone(engine.disable_profiling())
+
+    def test_cli_profiles_private_engine(self):
+        err = io.StringIO()
+        enable = Engine.enable_profiling
+        with mock.patch.object(
+            Engine, "enable_profiling", autospec=True, side_effect=enable
+        ) as profiled:
+            with contextlib.redirect_stdout(io.StringIO()):
+                with contextlib.redirect_stderr(err):
+                    main(["--profile", "mero", "naam"])
+        self.assertIn("1 call(s)", err.getvalue())
+        engine = profiled.call_args[0][0]
+        self.assertIsNot(engine, Engine.shared())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,155 @@
+import io
+import os
+import random
+import sys
+import unittest
+
+# Add src to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from helpers import (
+    ROMAN_PIECES,
+    random_chunks,
+    random_text,
+    restore_cache,
+    use_temp_cache,
+)
+
+from nepali_unicoder.bench import PREETI_WORDS, ROMAN_WORDS
+from nepali_unicoder.convert import Converter
+from nepali_unicoder.engine import Engine
+from nepali_unicoder.reverse import ReverseEngine, invert
+
+# Well-formed Preeti: reverse output is only defined for text that the
+# forward direction can produce from correctly typed input
+PREETI_VOCABULARY = PREETI_WORDS + [
+    "s{",
+    "sf{",
+    "ls{",
+    "pm",
+    "em",
+    "km",
+    "Qm",
+    "cf]",
+    "k|;Ën]",
+    "5'§}",
+    "!@",
+    "1.5",
+    "...",
+    "–",
+    "\n",
+    "  ",
+]
+
+
+setUpModule = use_temp_cache
+tearDownModule = restore_cache
+
+
+class TestReverse(unittest.TestCase):
+    def setUp(self):
+        self.roman = Converter(mode="roman")
+        self.unicode_roman = Converter(mode="unicode-roman")
+        self.preeti = Converter(mode="preeti")
+        self.unicode_preeti = Converter(mode="unicode-preeti")
+
+    def test_roman_words(self):
+        self.assertEqual(self.unicode_roman.convert("नमस्ते"), "namaste")
+        self.assertEqual(self.unicode_roman.convert("मेरो नाम"), "mero naama")
+        self.assertEqual(self.unicode_roman.convert("आज"), "aaja")
+
+    def test_roman_keys_are_separated(self):
+        # k + ha would read back as kha (ख)
+        self.assertEqual(self.unicode_roman.convert("क्ह"), "k{}ha")
+        self.assertEqual(self.roman.convert("k{}ha"), "क्ह")
+
+    def test_roman_escapes(self):
+        result = self.unicode_roman.convert("नेपाल ३.५ abc {x}")
+        self.assertEqual(result, "nepaala 3{.}5 {abc} {{{x}}")
+        self.assertEqual(self.roman.convert(result), "नेपाल ३.५ abc {x}")
+
+    def test_preeti_words(self):
+        self.assertEqual(self.unicode_preeti.convert("मेरो नाम"), "d]/f] gfd")
+        # The reph and ि are typed in Preeti order
+        self.assertEqual(self.unicode_preeti.convert("कार्य"), "sfo{")
+        self.assertEqual(self.unicode_preeti.convert("नीति"), "gLlt")
+        self.assertEqual(self.unicode_preeti.convert("ऊ"), "pm")
+
+    def test_roman_round_trip(self):
+        rng = random.Random(5)
+        for _ in range(1000):
+            text = self.roman.convert(
+                random_text(rng, ROMAN_PIECES + ROMAN_WORDS, rng.randint(1, 12))
+            )
+            back = self.unicode_roman.convert(text)
+            self.assertEqual(self.roman.convert(back), text, repr(back))
+
+    def test_roman_round_trip_any_text(self):
+        alphabet = [chr(c) for c in range(0x900, 0x970)] + list("ab1. {}|,\n")
+        rng = random.Random(6)
+        for _ in range(3000):
+            text = "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 10)))
+            back = self.unicode_roman.convert(text)
+            self.assertEqual(self.roman.convert(back), text, repr(back))
+
+    def test_preeti_round_trip(self):
+        rng = random.Random(7)
+        for _ in range(1000):
+            typed = " ".join(
+                rng.choice(PREETI_VOCABULARY) for _ in range(rng.randint(1, 8))
+            )
+            text = self.preeti.convert(typed)
+            back = self.unicode_preeti.convert(text)
+            self.assertEqual(self.preeti.convert(back), text, repr(typed))
+
+    def test_stream_and_batch(self):
+        rng = random.Random(8)
+        for mode, forward, words in (
+            ("unicode-roman", "roman", ROMAN_WORDS),
+            ("unicode-preeti", "preeti", PREETI_WORDS),
+        ):
+            engine = Engine.shared(mode=mode)
+            texts = [
+                Engine.shared(mode=forward).transliterate(
+                    " ".join(rng.choices(words, k=rng.randint(0, 6)))
+                )
+                for _ in range(50)
+            ]
+            expected = [engine.transliterate(text) for text in texts]
+            self.assertEqual(engine.transliterate_many(texts, batch_size=7), expected)
+            text = "\n".join(texts)
+            streamed = "".join(engine.transliterate_stream(random_chunks(rng, text)))
+            self.assertEqual(streamed, engine.transliterate(text))
+
+            out = io.StringIO()
+            engine.transliterate_file(io.StringIO(text), out, chunk_size=16)
+            self.assertEqual(out.getvalue(), engine.transliterate(text))
+
+    def test_regex_backend(self):
+        text = self.roman.convert("mero naam sanjeev ho")
+        engine = Engine.shared(mode="unicode-roman", backend="regex")
+        self.assertEqual(engine.transliterate(text), self.unicode_roman.convert(text))
+
+    def test_invert_tie_breaking(self):
+        trie = invert([("A", "आ"), ("aa", "आ"), (".", "।"), ("|", "।"), ("a", "")])
+        self.assertEqual(trie.longest_match("आ"), ("aa", 1))
+        self.assertEqual(trie.longest_match("।"), ("|", 1))
+        # Keys with empty values cannot be reversed
+        self.assertEqual(dict(trie.items()), {"आ": "aa", "।": "|"})
+        # The order of the pairs does not matter
+        trie = invert([("|", "।"), (".", "।"), ("aa", "आ"), ("A", "आ")])
+        self.assertEqual(dict(trie.items()), {"आ": "aa", "।": "|"})
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            ReverseEngine(mode="roman")
+        with self.assertRaises(ValueError):
+            Engine(mode="unicode-roman")
+        with self.assertRaises(ValueError):
+            Converter(mode="unicode-roman", word_cache_size=10)
+        with self.assertRaises(ValueError):
+            Engine.shared(mode="unicode-preeti").enable_profiling()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+import unittest
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+# Add src to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from helpers import restore_cache, use_temp_cache
+
+from nepali_unicoder.convert import Converter
+from nepali_unicoder.service import AsyncConverter, make_server
+
+setUpModule = use_temp_cache
+tearDownModule = restore_cache
+
+
+class TestAsyncConverter(unittest.TestCase):
+    def test_aconvert(self):
+        converter = AsyncConverter(mode="preeti")
+        result = asyncio.run(converter.aconvert("d]/f gfd"))
+        self.assertEqual(result, Converter(mode="preeti").convert("d]/f gfd"))
+
+    def test_aconvert_many_keeps_order(self):
+        texts = [f"ka {i}" for i in range(50)]
+        converter = AsyncConverter(chunksize=7)
+        results = asyncio.run(converter.aconvert_many(texts))
+        self.assertEqual(results, [Converter().convert(text) for text in texts])
+
+    def test_concurrency_limit(self):
+        lock = threading.Lock()
+        active = [0, 0]  # current, maximum
+
+        def slow_batch(mode, backend, texts):
+            with lock:
+                active[0] += 1
+                active[1] = max(active)
+            time.sleep(0.02)
+            with lock:
+                active[0] -= 1
+            return list(texts)
+
+        executor = ThreadPoolExecutor(max_workers=8)
+        converter = AsyncConverter(executor=executor, max_concurrency=2)
+        with mock.patch("nepali_unicoder.service._convert_batch", slow_batch):
+            asyncio.run(converter.aconvert_many(["ka"] * 200))
+            # A new loop gets a fresh semaphore
+            asyncio.run(converter.aconvert("ka"))
+        executor.shutdown()
+        self.assertEqual(active[1], 2)
+
+    def test_invalid_concurrency(self):
+        with self.assertRaises(ValueError):
+            AsyncConverter(max_concurrency=0)
+
+
+class TestServer(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = make_server(port=0, quiet=True)
+        cls.url = "http://127.0.0.1:%d" % cls.server.server_address[1]
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def post(self, payload):
+        data = json.dumps(payload).encode("utf-8")
+        request = urllib.request.Request(self.url + "/convert", data=data)
+        try:
+            with urllib.request.urlopen(request) as response:
+                return response.status, json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            return e.code, json.loads(e.read())
+
+    def test_batch(self):
+        texts = ["mero naam", "ka 12", "{Python}"]
+        status, body = self.post({"mode": "roman", "texts": texts})
+        self.assertEqual(status, 200)
+        self.assertEqual(body["results"], [Converter().convert(t) for t in texts])
+
+    def test_single_preeti(self):
+        status, body = self.post({"mode": "preeti", "text": "d]/f"})
+        self.assertEqual(status, 200)
+        self.assertEqual(body["result"], "मेरा")
+
+    def test_reverse_mode(self):
+        status, body = self.post({"mode": "unicode-roman", "text": "नमस्ते"})
+        self.assertEqual(status, 200)
+        self.assertEqual(body["result"], "namaste")
+
+    def test_bad_requests(self):
+        self.assertEqual(self.post({"mode": "latin", "text": "ka"})[0], 400)
+        self.assertEqual(self.post({"texts": "ka"})[0], 400)
+        self.assertEqual(self.post({})[0], 400)
+        self.assertEqual(self.post([1, 2])[0], 400)
+
+    def test_health(self):
+        with urllib.request.urlopen(self.url + "/health") as response:
+            self.assertEqual(json.loads(response.read()), {"status": "ok"})
+
+
+if __name__ == "__main__":
+    unittest.main()
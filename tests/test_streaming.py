@@ -0,0 +1,110 @@
+import io
+import os
+import random
+import sys
+import unittest
+
+# Add src to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from helpers import (
+    PREETI_PREFIXES,
+    ROMAN_PIECES,
+    random_chunks,
+    random_text,
+    restore_cache,
+    use_temp_cache,
+)
+
+from nepali_unicoder.engine import Engine
+
+setUpModule = use_temp_cache
+tearDownModule = restore_cache
+
+
+class TestTransliterateStream(unittest.TestCase):
+    def check_mode(self, mode, pieces):
+        engine = Engine(mode=mode)
+        rng = random.Random(mode)
+        for _ in range(200):
+            text = random_text(rng, pieces, rng.randint(0, 60))
+            expected = engine.transliterate(text)
+            streamed = "".join(engine.transliterate_stream(random_chunks(rng, text)))
+            self.assertEqual(streamed, expected, repr(text))
+
+    def test_roman_random_splits(self):
+        self.check_mode("roman", ROMAN_PIECES)
+
+    def test_preeti_random_splits(self):
+        self.check_mode("preeti", PREETI_PREFIXES)
+
+    def test_long_buffers(self):
+        # Buffers longer than the window searched for the last safe cut
+        for mode, pieces in (("roman", ROMAN_PIECES), ("preeti", PREETI_PREFIXES)):
+            engine = Engine(mode=mode)
+            rng = random.Random(mode + "-long")
+            for _ in range(5):
+                text = random_text(rng, pieces, 4000)
+                chunks = [text[i : i + 5000] for i in range(0, len(text), 5000)]
+                streamed = "".join(engine.transliterate_stream(chunks))
+                self.assertEqual(streamed, engine.transliterate(text))
+
+        # The last safe cut is far before the end of the buffer
+        engine = Engine()
+        chunks = ["ka ", "ga {" + "b " * 5000, "} gha"]
+        pieces = list(engine.transliterate_stream(chunks))
+        self.assertEqual("".join(pieces[:2]), engine.transliterate("ka ga"))
+        self.assertEqual("".join(pieces), engine.transliterate("".join(chunks)))
+
+    def test_output_is_incremental(self):
+        engine = Engine()
+        chunks = ["mero naam ", "sanjeev ho ", "ra ma nepaali hu"]
+        pieces = list(engine.transliterate_stream(chunks))
+        self.assertGreater(len(pieces), 1)
+        self.assertEqual("".join(pieces), engine.transliterate("".join(chunks)))
+
+    def test_open_block_is_held_back(self):
+        engine = Engine()
+        pieces = list(engine.transliterate_stream(["a {b c ", "d} e"]))
+        self.assertEqual("".join(pieces), "अ b c d ए")
+
+    def test_preeti_m_is_held_back(self):
+        # The stray `m` is moved to the start of the text by the post-rules
+        engine = Engine(mode="preeti")
+        chunks = ["s  s  ", "m"]
+        self.assertEqual(
+            "".join(engine.transliterate_stream(chunks)),
+            engine.transliterate("".join(chunks)),
+        )
+
+    def test_preeti_single_newlines_are_cut(self):
+        # No blank lines or double spaces, so only the line breaks can be cut
+        engine = Engine(mode="preeti")
+        text = "d]/f gfd ;~hLj xf]\ng]kfn sf{ qm km cf]\n" * 200
+        chunks = [text[i : i + 500] for i in range(0, len(text), 500)]
+        pieces = list(engine.split_stream(chunks))
+        self.assertGreater(len(pieces), 10)
+        self.assertLessEqual(max(map(len, pieces)), 1000)
+        self.assertEqual(
+            "".join(map(engine.transliterate, pieces)), engine.transliterate(text)
+        )
+        self.assertEqual(
+            "".join(engine.transliterate_stream(chunks)), engine.transliterate(text)
+        )
+
+    def test_preeti_newline_after_reorder_is_held_back(self):
+        # The `ि` of `l` moves across the line break
+        engine = Engine(mode="preeti")
+        self.assertEqual(list(engine.split_stream(["sl\n", "k"])), ["sl\nk"])
+        self.assertEqual(list(engine.split_stream(["s\n", "k"])), ["s", "\nk"])
+
+    def test_transliterate_file(self):
+        engine = Engine()
+        text = "mero naam {Sanjeev} ho. " * 50
+        dst = io.StringIO()
+        engine.transliterate_file(io.StringIO(text), dst, chunk_size=7)
+        self.assertEqual(dst.getvalue(), engine.transliterate(text))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,241 @@
+import csv
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import unittest
+
+# Add src to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from helpers import (
+    PREETI_PREFIXES,
+    ROMAN_PIECES,
+    random_text,
+    restore_cache,
+    use_temp_cache,
+)
+
+from nepali_unicoder.__main__ import main
+from nepali_unicoder.engine import Engine
+from nepali_unicoder.tabular import (
+    ColumnConverter,
+    convert_column,
+    convert_csv,
+    convert_jsonl,
+)
+
+try:
+    import pandas
+except ImportError:
+    pandas = None
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+
+setUpModule = use_temp_cache
+tearDownModule = restore_cache
+
+
+def make_values(pieces, distinct, count, seed=0):
+    rng = random.Random(seed)
+    pool = [random_text(rng, pieces, rng.randint(0, 6)) for _ in range(distinct)]
+    return [rng.choice(pool) for _ in range(count)]
+
+
+class TestColumnConverter(unittest.TestCase):
+    def check_mode(self, mode, pieces, workers):
+        values = make_values(pieces, 50, 1000) + [None, 12, 1.5]
+        engine = Engine(mode=mode)
+        expected = [
+            engine.transliterate(value) if isinstance(value, str) else value
+            for value in values
+        ]
+        with ColumnConverter(mode, workers=workers, batch_size=16) as converter:
+            self.assertEqual(converter.convert_column(values), expected)
+            self.assertEqual(converter.values, len(values))
+            self.assertLessEqual(converter.converted, 50)
+            # A second column reuses the cache
+            self.assertEqual(converter.convert_column(values[:10]), expected[:10])
+            self.assertLessEqual(converter.converted, 50)
+
+    def test_roman(self):
+        self.check_mode("roman", ROMAN_PIECES, workers=1)
+
+    def test_preeti_pool(self):
+        self.check_mode("preeti", PREETI_PREFIXES, workers=2)
+
+    def test_reverse_pool(self):
+        self.assertEqual(
+            convert_column(["नेपाल", "नेपाल", None], mode="unicode-roman", workers=2),
+            ["nepaala", "nepaala", None],
+        )
+
+    def test_cache_is_bounded(self):
+        values = make_values(ROMAN_PIECES, 100, 500)
+        engine = Engine()
+        with ColumnConverter(cache_size=30, batch_size=8) as converter:
+            for start in range(0, len(values), 50):
+                chunk = values[start : start + 50]
+                self.assertEqual(
+                    converter.convert_values(chunk),
+                    [engine.transliterate(value) for value in chunk],
+                )
+                self.assertLessEqual(len(converter.cache), 50)
+
+    @unittest.skipIf(pandas is None, "pandas is not installed")
+    def test_pandas(self):
+        series = pandas.Series(["ka", None, "ka", "kha"], index=[3, 2, 1, 0])
+        converted = convert_column(series)
+        self.assertEqual(list(converted.index), [3, 2, 1, 0])
+        self.assertEqual(converted[3], "क")
+        self.assertTrue(pandas.isna(converted[2]))
+        self.assertEqual(converted[0], "ख")
+
+    @unittest.skipIf(pyarrow is None, "pyarrow is not installed")
+    def test_arrow(self):
+        array = pyarrow.chunked_array([["ka", None], ["ka", "kha"]])
+        converted = convert_column(array)
+        self.assertIsInstance(converted, pyarrow.ChunkedArray)
+        self.assertEqual(converted.to_pylist(), ["क", None, "क", "ख"])
+        encoded = pyarrow.array(["ka", "kha", "ka"]).dictionary_encode()
+        self.assertEqual(convert_column(encoded).to_pylist(), ["क", "ख", "क"])
+
+
+class TestConvertCsv(unittest.TestCase):
+    ROWS = [
+        ["id", "name", "city"],
+        ["1", "raama", "kaathamaadau"],
+        ["2", "siitaa, devii", "pokharaa"],
+        ["3", "raama"],
+        ["4", "", 'a "quoted" ka'],
+    ]
+
+    def expected(self, columns):
+        engine = Engine()
+        rows = [list(row) for row in self.ROWS]
+        for row in rows[1:]:
+            for i in columns:
+                if i < len(row):
+                    row[i] = engine.transliterate(row[i])
+        return rows
+
+    def test_chunks(self):
+        src = io.StringIO()
+        csv.writer(src).writerows(self.ROWS)
+        for chunk_rows in (1, 2, 100):
+            src.seek(0)
+            dst = io.StringIO()
+            result = convert_csv(src, dst, ["name", "city"], chunk_rows=chunk_rows)
+            self.assertEqual(
+                list(csv.reader(io.StringIO(dst.getvalue()))), self.expected([1, 2])
+            )
+            self.assertEqual(result.rows, 4)
+            self.assertEqual(result.values, 7)
+
+        with self.assertRaises(ValueError):
+            convert_csv(io.StringIO("a,b\n"), io.StringIO(), ["c"])
+        result = convert_csv(io.StringIO(""), io.StringIO(), ["c"])
+        self.assertEqual(result.rows, 0)
+
+    def test_cli(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            src = os.path.join(tmp, "in.tsv")
+            dst = os.path.join(tmp, "out.tsv")
+            with open(src, "w", encoding="utf-8", newline="") as f:
+                csv.writer(f, delimiter="\t").writerows(self.ROWS)
+            main(
+                [
+                    "convert-csv",
+                    src,
+                    dst,
+                    "--columns",
+                    "city",
+                    "--delimiter",
+                    "\t",
+                    "-j",
+                    "2",
+                ]
+            )
+            with open(dst, encoding="utf-8", newline="") as f:
+                self.assertEqual(
+                    list(csv.reader(f, delimiter="\t")), self.expected([2])
+                )
+
+
+class TestConvertJsonl(unittest.TestCase):
+    def setUp(self):
+        names = make_values(ROMAN_PIECES, 30, 200, seed=1)
+        legacy = make_values(PREETI_PREFIXES, 30, 200, seed=2)
+        self.records = [
+            {"id": i, "name": name, "legacy": old, "tags": ["x"]}
+            for i, (name, old) in enumerate(zip(names, legacy))
+        ]
+        self.records[3]["name"] = None
+        del self.records[5]["legacy"]
+        self.text = "".join(
+            json.dumps(record, ensure_ascii=False) + "\n" for record in self.records
+        )
+
+    def expected(self):
+        roman = Engine.shared()
+        preeti = Engine.shared(mode="preeti")
+        records = []
+        for record in self.records:
+            record = dict(record)
+            if isinstance(record.get("name"), str):
+                record["name"] = roman.transliterate(record["name"])
+            if "legacy" in record:
+                record["legacy"] = preeti.transliterate(record["legacy"])
+            records.append(record)
+        return records
+
+    def test_chunks(self):
+        fields = {"name": "roman", "legacy": "preeti"}
+        for chunk_rows, workers in ((1, 1), (7, 1), (1000, 1), (16, 2)):
+            dst = io.StringIO()
+            result = convert_jsonl(
+                io.StringIO(self.text),
+                dst,
+                fields,
+                workers=workers,
+                chunk_rows=chunk_rows,
+            )
+            lines = dst.getvalue().splitlines()
+            self.assertEqual([json.loads(line) for line in lines], self.expected())
+            self.assertEqual(result.rows, 200)
+            self.assertEqual(result.values, 398)
+
+    def test_lines(self):
+        dst = io.StringIO()
+        text = '{"name":"raama"}\n\n{"id":1}\n{"name":"siitaa"}'
+        result = convert_jsonl(io.StringIO(text), dst, ["name"])
+        self.assertEqual(
+            dst.getvalue(), '{"name":"राम"}\n\n{"id":1}\n{"name":"सीता"}\n'
+        )
+        self.assertEqual(result.rows, 3)
+
+        for bad in ('{"name":"raama"}\n{"name"\n', "[1, 2]\n"):
+            with self.assertRaisesRegex(ValueError, "line"):
+                convert_jsonl(io.StringIO(bad), io.StringIO(), ["name"])
+
+    def test_cli(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            src = os.path.join(tmp, "in.jsonl")
+            dst = os.path.join(tmp, "out.jsonl")
+            with open(src, "w", encoding="utf-8") as f:
+                f.write(self.text)
+            main(["convert-jsonl", src, dst, "-f", "name, legacy:preeti", "--quiet"])
+            with open(dst, encoding="utf-8") as f:
+                self.assertEqual([json.loads(line) for line in f], self.expected())
+            with self.assertRaises(SystemExit):
+                main(["convert-jsonl", src, dst, "-f", "name:latin"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,164 @@
+import os
+import random
+import sys
+import threading
+import unittest
+
+# Add src to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from helpers import (
+    PREETI_PREFIXES,
+    ROMAN_PIECES,
+    random_chunks,
+    random_text,
+    restore_cache,
+    use_temp_cache,
+)
+
+from nepali_unicoder.convert import Converter
+from nepali_unicoder.engine import Engine
+
+THREADS = 8
+
+
+setUpModule = use_temp_cache
+tearDownModule = restore_cache
+
+
+def run_threads(target, count=THREADS):
+    """Run `target(index)` on `count` threads started together."""
+    barrier = threading.Barrier(count)
+    errors = []
+
+    def run(index):
+        barrier.wait()
+        try:
+            target(index)
+        except BaseException as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise errors[0]
+
+
+class TestSharedEngineThreads(unittest.TestCase):
+    def setUp(self):
+        # Switch threads often, so conversions interleave
+        self.interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+
+    def tearDown(self):
+        sys.setswitchinterval(self.interval)
+
+    def check_engine(self, engine, pieces):
+        rng = random.Random(0)
+        texts = [random_text(rng, pieces, 30) for _ in range(40)]
+        # A separate engine of the same kind, used by this thread only
+        reference = type(engine)(mode=engine.mode)
+        expected = [reference.transliterate(text) for text in texts]
+
+        def convert(index):
+            rng = random.Random(index)
+            for _ in range(3):
+                order = list(range(len(texts)))
+                rng.shuffle(order)
+                for i in order:
+                    self.assertEqual(engine.transliterate(texts[i]), expected[i])
+                batch = [texts[i] for i in order]
+                self.assertEqual(
+                    engine.transliterate_many(batch), [expected[i] for i in order]
+                )
+                i = order[0]
+                chunks = random_chunks(rng, texts[i])
+                self.assertEqual(
+                    "".join(engine.transliterate_stream(chunks)), expected[i]
+                )
+
+        run_threads(convert)
+
+    def test_modes_and_backends(self):
+        for mode, pieces in (("roman", ROMAN_PIECES), ("preeti", PREETI_PREFIXES)):
+            for backend in ("trie", "regex", "compact"):
+                with self.subTest(mode=mode, backend=backend):
+                    self.check_engine(Engine(mode=mode, backend=backend), pieces)
+            with self.subTest(mode=mode, word_cache=True):
+                self.check_engine(Engine(mode=mode, word_cache_size=64), pieces)
+
+    def test_reverse(self):
+        forward = Engine(mode="roman")
+        pieces = [forward.transliterate(piece) for piece in ROMAN_PIECES]
+        self.check_engine(Engine.shared(mode="unicode-roman"), pieces)
+
+    def test_dictionary_swaps(self):
+        # Layers swapped during conversions, ending with none
+        engine = Engine(mode="roman", word_cache_size=16)
+        words = ["nepaal", "mero", "naam", "gyaana"] * 50
+        expected = [engine.transliterate(word) for word in words]
+        stop = threading.Event()
+
+        def work(index):
+            if index == 0:
+                for _ in range(200):
+                    engine.dictionaries.add("words", {"nepaal": "नेपाल"})
+                    engine.dictionaries.remove("words")
+                stop.set()
+            else:
+                while not stop.is_set():
+                    for word in words:
+                        engine.transliterate(word)
+
+        run_threads(work)
+        self.assertEqual([engine.transliterate(word) for word in words], expected)
+
+    def test_kbest(self):
+        engine = Engine(mode="roman")
+        words = ["gyaan", "nepaal", "kri", "shree"]
+        expected = {word: engine.transliterate_kbest(word, 3) for word in words}
+
+        def kbest(index):
+            for _ in range(50):
+                for word in words:
+                    self.assertEqual(
+                        engine.transliterate_kbest(word, 3), expected[word]
+                    )
+
+        run_threads(kbest)
+
+    def test_shared_is_built_once(self):
+        engines = []
+        # A key no other test uses, so the engine is built here
+        run_threads(
+            lambda index: engines.append(
+                Engine.shared(mode="preeti", word_cache_size=7)
+            )
+        )
+        self.assertEqual(len({id(engine) for engine in engines}), 1)
+
+
+class TestConvertManyThreads(unittest.TestCase):
+    def test_order(self):
+        converter = Converter(mode="preeti")
+        rng = random.Random(2)
+        texts = [random_text(rng, PREETI_PREFIXES, 5) for _ in range(1000)]
+        expected = [converter.convert(text) for text in texts]
+        for threads in (1, 4):
+            results = converter.convert_many(iter(texts), threads=threads, chunksize=9)
+            self.assertEqual(list(results), expected)
+        self.assertEqual(list(converter.convert_many([], threads=2)), [])
+
+    def test_errors(self):
+        converter = Converter()
+        with self.assertRaises(ValueError):
+            converter.convert_many(["mero"], workers=2, threads=2)
+        with self.assertRaises(ValueError):
+            converter.convert_many(["mero"], threads=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
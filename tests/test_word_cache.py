@@ -0,0 +1,82 @@
+import os
+import random
+import sys
+import unittest
+
+# Add src to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from helpers import PREETI_PREFIXES, ROMAN_PIECES, restore_cache, use_temp_cache
+
+from nepali_unicoder.convert import Converter
+from nepali_unicoder.engine import Engine
+
+setUpModule = use_temp_cache
+tearDownModule = restore_cache
+
+
+class TestWordCache(unittest.TestCase):
+    def assert_parity(self, mode, pieces, seed):
+        plain = Engine(mode=mode)
+        cached = Engine(mode=mode, word_cache_size=64)
+        rng = random.Random(seed)
+        for _ in range(2000):
+            # No separators between pieces, so words touch numbers and blocks
+            text = "".join(rng.choice(pieces) for _ in range(rng.randint(0, 12)))
+            self.assertEqual(
+                cached.transliterate(text), plain.transliterate(text), text
+            )
+
+    def test_roman_parity(self):
+        self.assert_parity("roman", ROMAN_PIECES, seed=1)
+
+    def test_preeti_parity(self):
+        self.assert_parity("preeti", PREETI_PREFIXES, seed=2)
+
+    def test_adjacent_numbers_and_blocks(self):
+        plain = Engine()
+        cached = Engine(word_cache_size=16)
+        for text in ("ka12kha", "mero{naam}ho", "kha...ga", "3.5ka.", "{{ka}}"):
+            self.assertEqual(cached.transliterate(text), plain.transliterate(text))
+
+    def test_hits_and_misses(self):
+        engine = Engine(word_cache_size=16)
+        engine.transliterate("mero naam mero")
+        info = engine.word_cache_info()
+        self.assertEqual((info.hits, info.misses, info.currsize), (1, 2, 2))
+
+        engine.clear_word_cache()
+        self.assertEqual(engine.word_cache_info().currsize, 0)
+
+    def test_eviction(self):
+        engine = Engine(word_cache_size=2)
+        engine.transliterate("ka kha ga ka")
+        info = engine.word_cache_info()
+        self.assertEqual((info.misses, info.currsize, info.maxsize), (4, 2, 2))
+
+    def test_preeti_uses_cache_only_with_dictionaries(self):
+        # Preeti words convert through a translation table, not the cache
+        engine = Engine(mode="preeti", word_cache_size=16)
+        engine.transliterate("g]kfn g]kfn")
+        info = engine.word_cache_info()
+        self.assertEqual((info.hits, info.misses, info.currsize), (0, 0, 0))
+
+        engine.dictionaries.add("names", {"g]kfn": "नेपाल"})
+        self.assertEqual(engine.transliterate("g]kfn g]kfn"), "नेपाल नेपाल")
+        info = engine.word_cache_info()
+        self.assertEqual((info.hits, info.misses), (1, 1))
+
+    def test_disabled_by_default(self):
+        self.assertIsNone(Engine().word_cache_info())
+        with self.assertRaises(ValueError):
+            Engine(word_cache_size=-1)
+
+    def test_shared_per_size(self):
+        self.assertIsNot(Converter(word_cache_size=8).engine, Converter().engine)
+        self.assertIs(
+            Converter(word_cache_size=8).engine, Engine.shared(word_cache_size=8)
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()